@@ -0,0 +1,22 @@
+"""Gunicorn hooks, loaded automatically from the working directory.
+
+Every worker gets the lowest process slot not held by a live worker and
+finds it in ``GUNICORN_WORKER_SLOT``. Snowflake string ids use it to tell
+the workers of one pod apart, and only slot 0 runs the scheduled retention
+purge. ``GUNICORN_THREADS`` holds ``--threads``.
+"""
+
+import itertools
+import os
+
+
+def pre_fork(server, worker):
+    # Runs in the master, which knows every live worker
+    taken = {getattr(w, "id_slot", None) for w in server.WORKERS.values()}
+    worker.id_slot = next(slot for slot in itertools.count() if slot not in taken)
+
+
+def post_fork(server, worker):
+    os.environ["GUNICORN_WORKER_SLOT"] = str(worker.id_slot)
+    # The password hashing pool sizes itself to the worker's threads
+    os.environ["GUNICORN_THREADS"] = str(server.cfg.threads)
@@ -0,0 +1,30 @@
+"""add value hash to strings
+
+Revision ID: 7c2d4e8a91f3
+Revises: 15a050586529
+Create Date: 2026-10-18 11:05:12.418230
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7c2d4e8a91f3"
+down_revision = "15a050586529"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Nullable so the column can be added without rewriting existing rows;
+    # fill it afterwards with `flask strings backfill-hashes`
+    op.add_column("strings", sa.Column("value_hash", sa.BINARY(32), nullable=True))
+    op.create_index(
+        op.f("ix_strings_value_hash"), "strings", ["value_hash"], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index(op.f("ix_strings_value_hash"), table_name="strings")
+    op.drop_column("strings", "value_hash")
@@ -0,0 +1,61 @@
+"""add fulltext index to strings
+
+Revision ID: 9b1e5f3c7a20
+Revises: 7c2d4e8a91f3
+Create Date: 2026-10-18 11:42:37.905114
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9b1e5f3c7a20"
+down_revision = "7c2d4e8a91f3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "mysql":
+        # Built online by InnoDB and kept in sync on every write
+        op.execute("ALTER TABLE strings ADD FULLTEXT INDEX ft_strings_value (value)")
+    elif dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE strings_fts USING fts5("
+            "value, content='strings', content_rowid='id')"
+        )
+        op.execute(
+            "CREATE TRIGGER strings_fts_insert AFTER INSERT ON strings BEGIN "
+            "INSERT INTO strings_fts(rowid, value) VALUES (new.id, new.value); END"
+        )
+        op.execute(
+            "CREATE TRIGGER strings_fts_delete AFTER DELETE ON strings BEGIN "
+            "INSERT INTO strings_fts(strings_fts, rowid, value) "
+            "VALUES ('delete', old.id, old.value); END"
+        )
+        op.execute(
+            "CREATE TRIGGER strings_fts_update AFTER UPDATE OF value ON strings BEGIN "
+            "INSERT INTO strings_fts(strings_fts, rowid, value) "
+            "VALUES ('delete', old.id, old.value); "
+            "INSERT INTO strings_fts(rowid, value) VALUES (new.id, new.value); END"
+        )
+        # Index the rows that already exist
+        op.execute("INSERT INTO strings_fts(strings_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "mysql":
+        op.drop_index("ft_strings_value", table_name="strings")
+    elif dialect == "sqlite":
+        for trigger in (
+            "strings_fts_insert",
+            "strings_fts_delete",
+            "strings_fts_update",
+        ):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS strings_fts")
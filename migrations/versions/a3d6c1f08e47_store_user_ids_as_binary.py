@@ -0,0 +1,57 @@
+"""store user ids as binary
+
+Revision ID: a3d6c1f08e47
+Revises: e5f7a2c9b314
+Create Date: 2026-10-18 14:21:08.310562
+
+"""
+
+import uuid
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a3d6c1f08e47"
+down_revision = "e5f7a2c9b314"
+branch_labels = None
+depends_on = None
+
+
+def _rewrite_ids(convert):
+    # SQLite keeps each value's own storage class whatever the declared
+    # column type, so ids are rewritten in place instead of rebuilding the
+    # table through a type it can't reflect
+    bind = op.get_bind()
+    users = sa.table("users", sa.column("id"))
+    for value in bind.execute(sa.select(users.c.id)).scalars().all():
+        bind.execute(
+            users.update().where(users.c.id == value).values(id=convert(value))
+        )
+
+
+def upgrade():
+    # Existing ids keep their value; only the storage changes, so JWTs
+    # already issued still name the same user
+    if op.get_bind().dialect.name == "mysql":
+        op.add_column("users", sa.Column("id_bin", sa.BINARY(16), nullable=True))
+        op.execute("UPDATE users SET id_bin = UUID_TO_BIN(id)")
+        # One table rebuild for the whole swap
+        op.execute(
+            "ALTER TABLE users DROP PRIMARY KEY, DROP COLUMN id, "
+            "CHANGE id_bin id BINARY(16) NOT NULL FIRST, ADD PRIMARY KEY (id)"
+        )
+    else:
+        _rewrite_ids(lambda value: uuid.UUID(value).bytes)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "mysql":
+        op.add_column("users", sa.Column("id_str", sa.String(length=36)))
+        op.execute("UPDATE users SET id_str = BIN_TO_UUID(id)")
+        op.execute(
+            "ALTER TABLE users DROP PRIMARY KEY, DROP COLUMN id, "
+            "CHANGE id_str id VARCHAR(36) NOT NULL FIRST, ADD PRIMARY KEY (id)"
+        )
+    else:
+        _rewrite_ids(lambda value: str(uuid.UUID(bytes=bytes(value))))
@@ -0,0 +1,25 @@
+"""add created_at index to strings
+
+Revision ID: c4a81f0d6e52
+Revises: 9b1e5f3c7a20
+Create Date: 2026-10-18 12:20:41.907113
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c4a81f0d6e52"
+down_revision = "9b1e5f3c7a20"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        op.f("ix_strings_created_at"), "strings", ["created_at"], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index(op.f("ix_strings_created_at"), table_name="strings")
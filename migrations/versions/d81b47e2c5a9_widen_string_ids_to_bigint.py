@@ -0,0 +1,42 @@
+"""widen string ids to bigint
+
+Revision ID: d81b47e2c5a9
+Revises: a3d6c1f08e47
+Create Date: 2026-10-18 15:07:44.129305
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d81b47e2c5a9"
+down_revision = "a3d6c1f08e47"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # SQLite's INTEGER primary key is already 64-bit
+    if op.get_bind().dialect.name == "mysql":
+        op.alter_column(
+            "strings",
+            "id",
+            existing_type=sa.Integer(),
+            type_=sa.BigInteger(),
+            existing_nullable=False,
+            autoincrement=True,
+        )
+
+
+def downgrade():
+    # Fails once rows hold ids above the INT range, such as Snowflake ids
+    if op.get_bind().dialect.name == "mysql":
+        op.alter_column(
+            "strings",
+            "id",
+            existing_type=sa.BigInteger(),
+            type_=sa.Integer(),
+            existing_nullable=False,
+            autoincrement=True,
+        )
@@ -0,0 +1,29 @@
+"""add string id sequences
+
+Revision ID: e5f7a2c9b314
+Revises: c4a81f0d6e52
+Create Date: 2026-10-18 13:02:19.552870
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e5f7a2c9b314"
+down_revision = "c4a81f0d6e52"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "string_id_sequences",
+        sa.Column("name", sa.String(length=32), nullable=False),
+        sa.Column("next_id", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade():
+    op.drop_table("string_id_sequences")
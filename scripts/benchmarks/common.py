@@ -0,0 +1,84 @@
+"""Shared helpers for the benchmark scripts.
+
+Run benchmarks from the repository root, e.g.::
+
+    python -m scripts.benchmarks.random_selection --sizes 1000 100000
+"""
+
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("ENV", "testing")
+
+from src.config.testing import TestConfig  # noqa: E402
+from src.factory import create_app, db  # noqa: E402
+
+SEED_CHUNK_SIZE = 50_000
+
+
+class BenchmarkConfig(TestConfig):
+    """Test config pointing at an on-disk SQLite file"""
+
+    def __init__(self, path):
+        super().__init__()
+        self.DEBUG = False
+        self.SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+
+
+def create_benchmark_app(path=None):
+    """Create an app backed by a fresh SQLite file and its tables"""
+    if path is None:
+        handle, path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(handle)
+        os.unlink(path)
+
+    app = create_app(BenchmarkConfig(path))
+    with app.app_context():
+        db.create_all()
+
+    return app, path
+
+
+def seed_strings(target_rows, delete_every=10, value_length=64):
+    """Grow the strings table to ``target_rows`` rows.
+
+    Every ``delete_every``-th id is deleted afterwards so the id sequence has
+    gaps, the way a long-lived production table does.
+    """
+    from src.core.models.string import String
+
+    table = String.__table__
+    current = db.session.query(db.func.max(String.id)).scalar() or 0
+    payload = "x" * value_length
+
+    while current < target_rows:
+        chunk = min(SEED_CHUNK_SIZE, target_rows - current)
+        db.session.execute(
+            table.insert(),
+            [{"value": f"{current + i} {payload}"} for i in range(chunk)],
+        )
+        current += chunk
+    db.session.commit()
+
+    if delete_every:
+        db.session.execute(table.delete().where(table.c.id % delete_every == 0))
+        db.session.commit()
+
+
+def time_call(func, iterations):
+    """Return per-call latencies in microseconds"""
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1_000_000)
+    return latencies
+
+
+def summarize(latencies):
+    """Return median and p99 of a list of latencies"""
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return statistics.median(ordered), p99
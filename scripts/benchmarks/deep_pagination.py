@@ -0,0 +1,82 @@
+"""Latency of fetching deep pages with keyset cursors vs OFFSET.
+
+    python -m scripts.benchmarks.deep_pagination --rows 1000000 --pages 1 100 10000
+"""
+
+import argparse
+import os
+
+from scripts.benchmarks.common import (
+    create_benchmark_app,
+    seed_strings,
+    summarize,
+    time_call,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--per-page", type=int, default=20)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 100, 1000, 10000])
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    app, path = create_benchmark_app()
+
+    from src.core.models.string import String
+    from src.core.services.string_listing_service import (
+        StringListingService,
+        encode_cursor,
+    )
+    from src.factory import db
+
+    listing = StringListingService()
+
+    print(
+        f"{'page':>8} {'offset p50':>12} {'offset p99':>12} "
+        f"{'keyset p50':>12} {'keyset p99':>12}  (microseconds)"
+    )
+
+    try:
+        with app.app_context():
+            seed_strings(args.rows)
+
+            for page in args.pages:
+                offset = (page - 1) * args.per_page
+                # The cursor a client would hold after walking to this page
+                boundary = (
+                    db.session.query(String.id)
+                    .order_by(String.id)
+                    .offset(offset - 1)
+                    .limit(1)
+                    .scalar()
+                    if offset
+                    else None
+                )
+                cursor = (
+                    encode_cursor({"id": boundary, "order": "asc"})
+                    if boundary
+                    else None
+                )
+
+                def by_offset():
+                    db.session.query(String).order_by(String.id).offset(offset).limit(
+                        args.per_page
+                    ).all()
+
+                def by_keyset():
+                    listing.page(cursor, args.per_page)
+
+                legacy = summarize(time_call(by_offset, args.iterations))
+                keyset = summarize(time_call(by_keyset, args.iterations))
+                print(
+                    f"{page:>8,} {legacy[0]:>12.0f} {legacy[1]:>12.0f} "
+                    f"{keyset[0]:>12.0f} {keyset[1]:>12.0f}"
+                )
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
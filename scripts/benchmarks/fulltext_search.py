@@ -0,0 +1,89 @@
+"""Latency of ranked full-text search vs a LIKE '%term%' scan.
+
+    python -m scripts.benchmarks.fulltext_search --rows 2000000 --terms alpha zulu0042
+"""
+
+import argparse
+import os
+import random
+
+from scripts.benchmarks.common import (
+    SEED_CHUNK_SIZE,
+    create_benchmark_app,
+    summarize,
+    time_call,
+)
+
+# A small vocabulary makes common words; numbered words are rare
+COMMON_WORDS = "alpha bravo charlie delta echo foxtrot golf hotel india juliet".split()
+RARE_WORDS = 10_000
+
+
+def seed_sentences(target_rows, words_per_row=8, rng=None):
+    """Fill the strings table with short synthetic sentences"""
+    from src.core.models.string import String
+    from src.factory import db
+
+    rng = rng or random.Random(42)
+    table = String.__table__
+    current = 0
+
+    while current < target_rows:
+        chunk = min(SEED_CHUNK_SIZE, target_rows - current)
+        rows = []
+        for _ in range(chunk):
+            words = rng.choices(COMMON_WORDS, k=words_per_row - 1)
+            words.append(f"zulu{rng.randrange(RARE_WORDS):04d}")
+            rows.append({"value": " ".join(words)})
+        db.session.execute(table.insert(), rows)
+        current += chunk
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--terms", nargs="+", default=["alpha", "zulu0042"])
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    app, path = create_benchmark_app()
+
+    from src.core.models.string import String
+    from src.core.services.string_search_service import StringSearchService
+    from src.factory import db
+
+    search = StringSearchService()
+
+    print(
+        f"{'term':>12} {'like p50':>12} {'like p99':>12} "
+        f"{'fts p50':>12} {'fts p99':>12}  (microseconds)"
+    )
+
+    try:
+        with app.app_context():
+            seed_sentences(args.rows)
+
+            for term in args.terms:
+
+                def by_like():
+                    db.session.query(String).filter(
+                        String.value.like(f"%{term}%")
+                    ).order_by(String.id.desc()).limit(args.limit).all()
+
+                def by_fts():
+                    search.search(term, None, args.limit)
+
+                like = summarize(time_call(by_like, args.iterations))
+                fts = summarize(time_call(by_fts, args.iterations))
+                print(
+                    f"{term:>12} {like[0]:>12.0f} {like[1]:>12.0f} "
+                    f"{fts[0]:>12.0f} {fts[1]:>12.0f}"
+                )
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Cost of building JSON responses, before and after serializing models directly.
+
+    python -m scripts.benchmarks.json_responses --iterations 20000 --requests 3000
+
+"dict" is the old path: ``model_dump()`` to a dict, ``flask.json.dumps`` to
+a string, then the Response encodes it. "direct" serializes the model
+straight to bytes and uses pre-encoded bodies for constant errors.
+
+The first table times building one Response. The second one sends
+requests through the test client, so routing, rate limiting and the
+database are included but no network or WSGI server:
+
+- a page of 100 strings
+- a protected endpoint called without a token
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime, timezone
+from http import HTTPStatus
+
+from flask import Response, json
+
+from scripts.benchmarks.common import (
+    create_benchmark_app,
+    seed_strings,
+    summarize,
+    time_call,
+)
+
+
+def dict_success_response(data, status_code=HTTPStatus.OK):
+    return Response(
+        response=json.dumps(data.model_dump(mode="json")),
+        status=status_code,
+        mimetype="application/json",
+    )
+
+
+def dict_error_response(message, status_code):
+    from src.core.schemas.base import ErrorResponseSchema
+
+    error_schema = ErrorResponseSchema(message=message, status="failed")
+    return Response(
+        response=json.dumps(error_schema.model_dump()),
+        status=status_code,
+        mimetype="application/json",
+    )
+
+
+def payloads():
+    from src.core.schemas.auth import TokenResponseSchema
+    from src.core.schemas.base import PaginatedResponseSchema
+    from src.core.schemas.strings import StringSchema
+
+    now = datetime.now(timezone.utc)
+    return {
+        "token": TokenResponseSchema(
+            message="Login successful", access_token="x" * 300, refresh_token="y" * 200
+        ),
+        "page of 100": PaginatedResponseSchema[StringSchema](
+            items=[
+                StringSchema(id=i, value=f"string number {i}", created_at=now)
+                for i in range(100)
+            ],
+            per_page=100,
+            next_cursor="eyJpZCI6MTAwfQ",
+        ),
+    }
+
+
+def micro(iterations):
+    from src.utils import create_error_response, create_success_response
+
+    print(f"{'response':<14}{'dict p50 us':>13}{'direct p50 us':>15}")
+    for name, model in payloads().items():
+        old, _ = summarize(time_call(lambda: dict_success_response(model), iterations))
+        new, _ = summarize(
+            time_call(lambda: create_success_response(model), iterations)
+        )
+        print(f"{name:<14}{old:>13.1f}{new:>15.1f}")
+
+    message, status = "Missing authentication token", HTTPStatus.UNAUTHORIZED
+    old, _ = summarize(
+        time_call(lambda: dict_error_response(message, status), iterations)
+    )
+    new, _ = summarize(
+        time_call(lambda: create_error_response(message, status), iterations)
+    )
+    print(f"{'error':<14}{old:>13.1f}{new:>15.1f}")
+
+
+def requests_per_second(client, path, method, count):
+    started = time.perf_counter()
+    for _ in range(count):
+        method(client, path)
+    return count / (time.perf_counter() - started)
+
+
+def end_to_end(app, count):
+    from src.api.v1.controllers import strings_controller
+    from src.api.v1.middlewares import auth_middleware
+    from src.factory import limiter
+    from src.utils import create_error_response, create_success_response
+
+    limiter.enabled = False
+    cases = {
+        "page of 100": ("/api/v1/strings?limit=100", lambda c, p: c.get(p)),
+        "no token": ("/api/v1/strings/save", lambda c, p: c.post(p, json={})),
+    }
+    paths = {
+        "dict": (dict_success_response, dict_error_response),
+        "direct": (create_success_response, create_error_response),
+    }
+
+    print(f"\n{'request':<14}{'dict rps':>13}{'direct rps':>15}")
+    client = app.test_client()
+    for name, (path, method) in cases.items():
+        results = {}
+        for mode, (success, error) in paths.items():
+            strings_controller.create_success_response = success
+            strings_controller.create_error_response = error
+            auth_middleware.create_error_response = error
+            method(client, path)
+            results[mode] = requests_per_second(client, path, method, count)
+        print(f"{name:<14}{results['dict']:>13.0f}{results['direct']:>15.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=3_000)
+    args = parser.parse_args()
+
+    app, path = create_benchmark_app()
+    try:
+        with app.app_context():
+            seed_strings(1000, delete_every=0)
+            micro(args.iterations)
+        end_to_end(app, args.requests)
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Latency of a cheap endpoint while a burst of logins arrives.
+
+    python -m scripts.benchmarks.login_storm --logins 200 --threads 2
+
+Requests run on ``--threads`` threads, like one gunicorn worker. A burst
+of ``--logins`` logins is queued at once while ``GET /strings/random`` is
+sent every ``--probe-interval-ms`` and timed from arrival to response.
+Inline bcrypt holds a request thread for every login in the burst. The
+hashing pool turns away logins beyond its queue with a 503, so probes
+wait for far fewer of them.
+"""
+
+import argparse
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from scripts.benchmarks.common import create_benchmark_app, seed_strings, summarize
+
+
+def run_storm(app, args, email):
+    statuses = Counter()
+    latencies = []
+
+    def login():
+        response = app.test_client().post(
+            "/api/v1/auth/login", json={"email": email, "password": "password123"}
+        )
+        statuses[response.status_code] += 1
+
+    def probe(arrived):
+        app.test_client().get("/api/v1/strings/random")
+        latencies.append((time.perf_counter() - arrived) * 1000)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.threads) as threads:
+        for _ in range(args.logins):
+            threads.submit(login)
+        for _ in range(args.probes):
+            threads.submit(probe, time.perf_counter())
+            time.sleep(args.probe_interval_ms / 1000)
+    return statuses, latencies, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=2)
+    parser.add_argument("--probes", type=int, default=50)
+    parser.add_argument("--probe-interval-ms", type=float, default=20)
+    parser.add_argument("--hash-workers", type=int, default=1)
+    parser.add_argument("--queue-size", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=12)
+    args = parser.parse_args()
+
+    app, path = create_benchmark_app()
+
+    from src.api.v1.controllers import auth_controller
+    from src.core.models.user import User
+    from src.core.password_hashers import BcryptHasher
+    from src.core.services.password_hashing_pool import PasswordHashingPool
+    from src.factory import db, limiter
+
+    limiter.enabled = False
+    hasher = BcryptHasher(rounds=args.rounds)
+    email = "storm@example.com"
+
+    with app.app_context():
+        seed_strings(10_000)
+        password = hasher.hash("password123")
+        db.session.add(User(email=email, password=password))
+        db.session.commit()
+
+    modes = {
+        "inline": PasswordHashingPool(workers=0, queue_size=args.logins, hasher=hasher),
+        "pool": PasswordHashingPool(
+            workers=args.hash_workers, queue_size=args.queue_size, hasher=hasher
+        ),
+    }
+
+    print(
+        f"{'mode':<8}{'probe p50 ms':>14}{'probe p99 ms':>14}"
+        f"{'logins ok':>11}{'rejected':>10}{'elapsed s':>11}"
+    )
+    try:
+        for name, pool in modes.items():
+            auth_controller.password_hashing_pool = pool
+            # Start the processes before the burst
+            with app.app_context():
+                pool.hash("warm up")
+
+            statuses, latencies, elapsed = run_storm(app, args, email)
+            pool.shutdown()
+
+            p50, p99 = summarize(latencies)
+            print(
+                f"{name:<8}{p50:>14.1f}{p99:>14.1f}"
+                f"{statuses[200]:>11}{statuses[503]:>10}{elapsed:>11.1f}"
+            )
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""End-to-end cost of fetching N random strings.
+
+Compares N calls to ``GET /strings/random`` with one call to
+``GET /strings/random?count=N``::
+
+    python -m scripts.benchmarks.random_batch --rows 100000 --counts 10 100 500
+"""
+
+import argparse
+import os
+import time
+
+from scripts.benchmarks.common import create_benchmark_app, seed_strings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app, path = create_benchmark_app()
+
+    from src.factory import limiter
+
+    limiter.enabled = False
+    client = app.test_client()
+
+    print(
+        f"{'count':>8} {'N x single ms':>14} {'batch ms':>10} {'speedup':>8}"
+        f" {'unique ms':>10}"
+    )
+
+    try:
+        with app.app_context():
+            seed_strings(args.rows)
+
+        for count in args.counts:
+            single = batch = unique = 0.0
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                for _ in range(count):
+                    client.get("/api/v1/strings/random")
+                single += time.perf_counter() - start
+
+                start = time.perf_counter()
+                client.get(f"/api/v1/strings/random?count={count}")
+                batch += time.perf_counter() - start
+
+                start = time.perf_counter()
+                client.get(f"/api/v1/strings/random?count={count}&replace=false")
+                unique += time.perf_counter() - start
+
+            single, batch, unique = (
+                value * 1000 / args.repeat for value in (single, batch, unique)
+            )
+            print(
+                f"{count:>8} {single:>14.1f} {batch:>10.1f} "
+                f"{single / batch:>7.1f}x {unique:>10.1f}"
+            )
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
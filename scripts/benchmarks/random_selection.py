@@ -0,0 +1,64 @@
+"""Latency of random string selection as the strings table grows.
+
+Compares the legacy ``COUNT(*)`` + ``OFFSET`` query with the id-range
+sampler in ``RandomStringService``::
+
+    python -m scripts.benchmarks.random_selection --sizes 1000 100000 10000000
+"""
+
+import argparse
+import os
+import random
+
+from scripts.benchmarks.common import (
+    create_benchmark_app,
+    seed_strings,
+    summarize,
+    time_call,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000, 100_000, 1_000_000, 10_000_000],
+    )
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    app, path = create_benchmark_app()
+
+    from src.core.models.string import String
+    from src.core.services.random_string_service import RandomStringService
+    from src.factory import db
+
+    service = RandomStringService()
+
+    def count_offset():
+        count = db.session.query(String).count()
+        db.session.query(String).offset(random.randint(0, count - 1)).first()
+
+    print(
+        f"{'rows':>12} {'offset p50':>12} {'offset p99':>12} "
+        f"{'id-range p50':>14} {'id-range p99':>14}  (microseconds)"
+    )
+
+    try:
+        with app.app_context():
+            for size in sorted(args.sizes):
+                seed_strings(size)
+                legacy = summarize(time_call(count_offset, args.iterations))
+                sampled = summarize(time_call(service.pick_one, args.iterations))
+                print(
+                    f"{size:>12,} {legacy[0]:>12.0f} {legacy[1]:>12.0f} "
+                    f"{sampled[0]:>14.0f} {sampled[1]:>14.0f}"
+                )
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
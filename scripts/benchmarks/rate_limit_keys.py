@@ -0,0 +1,98 @@
+"""Memory and cost per hit of the rate limit storages with many clients.
+
+    python -m scripts.benchmarks.rate_limit_keys --keys 1000000
+
+Sends one request each from ``--keys`` distinct clients against a
+"100 per minute" limit. ``memory://`` is the per-worker storage that comes
+with limits, used with fixed windows. ``bounded-memory://`` uses sliding
+windows, with the clients arriving evenly over ``--duration`` simulated
+seconds so that idle keys can be evicted. Memory is measured with
+tracemalloc in a second pass, so it doesn't slow down the timed one.
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from limits import parse
+from limits.storage import MemoryStorage
+from limits.strategies import FixedWindowRateLimiter, SlidingWindowCounterRateLimiter
+
+from src.core.metrics import RATE_LIMIT_EVICTIONS
+from src.core.rate_limit_storage import BoundedMemoryStorage
+
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def fill(limiter, keys, duration, clock=None):
+    limit = parse("100 per minute")
+    started = time.perf_counter()
+    for i in range(keys):
+        if clock is not None:
+            clock.now = i / keys * duration
+        limiter.hit(limit, f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}")
+    return (time.perf_counter() - started) / keys * 1e6
+
+
+def memory_storage(args):
+    return FixedWindowRateLimiter(MemoryStorage()), None
+
+
+def bounded_memory_storage(args):
+    clock = SimulatedClock()
+    storage = BoundedMemoryStorage(max_keys=args.max_keys, clock=clock)
+    return SlidingWindowCounterRateLimiter(storage), clock
+
+
+def tracked_keys(limiter):
+    storage = limiter.storage
+    if isinstance(storage, BoundedMemoryStorage):
+        return storage.tracked_keys
+    return len(storage.storage)
+
+
+def evictions(reason):
+    return RATE_LIMIT_EVICTIONS.labels(reason=reason)._value.get()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keys", type=int, default=1_000_000)
+    parser.add_argument("--duration", type=float, default=600)
+    parser.add_argument("--max-keys", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(
+        f"{'storage':<20}{'us/hit':>8}{'keys':>10}{'MiB':>8}"
+        f"{'idle evict':>12}{'cap evict':>11}"
+    )
+    for name, build in (
+        ("memory://", memory_storage),
+        ("bounded-memory://", bounded_memory_storage),
+    ):
+        idle, capacity = evictions("idle"), evictions("capacity")
+        limiter, clock = build(args)
+        per_hit = fill(limiter, args.keys, args.duration, clock)
+        keys = tracked_keys(limiter)
+        idle, capacity = evictions("idle") - idle, evictions("capacity") - capacity
+
+        limiter, clock = build(args)
+        tracemalloc.start()
+        fill(limiter, args.keys, args.duration, clock)
+        memory = tracemalloc.get_traced_memory()[0] / 2**20
+        tracemalloc.stop()
+
+        print(
+            f"{name:<20}{per_hit:>8.2f}{keys:>10}{memory:>8.1f}"
+            f"{idle:>12.0f}{capacity:>11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
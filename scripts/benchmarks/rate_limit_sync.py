@@ -0,0 +1,99 @@
+"""Accuracy and round trips of the leased rate limit storage.
+
+    python -m scripts.benchmarks.rate_limit_sync --workers 40 --rate 200
+
+Simulates ``--workers`` workers sharing one counter backend, with one client
+sending ``--rate`` requests per second spread at random over the workers, for
+``--windows`` windows of a "1000 per minute" limit. Time is simulated, so
+the run takes seconds. For every lease fraction and sync interval it prints
+how many requests were admitted per window against the limit, and how many
+backend round trips the workers made per request (one per request without
+leasing).
+"""
+
+import argparse
+import random
+
+from limits import parse
+from limits.strategies import FixedWindowRateLimiter
+
+from src.core.rate_limit_storage import InProcessCounterBackend, LeasedStorage
+
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingBackend(InProcessCounterBackend):
+    def __init__(self, clock):
+        super().__init__(clock)
+        self.calls = 0
+
+    def incr(self, key, amount, expiry):
+        self.calls += 1
+        return super().incr(key, amount, expiry)
+
+    def get(self, key):
+        self.calls += 1
+        return super().get(key)
+
+
+def run(workers, rate, windows, lease_fraction, sync_interval, limit):
+    clock = SimulatedClock()
+    backend = CountingBackend(clock)
+    limiters = [
+        FixedWindowRateLimiter(
+            LeasedStorage(
+                backend=backend,
+                lease_fraction=lease_fraction,
+                sync_interval=sync_interval,
+                clock=clock,
+            )
+        )
+        for _ in range(workers)
+    ]
+    rng = random.Random(0)
+    requests = int(rate * limit.get_expiry() * windows)
+    admitted = 0
+    for i in range(requests):
+        clock.now = i / rate
+        admitted += rng.choice(limiters).hit(limit, "client")
+    return admitted / windows, backend.calls / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=40)
+    parser.add_argument("--rate", type=float, default=200)
+    parser.add_argument("--windows", type=int, default=5)
+    parser.add_argument(
+        "--lease-fractions", type=float, nargs="+", default=[0, 0.001, 0.005, 0.02]
+    )
+    parser.add_argument("--sync-intervals", type=float, nargs="+", default=[0.1, 1, 5])
+    args = parser.parse_args()
+
+    limit = parse("1000 per minute")
+    print(f"{'lease':>8}{'sync s':>8}{'admitted':>10}{'over %':>8}{'rt/req':>8}")
+    for lease_fraction in args.lease_fractions:
+        for sync_interval in args.sync_intervals:
+            admitted, round_trips = run(
+                args.workers,
+                args.rate,
+                args.windows,
+                lease_fraction,
+                sync_interval,
+                limit,
+            )
+            over = (admitted - limit.amount) / limit.amount * 100
+            print(
+                f"{lease_fraction:>8}{sync_interval:>8}{admitted:>10.0f}"
+                f"{over:>8.1f}{round_trips:>8.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Throughput and peak RSS of the streaming export.
+
+    python -m scripts.benchmarks.streaming_export --rows 1000000 --format ndjson
+
+With ``--compare-orm`` the table is also loaded with ``Query.all()``
+afterwards to show the memory a naive export would need. Peak RSS only
+grows, so the ORM run always goes last.
+"""
+
+import argparse
+import os
+import resource
+import sys
+import time
+
+from scripts.benchmarks.common import create_benchmark_app, seed_strings
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--compare-orm", action="store_true")
+    args = parser.parse_args()
+
+    app, path = create_benchmark_app()
+
+    from src.core.models.string import String
+    from src.core.services.string_export_service import StringExportService
+    from src.factory import db
+
+    export = StringExportService(chunk_size=args.chunk_size)
+
+    try:
+        with app.app_context():
+            seed_strings(args.rows)
+            db.session.remove()
+            baseline = peak_rss_mb()
+
+            start = time.perf_counter()
+            exported = 0
+            size = 0
+            upto_id = export.upper_bound()
+            for chunk in export.stream(args.format, 0, upto_id):
+                exported += chunk.count("\n")
+                size += len(chunk)
+            elapsed = time.perf_counter() - start
+            if args.format == "csv":
+                exported -= 1
+
+            print(f"rows exported     {exported:>14,}")
+            print(f"bytes produced    {size:>14,}")
+            print(f"rows per second   {exported / elapsed:>14,.0f}")
+            print(f"peak RSS growth   {peak_rss_mb() - baseline:>11.1f} MB")
+
+            if args.compare_orm:
+                start = time.perf_counter()
+                rows = db.session.query(String).all()
+                elapsed = time.perf_counter() - start
+                print(
+                    f"ORM .all()        {len(rows):>14,} rows in {elapsed:.1f}s, "
+                    f"peak RSS growth {peak_rss_mb() - baseline:.1f} MB"
+                )
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
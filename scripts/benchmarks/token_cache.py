@@ -0,0 +1,51 @@
+"""Cost of ``jwt_required`` with and without the verified token cache.
+
+    python -m scripts.benchmarks.token_cache --iterations 20000
+
+Calls a no-op view wrapped in ``jwt_required`` inside a request context
+with the same access token every time, the way a client reuses its token
+until it expires. Without the cache each call verifies the signature,
+parses the payload and validates it with pydantic.
+"""
+
+import argparse
+import os
+
+from scripts.benchmarks.common import create_benchmark_app, summarize, time_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    app, path = create_benchmark_app()
+
+    from src.api.v1.middlewares import auth_middleware
+    from src.api.v1.middlewares.auth_middleware import jwt_required
+    from src.core.services.jwt_service import JWTService
+    from src.core.services.token_cache import VerifiedTokenCache
+
+    token = JWTService.create_access_token(
+        {"user_id": "0190a6a4-5b4e-7000-8000-000000000000", "email": "a@example.com"}
+    )
+    view = jwt_required(lambda: "ok")
+    modes = {
+        "uncached": VerifiedTokenCache(max_size=0),
+        "cached": VerifiedTokenCache(),
+    }
+
+    print(f"{'mode':<10}{'p50 us':>10}{'p99 us':>10}")
+    try:
+        with app.test_request_context(headers={"Authorization": f"Bearer {token}"}):
+            for name, cache in modes.items():
+                auth_middleware.verified_token_cache = cache
+                view()
+                p50, p99 = summarize(time_call(view, args.iterations))
+                print(f"{name:<10}{p50:>10.1f}{p99:>10.1f}")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
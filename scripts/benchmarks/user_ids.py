@@ -0,0 +1,113 @@
+"""Insert throughput and index size of the users table by id format.
+
+    python -m scripts.benchmarks.user_ids --users 3000000
+
+Compares the old ``VARCHAR(36)`` random ids with ``BINARY(16)`` ids, random
+(version 4) and time-ordered (version 7). Each variant fills its own SQLite
+file with a page cache of ``--cache-mb``; once the primary key index
+outgrows the cache, random ids touch a cold page on almost every insert
+while time-ordered ids keep appending to the rightmost one.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import uuid
+
+import sqlalchemy as sa
+
+from scripts.benchmarks import common  # noqa: F401  sets up the environment
+from src.core.models.user import BinaryUUID, uuid7
+
+VARIANTS = {
+    "varchar uuid4": (sa.String(36), uuid.uuid4),
+    "binary uuid4": (BinaryUUID(), uuid.uuid4),
+    "binary uuid7": (BinaryUUID(), uuid7),
+}
+
+
+def users_table(id_type):
+    return sa.Table(
+        "users",
+        sa.MetaData(),
+        sa.Column("id", id_type, primary_key=True),
+        sa.Column("email", sa.String(120), unique=True, nullable=False),
+        sa.Column("password", sa.String(255), nullable=False),
+    )
+
+
+def run(name, users, batch_size, cache_mb):
+    id_type, make_id = VARIANTS[name]
+    handle, path = tempfile.mkstemp(suffix=".sqlite3")
+    os.close(handle)
+    engine = sa.create_engine(f"sqlite:///{path}")
+    table = users_table(id_type)
+    # bcrypt-sized placeholder so rows are as wide as real ones
+    password = "$2b$12$" + "x" * 53
+
+    try:
+        with engine.begin() as connection:
+            table.create(connection)
+
+        rates = []
+        with engine.connect() as connection:
+            connection.exec_driver_sql(f"PRAGMA cache_size = -{cache_mb * 1024}")
+            for start in range(0, users, batch_size):
+                rows = [
+                    {
+                        "id": str(make_id()),
+                        "email": f"user{i}@example.com",
+                        "password": password,
+                    }
+                    for i in range(start, min(start + batch_size, users))
+                ]
+                began = time.perf_counter()
+                with connection.begin():
+                    connection.execute(table.insert(), rows)
+                rates.append(len(rows) / (time.perf_counter() - began))
+
+            sizes = dict(
+                connection.exec_driver_sql(
+                    "SELECT name, SUM(pgsize) FROM dbstat GROUP BY name"
+                ).all()
+            )
+    finally:
+        engine.dispose()
+        os.unlink(path)
+
+    # SQLite keeps a non-integer primary key in a separate unique index
+    pk_index = sizes.get("sqlite_autoindex_users_1", 0)
+    tail = rates[-max(1, len(rates) // 10) :]
+    return {
+        "overall": users / sum(batch_size / rate for rate in rates),
+        "last 10%": sum(tail) / len(tail),
+        "pk index": pk_index,
+        "table": sizes.get("users", 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=3_000_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--cache-mb", type=int, default=16)
+    parser.add_argument(
+        "--variants", nargs="+", choices=list(VARIANTS), default=list(VARIANTS)
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'variant':<16}{'rows/s':>12}{'last 10%':>12}"
+        f"{'pk index MB':>14}{'table MB':>12}"
+    )
+    for name in args.variants:
+        result = run(name, args.users, args.batch_size, args.cache_mb)
+        print(
+            f"{name:<16}{result['overall']:>12,.0f}{result['last 10%']:>12,.0f}"
+            f"{result['pk index'] / 2**20:>14.1f}{result['table'] / 2**20:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,22 +4,58 @@ from http import HTTPStatus
 from flask import Blueprint, request
 from pydantic import ValidationError
 
+from src.api.v1.middlewares.auth_middleware import jwt_required
 from src.core.models.user import User
 from src.core.schemas.auth import (
     LoginRequestSchema,
+    LogoutRequestSchema,
     RefreshTokenRequestSchema,
     RegisterRequestSchema,
+    RevokeTokenRequestSchema,
     TokenPayloadSchema,
     TokenResponseSchema,
 )
+from src.core.schemas.base import SuccessResponseSchema
 from src.core.services.jwt_service import JWTService
-from src.factory import bcrypt, db, limiter
+from src.core.services.password_hashing_pool import (
+    PasswordHashingBusyError,
+    password_hashing_pool,
+)
+from src.core.services.token_revocation_service import token_revocation_service
+from src.core.services.user_cache import user_cache
+from src.factory import db, limiter
 from src.utils import create_error_response, create_success_response
 
 auth = Blueprint("auth", __name__)
 logger = logging.getLogger(__name__)
 
 
+def hashing_busy_response():
+    response = create_error_response(
+        "Too many sign-ins in progress, please retry",
+        HTTPStatus.SERVICE_UNAVAILABLE,
+    )
+    response.headers["Retry-After"] = "1"
+    return response
+
+
+def upgrade_password_hash(user, password):
+    """Rehash ``password`` under the current policy after a good login.
+
+    The login succeeds either way; if the pool is busy or the write fails
+    the old hash stays and is upgraded on a later login. It never waits
+    for a slot, which other logins need more.
+    """
+    try:
+        user.password = password_hashing_pool.hash(password, wait=False)
+        db.session.commit()
+    except PasswordHashingBusyError:
+        db.session.rollback()
+    except Exception as e:
+        logger.warning(f"Password rehash failed: {str(e)}")
+        db.session.rollback()
+
+
 @auth.route("/login", methods=["POST"])
 @limiter.limit("10 per minute")
 def handle_login():
@@ -38,14 +74,24 @@ def handle_login():
 
         user = User.query.filter_by(email=login_data.email).first()
 
-        # Validate credentials
-        if not user or not bcrypt.check_password_hash(
-            user.password, login_data.password
-        ):
+        # Validate credentials; the hash runs in the hashing pool
+        try:
+            valid = user is not None and password_hashing_pool.verify(
+                user.password, login_data.password
+            )
+        except PasswordHashingBusyError:
+            return hashing_busy_response()
+
+        if not valid:
             return create_error_response(
                 "Invalid email or password", HTTPStatus.UNAUTHORIZED
             )
 
+        if password_hashing_pool.needs_rehash(user.password):
+            upgrade_password_hash(user, login_data.password)
+        # The client's refreshes will look the user up by id next
+        user_cache.put(user)
+
         # Generate tokens
         user_data = {"user_id": str(user.id), "email": user.email}
         access_token = JWTService.create_access_token(user_data)
@@ -58,7 +104,7 @@ def handle_login():
             refresh_token=refresh_token,
         )
 
-        return create_success_response(token_response.model_dump(), HTTPStatus.OK)
+        return create_success_response(token_response, HTTPStatus.OK)
 
     except Exception as e:
         logger.error(f"Login failed: {str(e)}")
@@ -90,12 +136,14 @@ def handle_register():
             )
 
         # Create user
-        password_hash = bcrypt.generate_password_hash(register_data.password).decode(
-            "utf-8"
-        )
+        try:
+            password_hash = password_hashing_pool.hash(register_data.password)
+        except PasswordHashingBusyError:
+            return hashing_busy_response()
         user = User(email=register_data.email, password=password_hash)
         db.session.add(user)
         db.session.commit()
+        user_cache.put(user)
 
         # Generate tokens
         user_data = {"user_id": str(user.id), "email": user.email}
@@ -109,7 +157,7 @@ def handle_register():
             refresh_token=refresh_token,
         )
 
-        return create_success_response(token_response.model_dump(), HTTPStatus.CREATED)
+        return create_success_response(token_response, HTTPStatus.CREATED)
 
     except Exception as e:
         logger.error(f"Registration failed: {str(e)}")
@@ -139,17 +187,22 @@ def refresh_token():
         try:
             payload = JWTService.decode_refresh_token(refresh_data.refresh_token)
             # Validate payload structure with Pydantic
-            TokenPayloadSchema(**payload)
+            token_data = TokenPayloadSchema(**payload)
         except (ValueError, ValidationError) as e:
             return create_error_response(str(e), HTTPStatus.UNAUTHORIZED)
 
-        # Check if user exists
-        user = User.query.filter_by(id=payload["user_id"]).first()
+        if token_revocation_service.is_revoked(token_data.jti):
+            return create_error_response(
+                "Refresh token has been revoked", HTTPStatus.UNAUTHORIZED
+            )
+
+        # Check if user exists; usually answered by the user cache
+        user = user_cache.get(token_data.user_id)
         if not user:
             return create_error_response("User not found", HTTPStatus.UNAUTHORIZED)
 
         # Generate new access token
-        user_data = {"user_id": str(user.id), "email": user.email}
+        user_data = {"user_id": user.id, "email": user.email}
         access_token = JWTService.create_access_token(user_data)
 
         # Create response using Pydantic schema
@@ -159,10 +212,109 @@ def refresh_token():
             refresh_token=None,  # Don't generate new refresh token
         )
 
-        return create_success_response(token_response.model_dump(), HTTPStatus.OK)
+        return create_success_response(token_response, HTTPStatus.OK)
 
     except Exception as e:
         logger.error(f"Token refresh failed: {str(e)}")
         return create_error_response(
             "Token refresh failed", HTTPStatus.INTERNAL_SERVER_ERROR
         )
+
+
+def revoke(token_data: TokenPayloadSchema):
+    # Tokens issued before revocation existed have no jti and just expire
+    if token_data.jti is not None and token_data.exp is not None:
+        token_revocation_service.revoke(token_data.jti, token_data.exp)
+
+
+def decode_any_token(token: str) -> TokenPayloadSchema:
+    """Payload of an access or refresh token, raising ValueError if invalid"""
+    try:
+        payload = JWTService.decode_token(token)
+    except ValueError:
+        payload = JWTService.decode_refresh_token(token)
+    try:
+        return TokenPayloadSchema(**payload)
+    except ValidationError:
+        raise ValueError("Invalid token structure")
+
+
+@auth.route("/logout", methods=["POST"])
+@jwt_required
+@limiter.limit("10 per minute")
+def handle_logout():
+    try:
+        # The body is optional; it may name a refresh token to revoke too
+        try:
+            logout_data = LogoutRequestSchema(**(request.get_json(silent=True) or {}))
+        except ValidationError as e:
+            return create_error_response(
+                f"Validation error: {e}", HTTPStatus.BAD_REQUEST
+            )
+
+        refresh_data = None
+        if logout_data.refresh_token:
+            try:
+                refresh_data = TokenPayloadSchema(
+                    **JWTService.decode_refresh_token(logout_data.refresh_token)
+                )
+            except (ValueError, ValidationError) as e:
+                return create_error_response(str(e), HTTPStatus.BAD_REQUEST)
+            if refresh_data.user_id != request.current_user["user_id"]:
+                return create_error_response(
+                    "Refresh token belongs to another user", HTTPStatus.FORBIDDEN
+                )
+
+        revoke(request.token_data)
+        if refresh_data is not None:
+            revoke(refresh_data)
+
+        return create_success_response(
+            SuccessResponseSchema(message="Logged out"), HTTPStatus.OK
+        )
+
+    except Exception as e:
+        logger.error(f"Logout failed: {str(e)}")
+        db.session.rollback()
+        return create_error_response("Logout failed", HTTPStatus.INTERNAL_SERVER_ERROR)
+
+
+@auth.route("/revoke", methods=["POST"])
+@jwt_required
+@limiter.limit("10 per minute")
+def handle_revoke():
+    try:
+        # Validate request format
+        if not request.is_json:
+            return create_error_response("Request must be JSON", HTTPStatus.BAD_REQUEST)
+
+        # Validate request data with Pydantic
+        try:
+            revoke_data = RevokeTokenRequestSchema(**request.json)
+        except ValidationError as e:
+            return create_error_response(
+                f"Validation error: {e}", HTTPStatus.BAD_REQUEST
+            )
+
+        # Any of the user's tokens, such as another device's refresh token
+        try:
+            token_data = decode_any_token(revoke_data.token)
+        except ValueError as e:
+            return create_error_response(str(e), HTTPStatus.BAD_REQUEST)
+        if token_data.user_id != request.current_user["user_id"]:
+            return create_error_response(
+                "Token belongs to another user", HTTPStatus.FORBIDDEN
+            )
+
+        revoke(token_data)
+
+        return create_success_response(
+            SuccessResponseSchema(message="Token revoked"), HTTPStatus.OK
+        )
+
+    except Exception as e:
+        logger.error(f"Token revocation failed: {str(e)}")
+        db.session.rollback()
+        return create_error_response(
+            "Token revocation failed", HTTPStatus.INTERNAL_SERVER_ERROR
+        )
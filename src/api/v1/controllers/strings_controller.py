@@ -1,28 +1,143 @@
 import logging
-import random
+import os
 from http import HTTPStatus
 
-from flask import Blueprint, request
+from flask import Blueprint, Response, request, stream_with_context
+from limits import parse_many
 from pydantic import ValidationError
 
 from src.api.v1.middlewares.auth_middleware import jwt_required
+from src.core.db_routing import read_only
 from src.core.metrics import STRINGS_RETRIEVED, STRINGS_SAVED
 from src.core.models.string import String
+from src.core.schemas.base import PaginatedResponseSchema
 from src.core.schemas.strings import (
+    MAX_BATCH_STRINGS,
+    RandomStringListResponseSchema,
+    RandomStringQuerySchema,
     RandomStringResponseSchema,
+    StringBatchCreateResponseSchema,
+    StringBatchItemErrorSchema,
+    StringBatchQuerySchema,
     StringCreateResponseSchema,
     StringCreateSchema,
+    StringExistsQuerySchema,
+    StringExistsResponseSchema,
+    StringExportQuerySchema,
+    StringImportResponseSchema,
+    StringListQuerySchema,
+    StringSchema,
+    StringSearchQuerySchema,
+    StringSearchResultSchema,
 )
+from src.core.services.random_string_pool import random_string_pool
+from src.core.services.random_string_service import random_string_service
+from src.core.services.string_export_service import string_export_service
+from src.core.services.string_import_service import StringImport, string_import_service
+from src.core.services.string_listing_service import (
+    InvalidCursorError,
+    string_listing_service,
+)
+from src.core.services.string_search_service import string_search_service
+from src.core.services.string_write_service import string_write_service
+from src.core.services.write_coalescer import save_coalescer
 from src.factory import db, limiter
 from src.utils import create_error_response, create_success_response
 
 strings = Blueprint("strings", __name__)
 logger = logging.getLogger(__name__)
 
+SAVE_RATE_LIMIT = os.getenv("STRINGS_SAVE_RATE_LIMIT", "100 per minute")
+# Bulk ingest has its own limit, charged per item, so a full batch fits
+BATCH_SAVE_RATE_LIMIT = os.getenv("STRINGS_BATCH_SAVE_RATE_LIMIT", "10000 per minute")
+
+
+def batch_size_limit(rate_limit: str) -> int:
+    """Largest batch that ``rate_limit`` can ever admit in one request"""
+    return min([MAX_BATCH_STRINGS] + [item.amount for item in parse_many(rate_limit)])
+
+
+BATCH_MAX_STRINGS = batch_size_limit(BATCH_SAVE_RATE_LIMIT)
+
+
+def batch_save_cost():
+    """Rate limit cost of a batch save: one hit per submitted string"""
+    body = request.get_json(silent=True)
+    return len(body) if isinstance(body, list) and body else 1
+
+
+@strings.route("", methods=["GET"])
+@limiter.limit("100 per minute")
+@read_only()
+def list_strings():
+    try:
+        try:
+            query = StringListQuerySchema(**request.args.to_dict())
+        except ValidationError as e:
+            return create_error_response(
+                f"Validation error: {e}", HTTPStatus.BAD_REQUEST
+            )
+
+        try:
+            rows, next_cursor = string_listing_service.page(
+                query.cursor, query.limit, query.order
+            )
+        except InvalidCursorError as e:
+            return create_error_response(str(e), HTTPStatus.BAD_REQUEST)
+
+        response_data = PaginatedResponseSchema[StringSchema](
+            items=[StringSchema.model_validate(row) for row in rows],
+            per_page=query.limit,
+            next_cursor=next_cursor,
+            total=string_listing_service.total() if query.include_total else None,
+        )
+
+        return create_success_response(response_data, HTTPStatus.OK)
+
+    except Exception as e:
+        logger.error(f"Error listing strings: {e}")
+        return create_error_response(
+            "Internal server error", HTTPStatus.INTERNAL_SERVER_ERROR
+        )
+
+
+@strings.route("/search", methods=["GET"])
+@limiter.limit("100 per minute")
+@read_only()
+def search_strings():
+    try:
+        try:
+            query = StringSearchQuerySchema(**request.args.to_dict())
+        except ValidationError as e:
+            return create_error_response(
+                f"Validation error: {e}", HTTPStatus.BAD_REQUEST
+            )
+
+        try:
+            rows, next_cursor = string_search_service.search(
+                query.q, query.cursor, query.limit
+            )
+        except InvalidCursorError as e:
+            return create_error_response(str(e), HTTPStatus.BAD_REQUEST)
+
+        response_data = PaginatedResponseSchema[StringSearchResultSchema](
+            items=[StringSearchResultSchema(**row) for row in rows],
+            per_page=query.limit,
+            next_cursor=next_cursor,
+        )
+
+        return create_success_response(response_data, HTTPStatus.OK)
+
+    except Exception as e:
+        logger.error(f"Error searching strings: {e}")
+        return create_error_response(
+            "Internal server error", HTTPStatus.INTERNAL_SERVER_ERROR
+        )
+
 
 @strings.route("/save", methods=["POST"])
 @jwt_required
-@limiter.limit("100 per minute")
+@limiter.shared_limit(SAVE_RATE_LIMIT, scope="strings_save")
 def save_string():
     try:
         # Validate request format
@@ -38,21 +153,38 @@ def save_string():
                 f"Validation error: {e}", HTTPStatus.BAD_REQUEST
             )
 
-        # Create and save the string
-        new_string = String(value=string_data.string)
-        db.session.add(new_string)
-        db.session.commit()
+        # In deduplicate mode a value that is already stored keeps its id
+        if string_write_service.deduplicate:
+            existing_id = string_write_service.find_id(string_data.string)
+            if existing_id is not None:
+                response_data = StringCreateResponseSchema(
+                    message="String already exists", id=existing_id
+                )
+                return create_success_response(response_data, HTTPStatus.OK)
+
+        # Create and save the string, sharing a commit with concurrent saves
+        # when write coalescing is enabled
+        if save_coalescer.enabled:
+            new_id = save_coalescer.save(string_data.string)
+        elif string_write_service.assigns_ids:
+            new_id = string_write_service.insert_many([string_data.string])[0]
+            db.session.commit()
+        else:
+            new_string = String(value=string_data.string)
+            db.session.add(new_string)
+            db.session.commit()
+            new_id = new_string.id
 
         # Create response using Pydantic schema
         response_data = StringCreateResponseSchema(
             message="String saved successfully",
             status="success",
-            id=new_string.id,
+            id=new_id,
         )
 
         STRINGS_SAVED.inc()
 
-        return create_success_response(response_data.model_dump(), HTTPStatus.CREATED)
+        return create_success_response(response_data, HTTPStatus.CREATED)
 
     except Exception as e:
         db.session.rollback()
@@ -62,24 +194,241 @@ def save_string():
         )
 
 
+@strings.route("/save/batch", methods=["POST"])
+@jwt_required
+@limiter.shared_limit(
+    BATCH_SAVE_RATE_LIMIT, scope="strings_batch_save", cost=batch_save_cost
+)
+def save_strings_batch():
+    try:
+        # Validate request format
+        if not request.is_json:
+            return create_error_response("Request must be JSON", HTTPStatus.BAD_REQUEST)
+
+        try:
+            query = StringBatchQuerySchema(**request.args.to_dict())
+        except ValidationError as e:
+            return create_error_response(
+                f"Validation error: {e}", HTTPStatus.BAD_REQUEST
+            )
+
+        items = request.json
+        if not isinstance(items, list) or not items:
+            return create_error_response(
+                "Request body must be a non-empty JSON array", HTTPStatus.BAD_REQUEST
+            )
+        if len(items) > BATCH_MAX_STRINGS:
+            # Larger batches would never fit the per-item rate limit
+            return create_error_response(
+                f"A batch may contain at most {BATCH_MAX_STRINGS} strings",
+                HTTPStatus.BAD_REQUEST,
+            )
+
+        # Validate every item in one pass, remembering where valid ones came from
+        values, positions, errors = [], [], []
+        for index, item in enumerate(items):
+            try:
+                values.append(StringCreateSchema.model_validate(item).string)
+                positions.append(index)
+            except ValidationError as e:
+                errors.append(StringBatchItemErrorSchema(index=index, message=str(e)))
+
+        if errors and (query.atomic or not values):
+            response_data = StringBatchCreateResponseSchema(
+                status="failed",
+                message="Validation failed, no strings were saved",
+                ids=[],
+                saved=0,
+                errors=errors,
+            )
+            return create_success_response(response_data, HTTPStatus.BAD_REQUEST)
+
+        new_ids = string_write_service.save_many(values)
+
+        ids = [None] * len(items)
+        for position, new_id in zip(positions, new_ids):
+            ids[position] = new_id
+
+        response_data = StringBatchCreateResponseSchema(
+            message=(
+                f"Saved {len(values)} of {len(items)} strings"
+                if errors
+                else "Strings saved successfully"
+            ),
+            ids=ids,
+            saved=len(values),
+            errors=errors,
+        )
+
+        STRINGS_SAVED.inc(len(values))
+
+        return create_success_response(response_data, HTTPStatus.CREATED)
+
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error saving string batch: {e}")
+        return create_error_response(
+            "Internal server error", HTTPStatus.INTERNAL_SERVER_ERROR
+        )
+
+
+@strings.route("/import", methods=["POST"])
+@jwt_required
+@limiter.limit("10 per hour")
+def import_strings():
+    # Read the body as a stream; never touch request.data or request.json here
+    if request.mimetype != "application/x-ndjson":
+        return create_error_response(
+            "Request must be application/x-ndjson", HTTPStatus.BAD_REQUEST
+        )
+
+    progress = StringImport()
+    try:
+        string_import_service.run(request.stream, progress)
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error importing strings: {e}")
+        return create_error_response(
+            f"Import failed after saving {progress.saved} strings",
+            HTTPStatus.INTERNAL_SERVER_ERROR,
+        )
+
+    # An empty body imports nothing and is not an error; only a body whose
+    # every line failed is
+    if progress.saved:
+        status, status_code = "success", HTTPStatus.CREATED
+    elif progress.failed:
+        status, status_code = "failed", HTTPStatus.BAD_REQUEST
+    else:
+        status, status_code = "success", HTTPStatus.OK
+
+    total = progress.saved + progress.failed
+    response_data = StringImportResponseSchema(
+        status=status,
+        message=f"Imported {progress.saved} of {total} strings",
+        lines=progress.lines,
+        saved=progress.saved,
+        failed=progress.failed,
+        errors=progress.errors,
+        errors_truncated=len(progress.errors) < progress.failed,
+    )
+
+    return create_success_response(response_data, status_code)
+
+
+EXPORT_MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@strings.route("/export", methods=["GET"])
+@jwt_required
+@limiter.limit("30 per hour")
+@read_only()
+def export_strings():
+    try:
+        query = StringExportQuerySchema(**request.args.to_dict())
+    except ValidationError as e:
+        return create_error_response(f"Validation error: {e}", HTTPStatus.BAD_REQUEST)
+
+    try:
+        upto_id = string_export_service.upper_bound(query.since_id)
+    except Exception as e:
+        logger.error(f"Error starting export: {e}")
+        return create_error_response(
+            "Internal server error", HTTPStatus.INTERNAL_SERVER_ERROR
+        )
+
+    # Errors after this point can only abort the stream; the status line has
+    # already been sent
+    chunks = string_export_service.stream(query.format, query.since_id, upto_id)
+
+    def body():
+        # The view's read_only block has ended by the time this runs
+        with read_only():
+            yield from chunks
+
+    response = Response(
+        stream_with_context(body()), mimetype=EXPORT_MIMETYPES[query.format]
+    )
+    response.headers[
+        "Content-Disposition"
+    ] = f"attachment; filename=strings.{query.format}"
+    # Pass this back as since_id to fetch only rows saved after this export
+    response.headers["X-Export-Upto-Id"] = str(upto_id or query.since_id)
+    return response
+
+
+@strings.route("/exists", methods=["GET"])
+@limiter.limit("100 per minute")
+@read_only()
+def string_exists():
+    try:
+        try:
+            query = StringExistsQuerySchema(**request.args.to_dict())
+        except ValidationError as e:
+            return create_error_response(
+                f"Validation error: {e}", HTTPStatus.BAD_REQUEST
+            )
+
+        string_id = string_write_service.find_id(query.value)
+
+        response_data = StringExistsResponseSchema(
+            exists=string_id is not None, id=string_id
+        )
+
+        return create_success_response(response_data, HTTPStatus.OK)
+
+    except Exception as e:
+        logger.error(f"Error looking up string: {e}")
+        return create_error_response(
+            "Internal server error", HTTPStatus.INTERNAL_SERVER_ERROR
+        )
+
+
 @strings.route("/random", methods=["GET"])
 @limiter.limit("100 per minute")
+@read_only()
 def get_random_string():
     try:
-        count = db.session.query(String).count()
+        try:
+            query = RandomStringQuerySchema(**request.args.to_dict())
+        except ValidationError as e:
+            return create_error_response(
+                f"Validation error: {e}", HTTPStatus.BAD_REQUEST
+            )
 
-        if count == 0:
-            return create_error_response("No strings found", HTTPStatus.NOT_FOUND)
+        if query.count is not None:
+            return get_random_strings(query.count, query.replace)
+
+        random_string = random_string_pool.get()
 
-        random_offset = random.randint(0, count - 1)
-        random_string = db.session.query(String).offset(random_offset).first()
+        if random_string is None:
+            return create_error_response("No strings found", HTTPStatus.NOT_FOUND)
 
-        response_data = RandomStringResponseSchema(random_string=random_string.value)
+        response_data = RandomStringResponseSchema(random_string=random_string)
 
         STRINGS_RETRIEVED.inc()
 
-        return create_success_response(response_data.model_dump(), HTTPStatus.OK)
+        return create_success_response(response_data, HTTPStatus.OK)
 
     except Exception as e:
         logger.error(f"Error getting random string: {e}")
         return create_error_response(str(e), HTTPStatus.INTERNAL_SERVER_ERROR)
+
+
+def get_random_strings(count, replace):
+    """Serve ``count`` random strings sampled in a single query"""
+    if replace:
+        rows = random_string_service.sample(count)
+    else:
+        rows = random_string_service.sample_unique(count)
+
+    if not rows:
+        return create_error_response("No strings found", HTTPStatus.NOT_FOUND)
+
+    response_data = RandomStringListResponseSchema(
+        random_strings=[row.value for row in rows], count=len(rows)
+    )
+
+    STRINGS_RETRIEVED.inc(len(rows))
+
+    return create_success_response(response_data, HTTPStatus.OK)
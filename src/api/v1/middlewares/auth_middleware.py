@@ -1,31 +1,47 @@
 from functools import wraps
 from http import HTTPStatus
+from typing import Optional, Tuple
 
 from flask import request
 from pydantic import ValidationError
 
 from src.core.schemas.auth import TokenPayloadSchema
 from src.core.services.jwt_service import JWTService
+from src.core.services.token_cache import verified_token_cache
+from src.core.services.token_revocation_service import token_revocation_service
 from src.utils import create_error_response
 
 
-def jwt_required(f):
-    @wraps(f)
-    def decorated(*args, **kwargs):
-        token = None
+def bearer_token() -> Optional[str]:
+    auth_header = request.headers.get("Authorization")
+    if auth_header:
+        parts = auth_header.split()
+        if len(parts) == 2 and parts[0].lower() == "bearer":
+            return parts[1]
+    return None
+
+
+def authenticate() -> Tuple[Optional[TokenPayloadSchema], Optional[str]]:
+    """The request's verified access token, or why it has none.
 
-        # Get token from Authorization header
-        auth_header = request.headers.get("Authorization")
-        if auth_header:
-            parts = auth_header.split()
-            if len(parts) == 2 and parts[0].lower() == "bearer":
-                token = parts[1]
+    Runs once per request: the rate limit key function calls it before the
+    view, and ``jwt_required`` reuses the result.
+    """
+    # On the request rather than g, which lives as long as the app context
+    # and so can outlive a request
+    if not hasattr(request, "auth_result"):
+        request.auth_result = _authenticate()
+    return request.auth_result
 
-        if not token:
-            return create_error_response(
-                "Missing authentication token", HTTPStatus.UNAUTHORIZED
-            )
 
+def _authenticate() -> Tuple[Optional[TokenPayloadSchema], Optional[str]]:
+    token = bearer_token()
+    if not token:
+        return None, "Missing authentication token"
+
+    # A token that passed every check below skips them until it expires
+    token_data = verified_token_cache.get(token)
+    if token_data is None:
         try:
             # Decode and validate token
             payload = JWTService.decode_token(token)
@@ -34,29 +50,42 @@ def jwt_required(f):
             try:
                 token_data = TokenPayloadSchema(**payload)
             except ValidationError:
-                return create_error_response(
-                    "Invalid token structure", HTTPStatus.UNAUTHORIZED
-                )
+                return None, "Invalid token structure"
 
             # Check token type
             if token_data.type != "access":
-                return create_error_response(
-                    "Invalid token type", HTTPStatus.UNAUTHORIZED
-                )
-
-            # Add user info to request
-            request.current_user = {
-                "user_id": token_data.user_id,
-                "email": token_data.email,
-            }
-
-            return f(*args, **kwargs)
+                return None, "Invalid token type"
 
         except ValueError as e:
-            return create_error_response(str(e), HTTPStatus.UNAUTHORIZED)
+            return None, str(e)
         except Exception:
-            return create_error_response(
-                "Invalid authentication token", HTTPStatus.UNAUTHORIZED
-            )
+            return None, "Invalid authentication token"
+
+        verified_token_cache.put(token, token_data)
+
+    # Checked on cache hits too; usually answered by the Bloom filter
+    if token_revocation_service.is_revoked(token_data.jti):
+        return None, "Token has been revoked"
+
+    return token_data, None
+
+
+def jwt_required(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        token_data, error = authenticate()
+        if token_data is None:
+            return create_error_response(error, HTTPStatus.UNAUTHORIZED)
+
+        # Add user info to request
+        request.current_user = {
+            "user_id": token_data.user_id,
+            "email": token_data.email,
+        }
+        request.token_data = token_data
+
+        # Called outside the try block so errors raised by the view, such as
+        # rate limit exceeded, aren't reported as authentication failures
+        return f(*args, **kwargs)
 
     return decorated
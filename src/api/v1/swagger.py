@@ -53,6 +53,126 @@ def swagger_json():
                         "id": {"type": "integer", "example": 1},
                     },
                 },
+                "StringBatchCreateResponse": {
+                    "type": "object",
+                    "properties": {
+                        "status": {"type": "string", "example": "success"},
+                        "message": {
+                            "type": "string",
+                            "example": "Strings saved successfully",
+                        },
+                        "ids": {
+                            "type": "array",
+                            "description": "Ids in request order, null for rejected items",
+                            "items": {"type": "integer", "nullable": True},
+                            "example": [1, 2, 3],
+                        },
+                        "saved": {"type": "integer", "example": 3},
+                        "errors": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "index": {"type": "integer", "example": 1},
+                                    "message": {"type": "string"},
+                                },
+                            },
+                        },
+                    },
+                },
+                "StringImportResponse": {
+                    "type": "object",
+                    "properties": {
+                        "status": {"type": "string", "example": "success"},
+                        "message": {
+                            "type": "string",
+                            "example": "Imported 999 of 1000 strings",
+                        },
+                        "lines": {"type": "integer", "example": 1000},
+                        "saved": {"type": "integer", "example": 999},
+                        "failed": {"type": "integer", "example": 1},
+                        "errors": {
+                            "type": "array",
+                            "description": "The first 100 rejected lines",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "line": {"type": "integer", "example": 42},
+                                    "message": {"type": "string"},
+                                },
+                            },
+                        },
+                        "errors_truncated": {"type": "boolean", "example": False},
+                    },
+                },
+                "StringExistsResponse": {
+                    "type": "object",
+                    "properties": {
+                        "exists": {"type": "boolean", "example": True},
+                        "id": {"type": "integer", "nullable": True, "example": 1},
+                    },
+                },
+                "String": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "integer", "example": 1},
+                        "value": {"type": "string", "example": "Hello, World!"},
+                        "created_at": {
+                            "type": "string",
+                            "format": "date-time",
+                            "nullable": True,
+                        },
+                    },
+                },
+                "StringPage": {
+                    "type": "object",
+                    "properties": {
+                        "items": {
+                            "type": "array",
+                            "items": {"$ref": "#/components/schemas/String"},
+                        },
+                        "per_page": {"type": "integer", "example": 20},
+                        "next_cursor": {
+                            "type": "string",
+                            "nullable": True,
+                            "description": "Opaque token for the next page, null on the last page",
+                        },
+                        "total": {
+                            "type": "integer",
+                            "nullable": True,
+                            "description": "Cached row count, only present when include_total is true",
+                        },
+                    },
+                },
+                "StringSearchPage": {
+                    "type": "object",
+                    "properties": {
+                        "items": {
+                            "type": "array",
+                            "items": {
+                                "allOf": [
+                                    {"$ref": "#/components/schemas/String"},
+                                    {
+                                        "type": "object",
+                                        "properties": {
+                                            "score": {
+                                                "type": "number",
+                                                "example": 1.25,
+                                                "description": "Relevance, higher is better",
+                                            }
+                                        },
+                                    },
+                                ]
+                            },
+                        },
+                        "per_page": {"type": "integer", "example": 20},
+                        "next_cursor": {
+                            "type": "string",
+                            "nullable": True,
+                            "description": "Opaque token for the next page, null on the last page",
+                        },
+                    },
+                },
                 "RandomStringResponse": {
                     "type": "object",
                     "properties": {
@@ -62,6 +182,17 @@ def swagger_json():
                         }
                     },
                 },
+                "RandomStringListResponse": {
+                    "type": "object",
+                    "properties": {
+                        "random_strings": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "example": ["First random string", "Second one"],
+                        },
+                        "count": {"type": "integer", "example": 2},
+                    },
+                },
                 "ErrorResponse": {
                     "type": "object",
                     "properties": {
@@ -130,9 +261,122 @@ def swagger_json():
                     },
                     "required": ["refresh_token"],
                 },
+                "LogoutRequest": {
+                    "type": "object",
+                    "properties": {
+                        "refresh_token": {
+                            "type": "string",
+                            "description": "Refresh token to revoke as well",
+                            "example": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9...",
+                        }
+                    },
+                },
+                "RevokeTokenRequest": {
+                    "type": "object",
+                    "properties": {
+                        "token": {
+                            "type": "string",
+                            "description": "Access or refresh token of the caller",
+                            "example": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9...",
+                        }
+                    },
+                    "required": ["token"],
+                },
+                "MessageResponse": {
+                    "type": "object",
+                    "properties": {
+                        "status": {"type": "string", "example": "success"},
+                        "message": {"type": "string", "example": "Logged out"},
+                    },
+                },
             },
         },
         "paths": {
+            "/strings": {
+                "get": {
+                    "summary": "List strings",
+                    "description": "Page through stored strings by id using opaque cursors (public endpoint)",
+                    "parameters": [
+                        {
+                            "name": "cursor",
+                            "in": "query",
+                            "required": False,
+                            "description": "next_cursor from the previous page",
+                            "schema": {"type": "string"},
+                        },
+                        {
+                            "name": "limit",
+                            "in": "query",
+                            "required": False,
+                            "schema": {
+                                "type": "integer",
+                                "minimum": 1,
+                                "maximum": 100,
+                                "default": 20,
+                            },
+                        },
+                        {
+                            "name": "order",
+                            "in": "query",
+                            "required": False,
+                            "schema": {
+                                "type": "string",
+                                "enum": ["asc", "desc"],
+                                "default": "asc",
+                            },
+                        },
+                        {
+                            "name": "include_total",
+                            "in": "query",
+                            "required": False,
+                            "description": "Include a cached total that may lag behind by up to a minute",
+                            "schema": {"type": "boolean", "default": False},
+                        },
+                    ],
+                    "responses": {
+                        "200": {
+                            "description": "A page of strings",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/StringPage"
+                                    }
+                                }
+                            },
+                        },
+                        "400": {
+                            "description": "Invalid cursor or query parameters",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "429": {
+                            "description": "Too many requests",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "500": {
+                            "description": "Internal server error",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                    },
+                }
+            },
             "/strings/save": {
                 "post": {
                     "summary": "Save a string",
@@ -200,23 +444,58 @@ def swagger_json():
                     },
                 }
             },
-            "/strings/random": {
-                "get": {
-                    "summary": "Get a random string",
-                    "description": "Retrieve a random string from the database (public endpoint)",
+            "/strings/save/batch": {
+                "post": {
+                    "summary": "Save several strings",
+                    "description": "Save up to 1000 strings in one request (requires authentication). Batches have their own rate limit, 10000 strings per minute by default, charged per string.",
+                    "security": [{"bearerAuth": []}],
+                    "parameters": [
+                        {
+                            "name": "atomic",
+                            "in": "query",
+                            "required": False,
+                            "description": "Reject the whole batch if any item is invalid; when false, valid items are saved and invalid ones reported",
+                            "schema": {"type": "boolean", "default": True},
+                        }
+                    ],
+                    "requestBody": {
+                        "required": True,
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "type": "array",
+                                    "items": {
+                                        "$ref": "#/components/schemas/StringCreate"
+                                    },
+                                    "minItems": 1,
+                                    "maxItems": 1000,
+                                }
+                            }
+                        },
+                    },
                     "responses": {
-                        "200": {
-                            "description": "A random string",
+                        "201": {
+                            "description": "Strings saved",
                             "content": {
                                 "application/json": {
                                     "schema": {
-                                        "$ref": "#/components/schemas/RandomStringResponse"
+                                        "$ref": "#/components/schemas/StringBatchCreateResponse"
                                     }
                                 }
                             },
                         },
-                        "404": {
-                            "description": "No strings found",
+                        "400": {
+                            "description": "Bad request or validation failed",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/StringBatchCreateResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "401": {
+                            "description": "Unauthorized",
                             "content": {
                                 "application/json": {
                                     "schema": {
@@ -248,43 +527,52 @@ def swagger_json():
                     },
                 }
             },
-            "/auth/register": {
+            "/strings/import": {
                 "post": {
-                    "summary": "Register a new user",
-                    "description": "Create a new user account and get authentication tokens",
+                    "summary": "Import strings from NDJSON",
+                    "description": 'Stream newline-delimited JSON objects of the form {"string": "..."} into the database (requires authentication). The body is read incrementally and committed every 1000 strings, so uploads are not limited in size.',
+                    "security": [{"bearerAuth": []}],
                     "requestBody": {
                         "required": True,
                         "content": {
-                            "application/json": {
-                                "schema": {
-                                    "$ref": "#/components/schemas/RegisterRequest"
-                                }
+                            "application/x-ndjson": {
+                                "schema": {"$ref": "#/components/schemas/StringCreate"}
                             }
                         },
                     },
                     "responses": {
+                        "200": {
+                            "description": "Empty body, nothing to import",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/StringImportResponse"
+                                    }
+                                }
+                            },
+                        },
                         "201": {
-                            "description": "Registration successful",
+                            "description": "Import finished, possibly with rejected lines",
                             "content": {
                                 "application/json": {
                                     "schema": {
-                                        "$ref": "#/components/schemas/TokenResponse"
+                                        "$ref": "#/components/schemas/StringImportResponse"
                                     }
                                 }
                             },
                         },
                         "400": {
-                            "description": "Bad request",
+                            "description": "Wrong content type, or every line was rejected",
                             "content": {
                                 "application/json": {
                                     "schema": {
-                                        "$ref": "#/components/schemas/ErrorResponse"
+                                        "$ref": "#/components/schemas/StringImportResponse"
                                     }
                                 }
                             },
                         },
-                        "409": {
-                            "description": "Conflict - Email already exists",
+                        "401": {
+                            "description": "Unauthorized",
                             "content": {
                                 "application/json": {
                                     "schema": {
@@ -304,7 +592,7 @@ def swagger_json():
                             },
                         },
                         "500": {
-                            "description": "Internal server error",
+                            "description": "Import failed part way; earlier chunks stay committed",
                             "content": {
                                 "application/json": {
                                     "schema": {
@@ -316,41 +604,54 @@ def swagger_json():
                     },
                 }
             },
-            "/auth/login": {
-                "post": {
-                    "summary": "User login",
-                    "description": "Authenticate and get access and refresh tokens",
-                    "requestBody": {
-                        "required": True,
-                        "content": {
-                            "application/json": {
-                                "schema": {"$ref": "#/components/schemas/LoginRequest"}
-                            }
+            "/strings/search": {
+                "get": {
+                    "summary": "Search strings",
+                    "description": "Full-text search ranked by relevance, paginated with an opaque cursor (public endpoint)",
+                    "parameters": [
+                        {
+                            "name": "q",
+                            "in": "query",
+                            "required": True,
+                            "description": "Words to search for; rows matching any word are returned",
+                            "schema": {
+                                "type": "string",
+                                "minLength": 1,
+                                "maxLength": 200,
+                            },
                         },
-                    },
+                        {
+                            "name": "cursor",
+                            "in": "query",
+                            "required": False,
+                            "description": "next_cursor from the previous page",
+                            "schema": {"type": "string"},
+                        },
+                        {
+                            "name": "limit",
+                            "in": "query",
+                            "required": False,
+                            "schema": {
+                                "type": "integer",
+                                "minimum": 1,
+                                "maximum": 100,
+                                "default": 20,
+                            },
+                        },
+                    ],
                     "responses": {
                         "200": {
-                            "description": "Login successful",
+                            "description": "A page of matching strings, best match first",
                             "content": {
                                 "application/json": {
                                     "schema": {
-                                        "$ref": "#/components/schemas/TokenResponse"
+                                        "$ref": "#/components/schemas/StringSearchPage"
                                     }
                                 }
                             },
                         },
                         "400": {
-                            "description": "Bad request",
-                            "content": {
-                                "application/json": {
-                                    "schema": {
-                                        "$ref": "#/components/schemas/ErrorResponse"
-                                    }
-                                }
-                            },
-                        },
-                        "401": {
-                            "description": "Invalid credentials",
+                            "description": "Missing query or invalid cursor",
                             "content": {
                                 "application/json": {
                                     "schema": {
@@ -382,33 +683,58 @@ def swagger_json():
                     },
                 }
             },
-            "/auth/refresh": {
-                "post": {
-                    "summary": "Refresh access token",
-                    "description": "Get a new access token using a valid refresh token",
-                    "requestBody": {
-                        "required": True,
-                        "content": {
-                            "application/json": {
-                                "schema": {
-                                    "$ref": "#/components/schemas/RefreshTokenRequest"
-                                }
-                            }
+            "/strings/export": {
+                "get": {
+                    "summary": "Export strings",
+                    "description": "Stream every stored string in id order as NDJSON or CSV (requires authentication). Rows saved after the export starts are not included; pass the X-Export-Upto-Id response header as since_id to export only newer rows.",
+                    "security": [{"bearerAuth": []}],
+                    "parameters": [
+                        {
+                            "name": "format",
+                            "in": "query",
+                            "required": False,
+                            "schema": {
+                                "type": "string",
+                                "enum": ["ndjson", "csv"],
+                                "default": "ndjson",
+                            },
                         },
-                    },
+                        {
+                            "name": "since_id",
+                            "in": "query",
+                            "required": False,
+                            "description": "Only export rows with a greater id",
+                            "schema": {"type": "integer", "minimum": 0, "default": 0},
+                        },
+                    ],
                     "responses": {
                         "200": {
-                            "description": "Token refresh successful",
+                            "description": "Streamed export",
+                            "headers": {
+                                "X-Export-Upto-Id": {
+                                    "description": "Highest id covered by this export",
+                                    "schema": {"type": "integer"},
+                                }
+                            },
+                            "content": {
+                                "application/x-ndjson": {
+                                    "schema": {"$ref": "#/components/schemas/String"}
+                                },
+                                "text/csv": {"schema": {"type": "string"}},
+                            },
+                        },
+                        "400": {
+                            "description": "Invalid format or since_id",
                             "content": {
                                 "application/json": {
                                     "schema": {
-                                        "$ref": "#/components/schemas/TokenResponse"
+                                        "$ref": "#/components/schemas/ErrorResponse"
                                     }
                                 }
                             },
                         },
-                        "400": {
-                            "description": "Bad request",
+                        "401": {
+                            "description": "Unauthorized",
                             "content": {
                                 "application/json": {
                                     "schema": {
@@ -417,8 +743,498 @@ def swagger_json():
                                 }
                             },
                         },
-                        "401": {
-                            "description": "Invalid refresh token",
+                        "429": {
+                            "description": "Too many requests",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "500": {
+                            "description": "Internal server error",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                    },
+                }
+            },
+            "/strings/exists": {
+                "get": {
+                    "summary": "Check whether a string is stored",
+                    "description": "Look up a string by exact content using the content hash index (public endpoint)",
+                    "parameters": [
+                        {
+                            "name": "value",
+                            "in": "query",
+                            "required": True,
+                            "description": "String to look up",
+                            "schema": {
+                                "type": "string",
+                                "minLength": 1,
+                                "maxLength": 1000,
+                            },
+                        }
+                    ],
+                    "responses": {
+                        "200": {
+                            "description": "Lookup result with the lowest matching id",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/StringExistsResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "400": {
+                            "description": "Missing or invalid value",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "429": {
+                            "description": "Too many requests",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "500": {
+                            "description": "Internal server error",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                    },
+                }
+            },
+            "/strings/random": {
+                "get": {
+                    "summary": "Get a random string",
+                    "description": "Retrieve a random string from the database (public endpoint). Pass count to get several strings in one request.",
+                    "parameters": [
+                        {
+                            "name": "count",
+                            "in": "query",
+                            "required": False,
+                            "description": "Number of strings to return",
+                            "schema": {"type": "integer", "minimum": 1, "maximum": 500},
+                        },
+                        {
+                            "name": "replace",
+                            "in": "query",
+                            "required": False,
+                            "description": "Sample with replacement; when false the strings are distinct and fewer than count are returned if the database holds fewer strings",
+                            "schema": {"type": "boolean", "default": True},
+                        },
+                    ],
+                    "responses": {
+                        "200": {
+                            "description": "A random string, or a list of random strings when count is given",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "oneOf": [
+                                            {
+                                                "$ref": "#/components/schemas/RandomStringResponse"
+                                            },
+                                            {
+                                                "$ref": "#/components/schemas/RandomStringListResponse"
+                                            },
+                                        ]
+                                    }
+                                }
+                            },
+                        },
+                        "400": {
+                            "description": "Invalid query parameters",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "404": {
+                            "description": "No strings found",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "429": {
+                            "description": "Too many requests",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "500": {
+                            "description": "Internal server error",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                    },
+                }
+            },
+            "/auth/register": {
+                "post": {
+                    "summary": "Register a new user",
+                    "description": "Create a new user account and get authentication tokens",
+                    "requestBody": {
+                        "required": True,
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "$ref": "#/components/schemas/RegisterRequest"
+                                }
+                            }
+                        },
+                    },
+                    "responses": {
+                        "201": {
+                            "description": "Registration successful",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/TokenResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "400": {
+                            "description": "Bad request",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "409": {
+                            "description": "Conflict - Email already exists",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "429": {
+                            "description": "Too many requests",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "500": {
+                            "description": "Internal server error",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                    },
+                }
+            },
+            "/auth/login": {
+                "post": {
+                    "summary": "User login",
+                    "description": "Authenticate and get access and refresh tokens",
+                    "requestBody": {
+                        "required": True,
+                        "content": {
+                            "application/json": {
+                                "schema": {"$ref": "#/components/schemas/LoginRequest"}
+                            }
+                        },
+                    },
+                    "responses": {
+                        "200": {
+                            "description": "Login successful",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/TokenResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "400": {
+                            "description": "Bad request",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "401": {
+                            "description": "Invalid credentials",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "429": {
+                            "description": "Too many requests",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "500": {
+                            "description": "Internal server error",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                    },
+                }
+            },
+            "/auth/refresh": {
+                "post": {
+                    "summary": "Refresh access token",
+                    "description": "Get a new access token using a valid refresh token",
+                    "requestBody": {
+                        "required": True,
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "$ref": "#/components/schemas/RefreshTokenRequest"
+                                }
+                            }
+                        },
+                    },
+                    "responses": {
+                        "200": {
+                            "description": "Token refresh successful",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/TokenResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "400": {
+                            "description": "Bad request",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "401": {
+                            "description": "Invalid refresh token",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "429": {
+                            "description": "Too many requests",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "500": {
+                            "description": "Internal server error",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                    },
+                }
+            },
+            "/auth/logout": {
+                "post": {
+                    "summary": "Log out",
+                    "description": "Revoke the access token used for this request, and the given refresh token",
+                    "security": [{"bearerAuth": []}],
+                    "requestBody": {
+                        "required": False,
+                        "content": {
+                            "application/json": {
+                                "schema": {"$ref": "#/components/schemas/LogoutRequest"}
+                            }
+                        },
+                    },
+                    "responses": {
+                        "200": {
+                            "description": "Logged out",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/MessageResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "400": {
+                            "description": "Bad request",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "401": {
+                            "description": "Unauthorized",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "403": {
+                            "description": "Token belongs to another user",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "429": {
+                            "description": "Too many requests",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "500": {
+                            "description": "Internal server error",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                    },
+                }
+            },
+            "/auth/revoke": {
+                "post": {
+                    "summary": "Revoke a token",
+                    "description": "Revoke one of the caller's access or refresh tokens, such as another device's session",
+                    "security": [{"bearerAuth": []}],
+                    "requestBody": {
+                        "required": True,
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "$ref": "#/components/schemas/RevokeTokenRequest"
+                                }
+                            }
+                        },
+                    },
+                    "responses": {
+                        "200": {
+                            "description": "Token revoked",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/MessageResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "400": {
+                            "description": "Bad request",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "401": {
+                            "description": "Unauthorized",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "$ref": "#/components/schemas/ErrorResponse"
+                                    }
+                                }
+                            },
+                        },
+                        "403": {
+                            "description": "Token belongs to another user",
                             "content": {
                                 "application/json": {
                                     "schema": {
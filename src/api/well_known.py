@@ -0,0 +1,16 @@
+from flask import Blueprint, Response, request
+
+from src.core.services.jwt_keys import JWKS_MAX_AGE, jwt_key_set
+
+well_known = Blueprint("well_known", __name__)
+
+
+@well_known.route("/jwks.json")
+def jwks():
+    """Public keys that verify our access tokens, for other services"""
+    response = Response(jwt_key_set.jwks(), mimetype="application/json")
+    # Verifiers may keep the key set for JWKS_MAX_AGE seconds, so a new key
+    # must be published at least that long before it starts signing
+    response.headers["Cache-Control"] = f"public, max-age={JWKS_MAX_AGE}"
+    response.set_etag(jwt_key_set.jwks_etag())
+    return response.make_conditional(request)
@@ -7,11 +7,26 @@ class DevConfig:
         host = os.getenv("MYSQL_HOST", "mysql")
         password = os.getenv("MYSQL_PASSWORD", "")
         database = os.getenv("MYSQL_DATABASE", "strings_db")
+        replica_hosts = os.getenv("MYSQL_REPLICA_HOSTS", "")
+        shard_hosts = os.getenv("MYSQL_SHARD_HOSTS", "")
 
         self.ENV = "development"
         self.DEBUG = True
         self.PORT = 5000
         self.HOST = "0.0.0.0"
         self.SQLALCHEMY_DATABASE_URI = f"mysql+mysqlconnector://{user}:{password}@{host}/{database}?charset=utf8mb4"
+        # Read-only endpoints are served from these when set
+        self.SQLALCHEMY_REPLICA_URIS = [
+            f"mysql+mysqlconnector://{user}:{password}@{replica.strip()}/{database}?charset=utf8mb4"
+            for replica in replica_hosts.split(",")
+            if replica.strip()
+        ]
+        # Strings are spread over these when set; order matters, append new
+        # shards at the end and run `flask strings rebalance`
+        self.SQLALCHEMY_SHARD_URIS = [
+            f"mysql+mysqlconnector://{user}:{password}@{shard.strip()}/{database}?charset=utf8mb4"
+            for shard in shard_hosts.split(",")
+            if shard.strip()
+        ]
         self.SQLALCHEMY_TRACK_MODIFICATIONS = False
         self.SECRET_KEY = "test-secret-key"
@@ -7,11 +7,30 @@ class ProductionConfig:
         host = os.getenv("MYSQL_HOST", "mysql")
         password = os.getenv("MYSQL_PASSWORD", "")
         database = os.getenv("MYSQL_DATABASE", "strings_db")
+        replica_hosts = os.getenv("MYSQL_REPLICA_HOSTS", "")
+        shard_hosts = os.getenv("MYSQL_SHARD_HOSTS", "")
 
         self.ENV = "production"
         self.DEBUG = False
         self.PORT = 80
         self.HOST = "0.0.0.0"
         self.SQLALCHEMY_DATABASE_URI = f"mysql+mysqlconnector://{user}:{password}@{host}/{database}?charset=utf8mb4"
+        # Read-only endpoints are served from these when set
+        self.SQLALCHEMY_REPLICA_URIS = [
+            f"mysql+mysqlconnector://{user}:{password}@{replica.strip()}/{database}?charset=utf8mb4"
+            for replica in replica_hosts.split(",")
+            if replica.strip()
+        ]
+        # Strings are spread over these when set; order matters, append new
+        # shards at the end and run `flask strings rebalance`
+        self.SQLALCHEMY_SHARD_URIS = [
+            f"mysql+mysqlconnector://{user}:{password}@{shard.strip()}/{database}?charset=utf8mb4"
+            for shard in shard_hosts.split(",")
+            if shard.strip()
+        ]
+        # Commit batches that span shards atomically with XA transactions
+        self.SQLALCHEMY_SHARD_TWO_PHASE = (
+            os.getenv("MYSQL_SHARD_TWO_PHASE", "true").lower() == "true"
+        )
         self.SQLALCHEMY_TRACK_MODIFICATIONS = False
         self.SECRET_KEY = os.getenv("SECRET_KEY", "production-secret-key")
@@ -0,0 +1,214 @@
+import click
+from flask.cli import AppGroup
+
+from src.core.sharding import each_shard
+from src.factory import db
+
+strings_cli = AppGroup("strings", help="Maintenance commands for stored strings.")
+auth_cli = AppGroup("auth", help="Commands for user authentication.")
+
+
+@strings_cli.command("backfill-hashes")
+@click.option("--batch-size", default=1000, show_default=True)
+def backfill_hashes(batch_size):
+    """Fill strings.value_hash for rows saved before it existed."""
+    from src.core.models.string import String, content_hash
+
+    table = String.__table__
+    updated = 0
+
+    for shard in each_shard():
+        last_id = 0
+        while True:
+            # Walk the primary key so each batch is an index range scan, and
+            # commit per batch so no lock is held for long
+            rows = (
+                db.session.query(String.id, String.value)
+                .filter(String.id > last_id, String.value_hash.is_(None))
+                .order_by(String.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+
+            db.session.execute(
+                table.update()
+                .where(table.c.id == db.bindparam("row_id"))
+                .values(value_hash=db.bindparam("hash")),
+                [{"row_id": row.id, "hash": content_hash(row.value)} for row in rows],
+            )
+            db.session.commit()
+
+            last_id = rows[-1].id
+            updated += len(rows)
+            where = f" on {shard}" if shard else ""
+            click.echo(f"Backfilled {updated} rows (up to id {last_id}{where})")
+
+    click.echo(f"Done, {updated} rows backfilled")
+
+
+@strings_cli.command("purge")
+@click.option(
+    "--max-age-days",
+    type=float,
+    default=None,
+    help="Delete strings older than this. Defaults to STRINGS_RETENTION_DAYS.",
+)
+@click.option("--batch-size", type=int, default=None)
+@click.option("--pause-ms", type=float, default=None)
+@click.option("--max-batches", type=int, default=None)
+@click.option("--dry-run", is_flag=True, help="Only count the expired strings.")
+def purge(max_age_days, batch_size, pause_ms, max_batches, dry_run):
+    """Delete strings older than the retention period in small batches."""
+    from src.core.services.string_retention_service import StringRetentionService
+
+    service = StringRetentionService(max_age_days, batch_size, pause_ms)
+    if service.max_age_days <= 0:
+        raise click.UsageError(
+            "Set --max-age-days or STRINGS_RETENTION_DAYS to a positive value"
+        )
+
+    if dry_run:
+        click.echo(
+            f"{service.count_expired()} strings older than {service.cutoff()} "
+            "would be purged"
+        )
+        return
+
+    purged = service.purge(max_batches=max_batches)
+    click.echo(f"Done, {purged} strings purged")
+
+
+@strings_cli.command("rebalance")
+@click.option("--batch-size", type=int, default=None)
+@click.option("--pause-ms", type=float, default=None)
+def rebalance(batch_size, pause_ms):
+    """Move strings onto their shard after the shard list changed."""
+    from src.core.services.string_rebalance_service import StringRebalanceService
+    from src.core.sharding import get_shards
+
+    if get_shards() is None:
+        raise click.UsageError("Strings are not sharded; set MYSQL_SHARD_HOSTS")
+
+    def progress(shard, moved):
+        click.echo(f"Moved {moved} rows off {shard}")
+
+    moved = StringRebalanceService(batch_size, pause_ms).run(progress)
+    click.echo(f"Done, {moved} rows moved")
+
+
+@auth_cli.command("calibrate-hashing")
+@click.option(
+    "--algorithm",
+    type=click.Choice(["bcrypt", "scrypt", "argon2id"]),
+    default=None,
+    help="Defaults to PASSWORD_HASH_ALGORITHM.",
+)
+@click.option("--target-ms", type=float, default=250, show_default=True)
+@click.option("--samples", type=int, default=3, show_default=True)
+def calibrate_hashing(algorithm, target_ms, samples):
+    """Find the costliest hashing parameters that fit in --target-ms.
+
+    Times hashes on this machine with increasing cost and prints the
+    environment settings for the last one whose median stayed within the
+    target. Run it on the hardware the API runs on.
+    """
+    import statistics
+    import time
+
+    from src.core.password_hashers import get_hasher
+
+    hasher_class = type(get_hasher(algorithm))
+    chosen = None
+    for hasher in hasher_class.cost_ladder():
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            hasher.hash("calibration password")
+            timings.append((time.perf_counter() - start) * 1000)
+        median = statistics.median(timings)
+
+        settings = ", ".join(f"{k}={v}" for k, v in hasher.settings().items())
+        click.echo(f"{settings}: {median:.1f} ms")
+        if median > target_ms:
+            break
+        chosen = hasher
+
+    if chosen is None:
+        raise click.ClickException(
+            f"Even the cheapest {hasher_class.name} parameters take over "
+            f"{target_ms:g} ms here"
+        )
+
+    click.echo("")
+    click.echo(f"PASSWORD_HASH_ALGORITHM={hasher_class.name}")
+    for name, value in chosen.settings().items():
+        click.echo(f"{name}={value}")
+
+
+@auth_cli.command("generate-signing-key")
+@click.argument("kid")
+@click.option(
+    "--algorithm",
+    type=click.Choice(["RS256", "EdDSA"]),
+    default="EdDSA",
+    show_default=True,
+)
+@click.option(
+    "--keys-dir",
+    default=None,
+    help="Defaults to JWT_KEYS_DIR.",
+)
+def generate_signing_key(kid, algorithm, keys_dir):
+    """Write a new private key for signing access tokens to KID.pem.
+
+    The new key verifies tokens, and is published in the JWKS, as soon as
+    the app restarts with it; it only signs once JWT_SIGNING_KEY_ID names
+    it. Remove the old key once the tokens it signed have expired.
+    """
+    import os
+
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+    from src.core.services.jwt_keys import JWT_KEYS_DIR
+
+    keys_dir = keys_dir or JWT_KEYS_DIR
+    if not keys_dir:
+        raise click.UsageError("Set --keys-dir or JWT_KEYS_DIR")
+    path = os.path.join(keys_dir, f"{kid}.pem")
+    if os.path.exists(path):
+        raise click.ClickException(f"{path} already exists")
+
+    if algorithm == "RS256":
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    else:
+        key = ed25519.Ed25519PrivateKey.generate()
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+    os.makedirs(keys_dir, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(pem)
+    click.echo(f"Wrote {algorithm} key {kid} to {path}")
+
+
+@auth_cli.command("purge-revoked-tokens")
+@click.option("--batch-size", default=1000, show_default=True)
+def purge_revoked_tokens(batch_size):
+    """Delete revocations of tokens that have expired anyway."""
+    from src.core.services.token_revocation_service import token_revocation_service
+
+    purged = token_revocation_service.purge_expired(batch_size)
+    click.echo(f"Done, {purged} expired revocations purged")
+
+
+def register_commands(app):
+    """Register CLI command groups on the app"""
+    app.cli.add_command(strings_cli)
+    app.cli.add_command(auth_cli)
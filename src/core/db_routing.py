@@ -0,0 +1,253 @@
+import itertools
+import logging
+import os
+import threading
+import time
+from contextlib import ContextDecorator
+from typing import Dict, List, Optional
+
+from flask import current_app, g, has_app_context, has_request_context, request
+from flask_sqlalchemy import SignallingSession, SQLAlchemy
+from itsdangerous import BadSignature, Signer
+from sqlalchemy import event, orm, text
+from sqlalchemy.sql.dml import UpdateBase
+
+from src.core.metrics import DB_REPLICA_EJECTIONS, DB_SESSIONS_ROUTED
+from src.core.sharding import SHARD_BIND_PREFIX, SHARDED_TABLES, ShardSet, current_shard
+
+# Seconds a replica that failed a query or health check is skipped
+DB_REPLICA_EJECT_SECONDS = float(os.getenv("DB_REPLICA_EJECT_SECONDS", "30"))
+# After a successful write, the client's reads go to the primary for this
+# many seconds so it sees its own writes despite replication lag; 0 disables
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+READ_YOUR_WRITES_COOKIE = "db_primary_until"
+
+REPLICA_BIND_PREFIX = "replica_"
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaSet:
+    """Round-robin choice among replica binds, skipping ejected ones"""
+
+    def __init__(self, bind_keys: List[str], eject_seconds=None):
+        self.bind_keys = list(bind_keys)
+        self.eject_seconds = (
+            DB_REPLICA_EJECT_SECONDS if eject_seconds is None else eject_seconds
+        )
+        self._ejected_until: Dict[str, float] = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        return bool(self.bind_keys)
+
+    def choose(self) -> Optional[str]:
+        """Next healthy replica, or None if every replica is ejected"""
+        now = time.monotonic()
+        with self._lock:
+            start = next(self._counter)
+            for offset in range(len(self.bind_keys)):
+                key = self.bind_keys[(start + offset) % len(self.bind_keys)]
+                if self._ejected_until.get(key, 0) <= now:
+                    return key
+        return None
+
+    def eject(self, key: str):
+        with self._lock:
+            self._ejected_until[key] = time.monotonic() + self.eject_seconds
+        DB_REPLICA_EJECTIONS.labels(replica=key).inc()
+        logger.warning(f"Ejected database replica {key}")
+
+    def restore(self, key: str):
+        with self._lock:
+            self._ejected_until.pop(key, None)
+
+    def is_healthy(self, key: str) -> bool:
+        with self._lock:
+            return self._ejected_until.get(key, 0) <= time.monotonic()
+
+
+class read_only(ContextDecorator):
+    """Route the current app context's reads to a replica.
+
+    Usable as a view decorator (``@read_only()``) or a ``with`` block.
+    Statements that write, and reads made while flushing, still go to the
+    primary.
+    """
+
+    def __enter__(self):
+        self._previous = g.get("db_read_only", False)
+        g.db_read_only = True
+        return self
+
+    def __exit__(self, *exc):
+        g.db_read_only = self._previous
+        return False
+
+
+def _cookie_signer() -> Signer:
+    return Signer(current_app.secret_key, salt=READ_YOUR_WRITES_COOKIE)
+
+
+def _primary_until() -> float:
+    """Until when the read-your-writes cookie sends reads to the primary.
+
+    The cookie is signed, so a client can't make one up, and its time is
+    clamped to one window from now in case it was signed under a longer one.
+    """
+    cookie = request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    if not cookie:
+        return 0
+    try:
+        primary_until = float(_cookie_signer().unsign(cookie))
+    except (BadSignature, ValueError):
+        return 0
+    return min(primary_until, time.time() + READ_YOUR_WRITES_SECONDS)
+
+
+def _wants_replica() -> bool:
+    if not has_app_context() or not g.get("db_read_only", False):
+        return False
+
+    if has_request_context() and _primary_until() > time.time():
+        return False
+
+    return True
+
+
+class RoutingSession(SignallingSession):
+    """Session that routes statements to shards and read replicas.
+
+    Statements on sharded tables go to the shard selected with
+    ``on_shard``. Otherwise reads inside ``read_only`` blocks go to a
+    replica.
+
+    The replica is chosen once per session, so every query of a request
+    sees the same snapshot, and forgotten when the session is closed.
+    """
+
+    def __init__(self, db, **options):
+        super().__init__(db, **options)
+        self._db = db
+        self._replica_key: Optional[str] = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        shard = current_shard()
+        if shard is not None and (
+            mapper is None or mapper.persist_selectable.name in SHARDED_TABLES
+        ):
+            return self._db.get_engine(self.app, bind=shard)
+
+        replicas = self.app.extensions.get("db_replicas")
+        if (
+            replicas
+            and not self._flushing
+            and not isinstance(clause, UpdateBase)
+            and _wants_replica()
+        ):
+            if self._replica_key is None or not replicas.is_healthy(self._replica_key):
+                self._replica_key = replicas.choose()
+                DB_SESSIONS_ROUTED.labels(
+                    target="replica" if self._replica_key else "primary"
+                ).inc()
+            if self._replica_key is not None:
+                return self._db.get_engine(self.app, bind=self._replica_key)
+
+        return super().get_bind(mapper, clause)
+
+    def close(self):
+        super().close()
+        self._replica_key = None
+
+
+class RoutingSQLAlchemy(SQLAlchemy):
+    """Flask-SQLAlchemy with read replicas and string shards.
+
+    Shard URIs from ``SQLALCHEMY_SHARD_URIS`` are registered as binds named
+    ``shard_0``, ``shard_1``, ...; see ``src.core.sharding``. With
+    ``SQLALCHEMY_SHARD_TWO_PHASE`` writes that span shards commit with
+    two-phase commit; see ``StringWriteService.save_many``.
+
+    Replica URIs from ``SQLALCHEMY_REPLICA_URIS`` are registered as binds
+    named ``replica_0``, ``replica_1``, ... A replica whose connection
+    fails is ejected for ``DB_REPLICA_EJECT_SECONDS``; while every replica
+    is ejected reads fall back to the primary.
+    """
+
+    def create_session(self, options):
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
+
+    def init_app(self, app):
+        binds = dict(app.config.get("SQLALCHEMY_BINDS") or {})
+        keys = self._add_binds(
+            binds, app, "SQLALCHEMY_REPLICA_URIS", REPLICA_BIND_PREFIX
+        )
+        shard_keys = self._add_binds(
+            binds, app, "SQLALCHEMY_SHARD_URIS", SHARD_BIND_PREFIX
+        )
+        if binds:
+            app.config["SQLALCHEMY_BINDS"] = binds
+
+        super().init_app(app)
+
+        app.extensions["string_shards"] = ShardSet(shard_keys)
+        replicas = ReplicaSet(keys)
+        app.extensions["db_replicas"] = replicas
+        if not replicas:
+            return
+
+        with app.app_context():
+            for key in keys:
+                self._watch_replica(self.get_engine(app, bind=key), key, replicas)
+
+        @app.after_request
+        def remember_write(response):
+            if (
+                READ_YOUR_WRITES_SECONDS > 0
+                and request.method in ("POST", "PUT", "PATCH", "DELETE")
+                and response.status_code < 400
+            ):
+                primary_until = f"{time.time() + READ_YOUR_WRITES_SECONDS:.3f}"
+                response.set_cookie(
+                    READ_YOUR_WRITES_COOKIE,
+                    _cookie_signer().sign(primary_until).decode(),
+                    max_age=int(READ_YOUR_WRITES_SECONDS) + 1,
+                    httponly=True,
+                    samesite="Lax",
+                )
+            return response
+
+    def _add_binds(self, binds, app, config_key, prefix) -> List[str]:
+        keys = []
+        for index, uri in enumerate(app.config.get(config_key) or []):
+            key = f"{prefix}{index}"
+            binds[key] = uri
+            keys.append(key)
+        return keys
+
+    def _watch_replica(self, engine, key, replicas):
+        @event.listens_for(engine, "handle_error")
+        def eject_on_connection_error(context):
+            if context.is_disconnect or context.connection is None:
+                replicas.eject(key)
+
+    def check_replicas(self, app=None) -> Dict[str, str]:
+        """Ping every replica, ejecting or restoring it, and report status"""
+        app = self.get_app(app)
+        replicas = app.extensions.get("db_replicas")
+        status = {}
+
+        for key in replicas.bind_keys if replicas else []:
+            try:
+                with self.get_engine(app, bind=key).connect() as connection:
+                    connection.execute(text("SELECT 1"))
+            except Exception as e:
+                logger.error(f"Replica {key} health check failed: {e}")
+                replicas.eject(key)
+                status[key] = "unhealthy"
+            else:
+                replicas.restore(key)
+                status[key] = "healthy"
+
+        return status
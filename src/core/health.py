@@ -1,10 +1,13 @@
 import logging
 import time
+from http import HTTPStatus
 
-from flask import Blueprint, current_app, jsonify
+from flask import Blueprint, current_app
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 
+from src.utils import create_success_response
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,7 +22,7 @@ class HealthCheck:
         @health_bp.route("/health")
         def health():
             """Basic health check for load balancers"""
-            return jsonify({"status": "healthy"})
+            return create_success_response({"status": "healthy"})
 
         @health_bp.route("/health/detailed")
         def detailed_health():
@@ -42,6 +45,12 @@ class HealthCheck:
                     db.session.execute(text("SELECT 1")).fetchone()
                     health_data["components"]["database"] = {"status": "healthy"}
 
+                    replicas = db.check_replicas(app)
+                    if replicas:
+                        health_data["components"]["replicas"] = replicas
+                        if "healthy" not in replicas.values():
+                            health_data["status"] = "degraded"
+
             except SQLAlchemyError as e:
                 logger.error(f"Database health check failed: {str(e)}")
                 health_data["status"] = "degraded"
@@ -53,7 +62,7 @@ class HealthCheck:
                 logger.error(f"Health check error: {str(e)}")
                 health_data["status"] = "degraded"
 
-            return jsonify(health_data)
+            return create_success_response(health_data)
 
         @health_bp.route("/ready")
         def readiness():
@@ -64,9 +73,12 @@ class HealthCheck:
                     from src.factory import db
 
                     db.session.execute(text("SELECT 1")).fetchone()
-                return jsonify({"status": "ready"})
+                return create_success_response({"status": "ready"})
             except Exception as e:
                 logger.error(f"Readiness check failed: {str(e)}")
-                return jsonify({"status": "not ready", "error": str(e)}), 503
+                return create_success_response(
+                    {"status": "not ready", "error": str(e)},
+                    HTTPStatus.SERVICE_UNAVAILABLE,
+                )
 
         app.register_blueprint(health_bp)
@@ -1,7 +1,7 @@
 from time import time
 
 from flask import Blueprint, Response, request
-from prometheus_client import Counter, Histogram, generate_latest
+from prometheus_client import Counter, Gauge, Histogram, generate_latest
 
 REQUEST_COUNT = Counter(
     "flask_http_requests_total", "Total HTTP Requests", ["method", "endpoint", "status"]
@@ -19,6 +19,135 @@ STRINGS_RETRIEVED = Counter(
     "flask_strings_retrieved_total", "Number of strings retrieved"
 )
 
+STRINGS_EXPORTED = Counter(
+    "flask_strings_exported_total",
+    "Number of strings streamed by exports",
+    ["format"],
+)
+
+STRINGS_PURGED = Counter(
+    "flask_strings_purged_total", "Number of strings deleted by retention"
+)
+
+RETENTION_BATCH_DURATION = Histogram(
+    "flask_retention_batch_duration_seconds",
+    "Time taken to select and delete one retention batch",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+RANDOM_POOL_REQUESTS = Counter(
+    "flask_random_pool_requests_total",
+    "Random string requests served by the prefetch pool",
+    ["result"],
+)
+
+RANDOM_POOL_REFILL_LATENCY = Histogram(
+    "flask_random_pool_refill_duration_seconds",
+    "Time taken to refill the random string prefetch pool",
+)
+
+RANDOM_POOL_EVICTIONS = Counter(
+    "flask_random_pool_evictions_total",
+    "Prefetched random strings discarded before being served",
+)
+
+RANDOM_POOL_SIZE = Gauge(
+    "flask_random_pool_size",
+    "Prefetched random strings currently held by this worker",
+)
+
+SAVE_BATCH_SIZE = Histogram(
+    "flask_save_batch_size",
+    "Strings committed per coalesced save transaction",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+
+SAVE_QUEUE_WAIT = Histogram(
+    "flask_save_queue_wait_seconds",
+    "Time a save request waited for its coalesced batch to be flushed",
+    buckets=(0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+
+DB_SESSIONS_ROUTED = Counter(
+    "flask_db_sessions_routed_total",
+    "Read-only sessions by the database they were routed to",
+    ["target"],
+)
+
+DB_REPLICA_EJECTIONS = Counter(
+    "flask_db_replica_ejections_total",
+    "Times a read replica was taken out of rotation",
+    ["replica"],
+)
+
+PASSWORD_HASH_DURATION = Histogram(
+    "flask_password_hash_duration_seconds",
+    "Time to hash or verify a password in the hashing pool, queueing included",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8),
+)
+
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "flask_password_hash_queue_depth",
+    "Password hashes running or waiting in this worker's hashing pool",
+)
+
+PASSWORD_HASH_REJECTIONS = Counter(
+    "flask_password_hash_rejections_total",
+    "Password hashes refused because the hashing pool was full",
+    ["operation"],
+)
+
+TOKEN_CACHE_REQUESTS = Counter(
+    "flask_token_cache_requests_total",
+    "Access token lookups in the verified token cache",
+    ["result"],  # hit, miss
+)
+
+TOKEN_CACHE_SIZE = Gauge(
+    "flask_token_cache_size",
+    "Verified access tokens cached in this worker",
+)
+
+TOKEN_REVOCATION_CHECKS = Counter(
+    "flask_token_revocation_checks_total",
+    "Token revocation checks by outcome",
+    ["result"],  # clear (filter only), revoked, false_positive
+)
+
+TOKEN_REVOCATION_FILTER_SIZE = Gauge(
+    "flask_token_revocation_filter_size",
+    "Revoked token ids in this worker's Bloom filter",
+)
+
+USER_CACHE_REQUESTS = Counter(
+    "flask_user_cache_requests_total",
+    "User lookups in the user cache",
+    ["result"],  # hit, miss
+)
+
+USER_CACHE_SIZE = Gauge(
+    "flask_user_cache_size",
+    "Users cached in this worker",
+)
+
+RATE_LIMIT_COUNTER_UPDATES = Counter(
+    "flask_rate_limit_counter_updates_total",
+    "Rate limit counter reads and increments by where they were answered",
+    ["result"],  # local (within the lease), synced, error
+)
+
+RATE_LIMIT_WINDOWS = Gauge(
+    "flask_rate_limit_windows",
+    "Rate limit keys tracked in this worker",
+)
+
+RATE_LIMIT_EVICTIONS = Counter(
+    "flask_rate_limit_evictions_total",
+    "Rate limit keys dropped by the bounded memory storage",
+    ["reason"],  # idle, capacity
+)
+
 AUTH_SUCCESS = Counter(
     "flask_auth_success_total",
     "Authentication success count",
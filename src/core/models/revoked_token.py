@@ -0,0 +1,23 @@
+from src.factory import db
+
+
+class RevokedToken(db.Model):
+    """A token revoked before its expiry, identified by its ``jti`` claim.
+
+    Rows are only needed until the token expires; ``flask auth
+    purge-revoked-tokens`` deletes them after that.
+    """
+
+    __tablename__ = "revoked_tokens"
+
+    id = db.Column(
+        db.BigInteger().with_variant(db.Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
+    jti = db.Column(db.String(32), unique=True, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    # Indexed so workers can fetch the revocations since their last look
+    revoked_at = db.Column(
+        db.TIMESTAMP, server_default=db.func.current_timestamp(), index=True
+    )
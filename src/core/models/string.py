@@ -1,9 +1,83 @@
+import hashlib
+
+from sqlalchemy import DDL, event
+
 from src.factory import db
 
 
+def content_hash(value: str) -> bytes:
+    """SHA-256 digest of a string's UTF-8 encoding"""
+    return hashlib.sha256(value.encode("utf-8")).digest()
+
+
+def _value_hash_default(context):
+    return content_hash(context.get_current_parameters()["value"])
+
+
 class String(db.Model):
     __tablename__ = "strings"
 
-    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    # 64-bit for Snowflake ids; SQLite only auto-increments an INTEGER key,
+    # which is 64-bit there anyway
+    id = db.Column(
+        db.BigInteger().with_variant(db.Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
     value = db.Column(db.Text, nullable=False)
-    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
+    # Fixed-width digest of value so lookups by content can use an index.
+    # Not unique: rows saved before deduplication may repeat a value.
+    value_hash = db.Column(db.BINARY(32), default=_value_hash_default, index=True)
+    # Indexed for the retention purge
+    created_at = db.Column(
+        db.TIMESTAMP, server_default=db.func.current_timestamp(), index=True
+    )
+
+
+class StringIdSequence(db.Model):
+    """Next unallocated string id when strings are sharded.
+
+    Lives on the primary database; shards insert rows with ids handed out
+    from it so ids stay unique across shards.
+    """
+
+    __tablename__ = "string_id_sequences"
+
+    name = db.Column(db.String(32), primary_key=True)
+    next_id = db.Column(db.BigInteger, nullable=False)
+
+
+# Full-text index over strings.value. InnoDB keeps a FULLTEXT index in sync
+# by itself; on SQLite an external-content FTS5 table is maintained by
+# triggers. The same DDL is applied to existing databases by migration
+# 9b1e5f3c7a20.
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE strings_fts USING fts5("
+    "value, content='strings', content_rowid='id')",
+    "CREATE TRIGGER strings_fts_insert AFTER INSERT ON strings BEGIN "
+    "INSERT INTO strings_fts(rowid, value) VALUES (new.id, new.value); END",
+    "CREATE TRIGGER strings_fts_delete AFTER DELETE ON strings BEGIN "
+    "INSERT INTO strings_fts(strings_fts, rowid, value) "
+    "VALUES ('delete', old.id, old.value); END",
+    "CREATE TRIGGER strings_fts_update AFTER UPDATE OF value ON strings BEGIN "
+    "INSERT INTO strings_fts(strings_fts, rowid, value) "
+    "VALUES ('delete', old.id, old.value); "
+    "INSERT INTO strings_fts(rowid, value) VALUES (new.id, new.value); END",
+]
+
+MYSQL_FULLTEXT_DDL = "ALTER TABLE strings ADD FULLTEXT INDEX ft_strings_value (value)"
+
+for statement in SQLITE_FTS_DDL:
+    event.listen(
+        String.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    String.__table__,
+    "after_create",
+    DDL(MYSQL_FULLTEXT_DDL).execute_if(dialect="mysql"),
+)
+event.listen(
+    String.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS strings_fts").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,274 @@
+"""Password hashing algorithms.
+
+Every stored hash names its algorithm and parameters, so hashes made under
+an older policy keep verifying after ``PASSWORD_HASH_ALGORITHM`` or a cost
+setting changes, and ``needs_rehash`` tells which ones to upgrade.
+
+The expensive key derivation is handed to a ``run(func, *args, **kwargs)``
+callable, which calls it inline by default. ``PasswordHashingPool`` passes
+one that runs it in its process pool, so every ``func`` handed to ``run``
+is a plain library function that pickles without importing the app.
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import re
+from typing import Any, Callable, Dict, Iterator, Type
+
+import bcrypt as _bcrypt
+
+PASSWORD_HASH_ALGORITHM = os.getenv("PASSWORD_HASH_ALGORITHM", "bcrypt")
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# scrypt cost is N = 2 ** SCRYPT_LN, using 128 * N * r bytes of memory
+SCRYPT_LN = int(os.getenv("SCRYPT_LN", "15"))
+SCRYPT_R = int(os.getenv("SCRYPT_R", "8"))
+SCRYPT_P = int(os.getenv("SCRYPT_P", "1"))
+# RFC 9106's second recommended option; memory is in KiB
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "65536"))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+Runner = Callable[..., Any]
+
+
+def _inline(func, *args, **kwargs):
+    return func(*args, **kwargs)
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+class PasswordHasher:
+    """One algorithm with the parameters new hashes are made with"""
+
+    name = ""
+    # Stored hashes made by this algorithm start with one of these
+    prefixes = ()
+
+    def hash(self, password: str, run: Runner = _inline) -> str:
+        raise NotImplementedError
+
+    def verify(self, encoded: str, password: str, run: Runner = _inline) -> bool:
+        raise NotImplementedError
+
+    def needs_rehash(self, encoded: str) -> bool:
+        """Whether ``encoded`` was made with other parameters than these"""
+        raise NotImplementedError
+
+    def settings(self) -> Dict[str, str]:
+        """Environment variables that select this policy"""
+        raise NotImplementedError
+
+    @classmethod
+    def cost_ladder(cls) -> Iterator["PasswordHasher"]:
+        """Hashers of increasing cost, for calibration"""
+        raise NotImplementedError
+
+    def identifies(self, encoded: str) -> bool:
+        return encoded.startswith(self.prefixes)
+
+
+class BcryptHasher(PasswordHasher):
+    name = "bcrypt"
+    prefixes = ("$2a$", "$2b$", "$2y$")
+
+    def __init__(self, rounds: int = None):
+        self.rounds = BCRYPT_ROUNDS if rounds is None else rounds
+
+    def hash(self, password, run=_inline):
+        salt = _bcrypt.gensalt(self.rounds)
+        return run(_bcrypt.hashpw, password.encode("utf-8"), salt).decode("utf-8")
+
+    def verify(self, encoded, password, run=_inline):
+        return run(_bcrypt.checkpw, password.encode("utf-8"), encoded.encode("utf-8"))
+
+    def needs_rehash(self, encoded):
+        return not self.identifies(encoded) or int(encoded[4:6]) != self.rounds
+
+    def settings(self):
+        return {"BCRYPT_ROUNDS": str(self.rounds)}
+
+    @classmethod
+    def cost_ladder(cls):
+        for rounds in range(4, 32):
+            yield cls(rounds)
+
+
+class ScryptHasher(PasswordHasher):
+    """scrypt from ``hashlib``, stored as ``$scrypt$ln=15,r=8,p=1$salt$key``"""
+
+    name = "scrypt"
+    prefixes = ("$scrypt$",)
+    _params = re.compile(r"ln=(\d+),r=(\d+),p=(\d+)$")
+
+    def __init__(self, ln: int = None, r: int = None, p: int = None):
+        self.ln = SCRYPT_LN if ln is None else ln
+        self.r = SCRYPT_R if r is None else r
+        self.p = SCRYPT_P if p is None else p
+
+    def hash(self, password, run=_inline):
+        salt = os.urandom(SALT_BYTES)
+        key = self._derive(password, salt, self.ln, self.r, self.p, run)
+        return (
+            f"$scrypt$ln={self.ln},r={self.r},p={self.p}"
+            f"${_b64encode(salt)}${_b64encode(key)}"
+        )
+
+    def verify(self, encoded, password, run=_inline):
+        ln, r, p, salt, key = self._parse(encoded)
+        return hmac.compare_digest(self._derive(password, salt, ln, r, p, run), key)
+
+    def needs_rehash(self, encoded):
+        if not self.identifies(encoded):
+            return True
+        ln, r, p, _, _ = self._parse(encoded)
+        return (ln, r, p) != (self.ln, self.r, self.p)
+
+    def settings(self):
+        return {
+            "SCRYPT_LN": str(self.ln),
+            "SCRYPT_R": str(self.r),
+            "SCRYPT_P": str(self.p),
+        }
+
+    @classmethod
+    def cost_ladder(cls):
+        for ln in range(10, 25):
+            yield cls(ln=ln)
+
+    @staticmethod
+    def _derive(password, salt, ln, r, p, run):
+        n = 1 << ln
+        return run(
+            hashlib.scrypt,
+            password.encode("utf-8"),
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            # hashlib refuses anything over 32 MiB unless told otherwise
+            maxmem=2 * 128 * n * r * p + 1024 * 1024,
+            dklen=KEY_BYTES,
+        )
+
+    def _parse(self, encoded):
+        _, _, params, salt, key = encoded.split("$")
+        ln, r, p = map(int, self._params.match(params).groups())
+        return ln, r, p, _b64decode(salt), _b64decode(key)
+
+
+class Argon2idHasher(PasswordHasher):
+    """Argon2id, in the PHC string format ``argon2-cffi`` also reads"""
+
+    name = "argon2id"
+    prefixes = ("$argon2id$",)
+    _params = re.compile(r"m=(\d+),t=(\d+),p=(\d+)$")
+
+    def __init__(
+        self, time_cost: int = None, memory_cost: int = None, parallelism: int = None
+    ):
+        self.time_cost = ARGON2_TIME_COST if time_cost is None else time_cost
+        self.memory_cost = ARGON2_MEMORY_COST if memory_cost is None else memory_cost
+        self.parallelism = ARGON2_PARALLELISM if parallelism is None else parallelism
+
+    def hash(self, password, run=_inline):
+        salt = os.urandom(SALT_BYTES)
+        key = self._derive(
+            password, salt, self.time_cost, self.memory_cost, self.parallelism, run
+        )
+        return (
+            f"$argon2id$v=19$m={self.memory_cost},t={self.time_cost},"
+            f"p={self.parallelism}${_b64encode(salt)}${_b64encode(key)}"
+        )
+
+    def verify(self, encoded, password, run=_inline):
+        time_cost, memory_cost, parallelism, salt, key = self._parse(encoded)
+        derived = self._derive(
+            password, salt, time_cost, memory_cost, parallelism, run, len(key)
+        )
+        return hmac.compare_digest(derived, key)
+
+    def needs_rehash(self, encoded):
+        if not self.identifies(encoded):
+            return True
+        time_cost, memory_cost, parallelism, _, _ = self._parse(encoded)
+        return (time_cost, memory_cost, parallelism) != (
+            self.time_cost,
+            self.memory_cost,
+            self.parallelism,
+        )
+
+    def settings(self):
+        return {
+            "ARGON2_TIME_COST": str(self.time_cost),
+            "ARGON2_MEMORY_COST": str(self.memory_cost),
+            "ARGON2_PARALLELISM": str(self.parallelism),
+        }
+
+    @classmethod
+    def cost_ladder(cls):
+        # Memory is the expensive part for an attacker, so it stays at the
+        # configured size and only the number of passes goes up
+        for time_cost in range(1, 64):
+            yield cls(time_cost=time_cost)
+
+    @staticmethod
+    def _derive(
+        password, salt, time_cost, memory_cost, parallelism, run, length=KEY_BYTES
+    ):
+        # Imported here so deployments on bcrypt don't need argon2-cffi
+        from argon2.low_level import Type, hash_secret_raw
+
+        return run(
+            hash_secret_raw,
+            password.encode("utf-8"),
+            salt,
+            time_cost=time_cost,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+            hash_len=length,
+            type=Type.ID,
+        )
+
+    def _parse(self, encoded):
+        _, _, version, params, salt, key = encoded.split("$")
+        if version != "v=19":
+            raise ValueError(f"Unsupported argon2 version {version}")
+        memory_cost, time_cost, parallelism = map(
+            int, self._params.match(params).groups()
+        )
+        return time_cost, memory_cost, parallelism, _b64decode(salt), _b64decode(key)
+
+
+HASHERS: Dict[str, Type[PasswordHasher]] = {
+    hasher.name: hasher for hasher in (BcryptHasher, ScryptHasher, Argon2idHasher)
+}
+
+
+def get_hasher(name: str = None) -> PasswordHasher:
+    """Hasher for ``name`` with the configured parameters"""
+    name = name or PASSWORD_HASH_ALGORITHM
+    if name not in HASHERS:
+        raise ValueError(
+            f"Unknown password hash algorithm {name!r}, "
+            f"expected one of {', '.join(HASHERS)}"
+        )
+    return HASHERS[name]()
+
+
+def identify(encoded: str) -> PasswordHasher:
+    """Hasher that can verify the stored hash ``encoded``"""
+    for hasher in HASHERS.values():
+        if encoded.startswith(hasher.prefixes):
+            return hasher()
+    raise ValueError("Unrecognised password hash format")
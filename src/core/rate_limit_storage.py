@@ -0,0 +1,508 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from math import floor
+from typing import Callable, Dict, Optional, Tuple
+
+from limits.storage import SlidingWindowCounterSupport, Storage
+
+from src.core.metrics import (
+    RATE_LIMIT_COUNTER_UPDATES,
+    RATE_LIMIT_EVICTIONS,
+    RATE_LIMIT_WINDOWS,
+)
+
+# Share of each limit a worker may admit on its own before it syncs; at most
+# (workers x fraction x limit) requests past a limit get through
+RATELIMIT_LEASE_FRACTION = float(os.getenv("RATELIMIT_LEASE_FRACTION", "0.005"))
+# Longest a worker answers from its own view of a counter
+RATELIMIT_SYNC_INTERVAL = float(os.getenv("RATELIMIT_SYNC_INTERVAL", "1"))
+
+# Most keys (client x limit) a bounded-memory:// worker tracks at once
+RATELIMIT_MAX_KEYS = int(os.getenv("RATELIMIT_MAX_KEYS", "200000"))
+
+# INCRBY that starts the window on the first hit, returning the new count and
+# the milliseconds left in the window in one round trip
+INCR_SCRIPT = """
+local count = redis.call('INCRBY', KEYS[1], ARGV[1])
+local ttl = redis.call('PTTL', KEYS[1])
+if ttl < 0 then
+    redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    ttl = tonumber(ARGV[2])
+end
+return {count, ttl}
+"""
+
+
+class RedisCounterBackend:
+    """Window counters in Redis or anything speaking its protocol"""
+
+    def __init__(self, url: str):
+        import redis
+
+        self.exceptions = redis.RedisError
+        self.client = redis.Redis.from_url(url)
+        self._incr = self.client.register_script(INCR_SCRIPT)
+
+    def incr(self, key: str, amount: int, expiry: float) -> Tuple[int, float]:
+        count, ttl = self._incr(keys=[key], args=[amount, int(expiry * 1000)])
+        return int(count), ttl / 1000
+
+    def get(self, key: str) -> Tuple[int, float]:
+        pipeline = self.client.pipeline(transaction=False)
+        pipeline.get(key)
+        pipeline.pttl(key)
+        count, ttl = pipeline.execute()
+        return int(count or 0), max(ttl, 0) / 1000
+
+    def delete(self, key: str):
+        self.client.delete(key)
+
+    def clear(self, prefix: str) -> int:
+        keys = list(self.client.scan_iter(match=f"{prefix}*", count=1000))
+        if keys:
+            self.client.delete(*keys)
+        return len(keys)
+
+    def ping(self) -> bool:
+        return bool(self.client.ping())
+
+
+class InProcessCounterBackend:
+    """The Redis backend's behavior in a dict, for tests and single workers"""
+
+    exceptions = (ConnectionError, TimeoutError)
+
+    def __init__(self, clock: Optional[Callable[[], float]] = None):
+        self.clock = clock or time.time
+        self._counters: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def incr(self, key: str, amount: int, expiry: float) -> Tuple[int, float]:
+        now = self.clock()
+        with self._lock:
+            count, expires_at = self._counters.get(key, (0, 0.0))
+            if expires_at <= now:
+                count, expires_at = 0, now + expiry
+            self._counters[key] = (count + amount, expires_at)
+            return count + amount, expires_at - now
+
+    def get(self, key: str) -> Tuple[int, float]:
+        now = self.clock()
+        with self._lock:
+            count, expires_at = self._counters.get(key, (0, 0.0))
+        if expires_at <= now:
+            return 0, 0.0
+        return count, expires_at - now
+
+    def delete(self, key: str):
+        with self._lock:
+            self._counters.pop(key, None)
+
+    def clear(self, prefix: str) -> int:
+        with self._lock:
+            keys = [key for key in self._counters if key.startswith(prefix)]
+            for key in keys:
+                del self._counters[key]
+        return len(keys)
+
+    def ping(self) -> bool:
+        return True
+
+
+class _Window:
+    __slots__ = ("count", "pending", "limit", "expiry", "synced_at", "expires_at")
+
+    def __init__(self, limit: Optional[int]):
+        # Shared count as of the last sync, including this worker's hits
+        self.count = 0
+        # This worker's hits the shared count doesn't have yet
+        self.pending = 0
+        self.limit = limit
+        self.expiry: Optional[float] = None
+        self.synced_at = 0.0
+        self.expires_at = 0.0
+
+
+def limit_amount(key: str) -> Optional[int]:
+    """The limit a ``limits`` key is for; keys end in amount/multiples/unit"""
+    parts = key.rsplit("/", 3)
+    if len(parts) == 4 and parts[1].isdigit():
+        return int(parts[1])
+    return None
+
+
+class LeasedStorage(Storage):
+    """Fixed window counters shared by every worker through one backend.
+
+    Each worker counts hits locally and only syncs a counter once it has used
+    its lease (``lease_fraction`` of the limit), ``sync_interval`` seconds
+    have passed, or the counter gets within a lease of the limit. A client
+    that is already over its limit is turned away locally until the window
+    ends. ``leased+redis://host:6379/0`` keeps the counters in Redis;
+    ``leased+memory://`` keeps them in this process.
+    """
+
+    STORAGE_SCHEME = ["leased+redis", "leased+rediss", "leased+memory"]
+    PREFIX = "LIMITS:"
+
+    def __init__(
+        self,
+        uri: str = "leased+memory://",
+        wrap_exceptions: bool = False,
+        backend=None,
+        lease_fraction: Optional[float] = None,
+        sync_interval: Optional[float] = None,
+        clock: Optional[Callable[[], float]] = None,
+        **options,
+    ):
+        super().__init__(uri, wrap_exceptions, **options)
+        if backend is None:
+            if uri.startswith("leased+memory"):
+                backend = InProcessCounterBackend()
+            else:
+                backend = RedisCounterBackend(uri[len("leased+") :])
+        self.backend = backend
+        self.lease_fraction = (
+            RATELIMIT_LEASE_FRACTION if lease_fraction is None else lease_fraction
+        )
+        self.sync_interval = (
+            RATELIMIT_SYNC_INTERVAL if sync_interval is None else sync_interval
+        )
+        self.clock = clock or time.time
+
+        self._windows: Dict[str, _Window] = {}
+        self._swept_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def base_exceptions(self):
+        return self.backend.exceptions
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        now = self.clock()
+        with self._lock:
+            window = self._live_window(key, now)
+            if window is not None and self._within_lease(window, now, amount):
+                window.pending += amount
+                RATE_LIMIT_COUNTER_UPDATES.labels(result="local").inc()
+                return window.count + window.pending
+            carried = 0
+            if window is not None:
+                carried, window.pending = window.pending, 0
+        return self._sync(key, now, carried + amount, expiry, carried)
+
+    def get(self, key: str) -> int:
+        now = self.clock()
+        with self._lock:
+            window = self._live_window(key, now)
+            if window is not None and now - window.synced_at < self.sync_interval:
+                RATE_LIMIT_COUNTER_UPDATES.labels(result="local").inc()
+                return window.count + window.pending
+            carried, expiry = 0, None
+            if window is not None:
+                carried, expiry = window.pending, window.expiry
+                window.pending = 0
+        return self._sync(key, now, carried, expiry, carried)
+
+    def get_expiry(self, key: str) -> float:
+        now = self.clock()
+        with self._lock:
+            window = self._live_window(key, now)
+            if window is not None and window.count + window.pending > 0:
+                return window.expires_at
+        _, ttl = self.backend.get(self.PREFIX + key)
+        return now + ttl
+
+    def check(self) -> bool:
+        try:
+            return self.backend.ping()
+        except Exception:
+            return False
+
+    def reset(self) -> Optional[int]:
+        with self._lock:
+            self._windows.clear()
+            RATE_LIMIT_WINDOWS.set(0)
+        return self.backend.clear(self.PREFIX)
+
+    def clear(self, key: str):
+        with self._lock:
+            self._windows.pop(key, None)
+        self.backend.delete(self.PREFIX + key)
+
+    def _live_window(self, key: str, now: float) -> Optional[_Window]:
+        window = self._windows.get(key)
+        if window is not None and window.expires_at <= now:
+            # Hits still pending belong to a window that is over
+            del self._windows[key]
+            return None
+        return window
+
+    def _within_lease(self, window: _Window, now: float, amount: int) -> bool:
+        if window.expiry is None or now - window.synced_at >= self.sync_interval:
+            return False
+        if window.limit is None:
+            return False
+        if window.count > window.limit:
+            return True
+        if self.lease_fraction <= 0:
+            return False
+        # At least one hit, or limits under 1 / lease_fraction never lease
+        lease = max(1, int(window.limit * self.lease_fraction))
+        estimate = window.count + window.pending + amount
+        return window.pending + amount <= lease and estimate <= window.limit - lease
+
+    def _sync(
+        self,
+        key: str,
+        now: float,
+        delta: int,
+        expiry: Optional[float],
+        carried: int,
+    ) -> int:
+        """Send ``delta`` hits, ``carried`` of them admitted earlier"""
+        try:
+            if delta:
+                count, ttl = self.backend.incr(self.PREFIX + key, delta, expiry)
+            else:
+                count, ttl = self.backend.get(self.PREFIX + key)
+        except self.base_exceptions:
+            RATE_LIMIT_COUNTER_UPDATES.labels(result="error").inc()
+            with self._lock:
+                window = self._live_window(key, now)
+                if window is not None:
+                    window.pending += carried
+            raise
+        RATE_LIMIT_COUNTER_UPDATES.labels(result="synced").inc()
+
+        with self._lock:
+            window = self._live_window(key, now)
+            if window is None:
+                window = self._windows[key] = _Window(limit_amount(key))
+            window.count = count
+            window.synced_at = now
+            if expiry:
+                window.expiry = expiry
+            if ttl > 0:
+                window.expires_at = now + ttl
+            else:
+                # Nothing counted yet; look again after the sync interval
+                window.expires_at = now + self.sync_interval
+            self._sweep(now)
+            # Hits other threads counted during the round trip stay pending
+            return window.count + window.pending
+
+    def _sweep(self, now: float):
+        if now - self._swept_at < self.sync_interval:
+            return
+        self._swept_at = now
+        for key in [k for k, w in self._windows.items() if w.expires_at <= now]:
+            del self._windows[key]
+        RATE_LIMIT_WINDOWS.set(len(self._windows))
+
+
+class _Counter:
+    __slots__ = ("window", "previous", "current", "idle_at")
+
+    def __init__(self):
+        # Window number for sliding windows, end of the window for fixed ones
+        self.window = 0.0
+        self.previous = 0
+        self.current = 0
+        # When every count this key holds has run out
+        self.idle_at = 0.0
+
+
+class BoundedMemoryStorage(Storage, SlidingWindowCounterSupport):
+    """Per-worker counters for at most ``max_keys`` keys.
+
+    Each key is one small object holding the previous and current window
+    counts, so the sliding window counter strategy costs the same memory as
+    a fixed window. Keys are kept in least recently used order, one list per
+    window length, so the front of each list is always the key that runs
+    out first. Keys whose counts have run out are dropped from the front as
+    new keys arrive. When the storage is still full, the least recently used
+    key of the longest list is dropped even though it still counts; that
+    client starts again from zero.
+    """
+
+    STORAGE_SCHEME = ["bounded-memory"]
+    # Idle keys dropped per new key at most, so no request pays for a sweep
+    # of the whole storage
+    SWEEP_BATCH = 64
+
+    def __init__(
+        self,
+        uri: str = "bounded-memory://",
+        wrap_exceptions: bool = False,
+        max_keys: Optional[int] = None,
+        clock: Optional[Callable[[], float]] = None,
+        **options,
+    ):
+        super().__init__(uri, wrap_exceptions, **options)
+        self.max_keys = max(1, RATELIMIT_MAX_KEYS if max_keys is None else max_keys)
+        self.clock = clock or time.time
+
+        self._buckets: "Dict[float, OrderedDict[str, _Counter]]" = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_exceptions(self):
+        return ValueError
+
+    def acquire_sliding_window_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        if amount > limit:
+            return False
+        now = self.clock()
+        with self._lock:
+            counter = self._sliding_counter(key, expiry, now, create=True)
+            weighted = (
+                counter.previous * self._previous_ttl(expiry, now) / expiry
+                + counter.current
+            )
+            if floor(weighted) + amount > limit:
+                return False
+            counter.current += amount
+            return True
+
+    def get_sliding_window(
+        self, key: str, expiry: int
+    ) -> Tuple[int, float, int, float]:
+        now = self.clock()
+        previous = current = 0
+        with self._lock:
+            counter = self._sliding_counter(key, expiry, now, create=False)
+            if counter is not None:
+                previous, current = counter.previous, counter.current
+        previous_ttl = self._previous_ttl(expiry, now)
+        return (
+            previous,
+            previous_ttl if previous else 0.0,
+            current,
+            previous_ttl + expiry,
+        )
+
+    def clear_sliding_window(self, key: str, expiry: int):
+        self.clear(key)
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        now = self.clock()
+        with self._lock:
+            counters = self._buckets.get(expiry)
+            counter = None if counters is None else counters.get(key)
+            if counter is None:
+                counter = self._insert(key, expiry, now)
+            else:
+                counters.move_to_end(key)
+            if counter.window <= now:
+                counter.window = counter.idle_at = now + expiry
+                counter.current = 0
+            counter.current += amount
+            return counter.current
+
+    def get(self, key: str) -> int:
+        now = self.clock()
+        with self._lock:
+            counter = self._find(key)
+            if counter is None or counter.window <= now:
+                return 0
+            return counter.current
+
+    def get_expiry(self, key: str) -> float:
+        now = self.clock()
+        with self._lock:
+            counter = self._find(key)
+            return now if counter is None else max(counter.window, now)
+
+    def check(self) -> bool:
+        return True
+
+    def reset(self) -> Optional[int]:
+        with self._lock:
+            count = self._size
+            self._buckets.clear()
+            self._size = 0
+            RATE_LIMIT_WINDOWS.set(0)
+        return count
+
+    def clear(self, key: str):
+        with self._lock:
+            for counters in self._buckets.values():
+                if counters.pop(key, None) is not None:
+                    self._size -= 1
+            RATE_LIMIT_WINDOWS.set(self._size)
+
+    @property
+    def tracked_keys(self) -> int:
+        # Not __len__: an empty storage must not be falsy to Flask-Limiter
+        return self._size
+
+    @staticmethod
+    def _previous_ttl(expiry: int, now: float) -> float:
+        # The share of the previous window still inside the sliding window
+        return expiry - now % expiry
+
+    def _find(self, key: str) -> Optional[_Counter]:
+        # Only the fixed window reads come without a window length; there
+        # are as many lists as distinct window lengths, a handful
+        for counters in self._buckets.values():
+            counter = counters.get(key)
+            if counter is not None:
+                return counter
+        return None
+
+    def _sliding_counter(
+        self, key: str, expiry: int, now: float, create: bool
+    ) -> Optional[_Counter]:
+        window = now // expiry
+        counters = self._buckets.get(expiry)
+        counter = None if counters is None else counters.get(key)
+        if counter is None:
+            if not create:
+                return None
+            counter = self._insert(key, expiry, now)
+            counter.window = window
+        else:
+            counters.move_to_end(key)
+        if counter.window != window:
+            counter.previous = counter.current if counter.window == window - 1 else 0
+            counter.current = 0
+            counter.window = window
+        counter.idle_at = (window + 2) * expiry
+        return counter
+
+    def _insert(self, key: str, expiry: int, now: float) -> _Counter:
+        counters = self._buckets.get(expiry)
+        if counters is None:
+            counters = self._buckets[expiry] = OrderedDict()
+        self._evict_idle(counters, now)
+        if self._size >= self.max_keys:
+            for other in self._buckets.values():
+                if other is not counters:
+                    self._evict_idle(other, now)
+        if self._size >= self.max_keys:
+            max(self._buckets.values(), key=len).popitem(last=False)
+            self._size -= 1
+            RATE_LIMIT_EVICTIONS.labels(reason="capacity").inc()
+
+        counter = counters[key] = _Counter()
+        self._size += 1
+        RATE_LIMIT_WINDOWS.set(self._size)
+        return counter
+
+    def _evict_idle(self, counters: "OrderedDict[str, _Counter]", now: float):
+        idle = 0
+        while idle < self.SWEEP_BATCH and counters:
+            oldest_key, oldest = next(iter(counters.items()))
+            if oldest.idle_at > now:
+                break
+            del counters[oldest_key]
+            idle += 1
+        if idle:
+            self._size -= idle
+            RATE_LIMIT_EVICTIONS.labels(reason="idle").inc(idle)
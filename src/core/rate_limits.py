@@ -0,0 +1,85 @@
+import os
+from typing import Optional
+
+from flask import request
+
+# Proxies in front of the app that append to X-Forwarded-For, such as the
+# ingress controller. 0 trusts no header and uses the peer address.
+RATELIMIT_TRUSTED_PROXIES = int(os.getenv("RATELIMIT_TRUSTED_PROXIES", "0"))
+
+# Default limits of each tier; route limits such as login's apply to all
+RATELIMIT_ANONYMOUS_LIMITS = os.getenv(
+    "RATELIMIT_ANONYMOUS_LIMITS", "20000 per day;5000 per hour"
+)
+RATELIMIT_USER_LIMITS = os.getenv(
+    "RATELIMIT_USER_LIMITS", "50000 per day;10000 per hour"
+)
+RATELIMIT_SERVICE_LIMITS = os.getenv(
+    "RATELIMIT_SERVICE_LIMITS", "1000000 per day;100000 per hour"
+)
+# Users that are other services calling the API, comma separated
+RATELIMIT_SERVICE_USER_IDS = frozenset(
+    user_id.strip()
+    for user_id in os.getenv("RATELIMIT_SERVICE_USER_IDS", "").split(",")
+    if user_id.strip()
+)
+
+TIER_LIMITS = {
+    "anonymous": RATELIMIT_ANONYMOUS_LIMITS,
+    "user": RATELIMIT_USER_LIMITS,
+    "service": RATELIMIT_SERVICE_LIMITS,
+}
+
+
+def client_address(trusted_proxies: Optional[int] = None) -> str:
+    """The client's address as seen by the first trusted proxy.
+
+    Each trusted proxy appends the address it received the request from to
+    X-Forwarded-For, so the client is that many entries from the right.
+    Entries further left were sent by the client and can be anything.
+    """
+    if trusted_proxies is None:
+        trusted_proxies = RATELIMIT_TRUSTED_PROXIES
+    remote_addr = request.remote_addr or "127.0.0.1"
+    if trusted_proxies <= 0:
+        return remote_addr
+
+    forwarded_for = request.headers.get("X-Forwarded-For", "")
+    addresses = [address.strip() for address in forwarded_for.split(",")]
+    if len(addresses) < trusted_proxies or not addresses[-trusted_proxies]:
+        # Fewer entries than proxies: the request didn't come through them
+        return remote_addr
+    return addresses[-trusted_proxies]
+
+
+def current_user_id() -> Optional[str]:
+    """Id of the user whose valid access token the request carries"""
+    if "Authorization" not in request.headers:
+        return None
+    # Imported here: the auth middleware imports services that import the
+    # factory, which imports this module
+    from src.api.v1.middlewares.auth_middleware import authenticate
+
+    token_data, _ = authenticate()
+    return None if token_data is None else token_data.user_id
+
+
+def rate_limit_key() -> str:
+    """Authenticated requests count per user, others per client address"""
+    user_id = current_user_id()
+    if user_id is not None:
+        return f"user:{user_id}"
+    return f"ip:{client_address()}"
+
+
+def rate_limit_tier() -> str:
+    user_id = current_user_id()
+    if user_id is None:
+        return "anonymous"
+    if user_id in RATELIMIT_SERVICE_USER_IDS:
+        return "service"
+    return "user"
+
+
+def tier_limits() -> str:
+    return TIER_LIMITS[rate_limit_tier()]
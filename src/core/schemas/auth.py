@@ -40,6 +40,18 @@ class UserSchema(BaseSchema):
     email: EmailStr
 
 
+class LogoutRequestSchema(BaseSchema):
+    """Schema for logout request validation"""
+
+    refresh_token: Optional[str] = None
+
+
+class RevokeTokenRequestSchema(BaseSchema):
+    """Schema for token revocation request validation"""
+
+    token: str
+
+
 class TokenPayloadSchema(BaseSchema):
     """Schema for JWT token payload"""
 
@@ -48,3 +60,5 @@ class TokenPayloadSchema(BaseSchema):
     exp: Optional[int] = None
     iat: Optional[int] = None
     type: Optional[str] = None
+    # Tokens issued before revocation existed have no id
+    jti: Optional[str] = None
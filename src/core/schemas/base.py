@@ -33,10 +33,9 @@ T = TypeVar("T")
 
 
 class PaginatedResponseSchema(BaseSchema, Generic[T]):
-    """Schema for paginated results"""
+    """Schema for cursor paginated results"""
 
     items: List[T]
-    total: int
-    page: int
     per_page: int
-    pages: int
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
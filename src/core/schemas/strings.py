@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 
 from pydantic import Field, field_validator
 
@@ -14,6 +14,36 @@ class StringSchema(BaseSchema):
     created_at: Optional[datetime] = None
 
 
+class StringListQuerySchema(BaseSchema):
+    """Schema for string listing query parameters"""
+
+    cursor: Optional[str] = None
+    limit: int = Field(default=20, ge=1, le=100)
+    order: Literal["asc", "desc"] = "asc"
+    include_total: bool = False
+
+
+class StringExportQuerySchema(BaseSchema):
+    """Schema for export query parameters"""
+
+    format: Literal["ndjson", "csv"] = "ndjson"
+    since_id: int = Field(default=0, ge=0)
+
+
+class StringSearchQuerySchema(BaseSchema):
+    """Schema for full-text search query parameters"""
+
+    q: str = Field(min_length=1, max_length=200)
+    cursor: Optional[str] = None
+    limit: int = Field(default=20, ge=1, le=100)
+
+
+class StringSearchResultSchema(StringSchema):
+    """Schema for a ranked search hit"""
+
+    score: float
+
+
 class StringCreateSchema(BaseSchema):
     """Schema for string creation validation"""
 
@@ -33,7 +63,82 @@ class StringCreateResponseSchema(SuccessResponseSchema):
     id: int
 
 
+class StringExistsQuerySchema(BaseSchema):
+    """Schema for string existence lookup query parameters"""
+
+    value: str = Field(min_length=1, max_length=1000)
+
+
+class StringExistsResponseSchema(BaseSchema):
+    """Schema for string existence lookup response"""
+
+    exists: bool
+    id: Optional[int] = None
+
+
+MAX_BATCH_STRINGS = 1000
+
+
+class StringBatchQuerySchema(BaseSchema):
+    """Schema for batch save query parameters"""
+
+    atomic: bool = True
+
+
+class StringBatchItemErrorSchema(BaseSchema):
+    """Schema for a rejected item in a batch save"""
+
+    index: int
+    message: str
+
+
+class StringBatchCreateResponseSchema(BaseSchema):
+    """Schema for batch string creation response"""
+
+    status: str = "success"
+    message: str
+    ids: List[Optional[int]]
+    saved: int
+    errors: List[StringBatchItemErrorSchema] = []
+
+
 class RandomStringResponseSchema(BaseSchema):
     """Schema for random string response"""
 
     random_string: str
+
+
+MAX_RANDOM_STRINGS = 500
+
+
+class RandomStringQuerySchema(BaseSchema):
+    """Schema for random string query parameters"""
+
+    count: Optional[int] = Field(default=None, ge=1, le=MAX_RANDOM_STRINGS)
+    replace: bool = True
+
+
+class RandomStringListResponseSchema(BaseSchema):
+    """Schema for batch random string response"""
+
+    random_strings: List[str]
+    count: int
+
+
+class StringImportLineErrorSchema(BaseSchema):
+    """Schema for a rejected line in an NDJSON import"""
+
+    line: int
+    message: str
+
+
+class StringImportResponseSchema(BaseSchema):
+    """Schema for NDJSON import response"""
+
+    status: str = "success"
+    message: str
+    lines: int
+    saved: int
+    failed: int
+    errors: List[StringImportLineErrorSchema] = []
+    errors_truncated: bool = False
@@ -12,10 +12,11 @@ def configure_security(app: Flask):
         response.headers["Strict-Transport-Security"] = (
             "max-age=31536000; includeSubDomains"
         )
-        # Cache control for API responses
-        response.headers["Cache-Control"] = (
-            "no-store, no-cache, must-revalidate, max-age=0"
-        )
+        # Cache control for API responses, except ones marked as public
+        if not response.cache_control.public:
+            response.headers["Cache-Control"] = (
+                "no-store, no-cache, must-revalidate, max-age=0"
+            )
         return response
 
     @app.before_request
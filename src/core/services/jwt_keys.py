@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from cryptography.hazmat.primitives.serialization import (
+    load_pem_private_key,
+    load_pem_public_key,
+)
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+
+# Directory of PEM keys named <kid>.pem. When set, access tokens are signed
+# with the private key JWT_SIGNING_KEY_ID and carry its kid; public keys
+# and the other private keys only verify. Unset keeps HS256 with SECRET_KEY.
+JWT_KEYS_DIR = os.getenv("JWT_KEYS_DIR", "")
+JWT_SIGNING_KEY_ID = os.getenv("JWT_SIGNING_KEY_ID", "")
+JWKS_MAX_AGE = int(os.getenv("JWKS_MAX_AGE", "300"))
+
+
+class JWTKey:
+    """One key of the key set; the algorithm follows from the key type"""
+
+    def __init__(self, kid: str, key):
+        self.kid = kid
+        if isinstance(key, (rsa.RSAPrivateKey, ed25519.Ed25519PrivateKey)):
+            self.private_key, self.public_key = key, key.public_key()
+        elif isinstance(key, (rsa.RSAPublicKey, ed25519.Ed25519PublicKey)):
+            self.private_key, self.public_key = None, key
+        else:
+            raise ValueError(f"JWT key {kid} must be an RSA or Ed25519 key")
+
+        if isinstance(self.public_key, rsa.RSAPublicKey):
+            self.algorithm = "RS256"
+        else:
+            self.algorithm = "EdDSA"
+
+    @classmethod
+    def from_pem(cls, kid: str, pem: bytes) -> "JWTKey":
+        if b"PRIVATE KEY" in pem:
+            return cls(kid, load_pem_private_key(pem, password=None))
+        return cls(kid, load_pem_public_key(pem))
+
+    def to_jwk(self) -> dict:
+        algorithm = RSAAlgorithm if self.algorithm == "RS256" else OKPAlgorithm
+        jwk = json.loads(algorithm.to_jwk(self.public_key))
+        jwk.pop("key_ops", None)
+        jwk.update({"kid": self.kid, "alg": self.algorithm, "use": "sig"})
+        return jwk
+
+
+class JWTKeySet:
+    """Keys that sign and verify access tokens.
+
+    Tokens name their key in the ``kid`` header and are verified with that
+    key and its algorithm only, so several keys can be valid at once while
+    one is rotated out. Keys are read from ``keys_dir`` on first use.
+    """
+
+    def __init__(
+        self, keys_dir: Optional[str] = None, signing_kid: Optional[str] = None
+    ):
+        self.keys_dir = JWT_KEYS_DIR if keys_dir is None else keys_dir
+        self.signing_kid = JWT_SIGNING_KEY_ID if signing_kid is None else signing_kid
+
+        self._keys: Optional[Dict[str, JWTKey]] = None
+        self._signing_key: Optional[JWTKey] = None
+        self._jwks: Optional[bytes] = None
+        self._jwks_etag: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.keys_dir)
+
+    @property
+    def signing_key(self) -> Optional[JWTKey]:
+        """Key new access tokens are signed with; None signs with HS256"""
+        self._load()
+        return self._signing_key
+
+    def verification_key(self, kid: str) -> Optional[JWTKey]:
+        self._load()
+        return self._keys.get(kid)
+
+    def jwks(self) -> bytes:
+        """The public keys as a serialized JSON Web Key Set"""
+        self._load()
+        return self._jwks
+
+    def jwks_etag(self) -> str:
+        self._load()
+        return self._jwks_etag
+
+    def _load(self):
+        if self._keys is not None:
+            return
+        with self._lock:
+            if self._keys is not None:
+                return
+
+            keys: Dict[str, JWTKey] = {}
+            signing_key = None
+            if self.enabled:
+                for name in sorted(os.listdir(self.keys_dir)):
+                    kid, ext = os.path.splitext(name)
+                    if ext == ".pem":
+                        with open(os.path.join(self.keys_dir, name), "rb") as f:
+                            keys[kid] = JWTKey.from_pem(kid, f.read())
+                signing_key = self._pick_signing_key(keys)
+
+            # Serialized once; the key set only changes with a restart
+            self._jwks = json.dumps(
+                {"keys": [key.to_jwk() for key in keys.values()]},
+                separators=(",", ":"),
+            ).encode("utf-8")
+            self._jwks_etag = hashlib.sha256(self._jwks).hexdigest()[:32]
+            self._signing_key = signing_key
+            self._keys = keys
+
+    def _pick_signing_key(self, keys: Dict[str, JWTKey]) -> JWTKey:
+        private = [key for key in keys.values() if key.private_key is not None]
+        if self.signing_kid:
+            key = keys.get(self.signing_kid)
+            if key is None or key.private_key is None:
+                raise ValueError(
+                    f"JWT_SIGNING_KEY_ID {self.signing_kid} has no private key "
+                    f"in {self.keys_dir}"
+                )
+            return key
+        if len(private) != 1:
+            raise ValueError(
+                f"{self.keys_dir} holds {len(private)} private keys; set "
+                f"JWT_SIGNING_KEY_ID to the one that signs"
+            )
+        return private[0]
+
+
+jwt_key_set = JWTKeySet()
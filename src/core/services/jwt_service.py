@@ -1,13 +1,22 @@
 import os
+import uuid
 from datetime import datetime, timedelta, timezone
 
 import jwt
 
+from src.core.services.jwt_keys import jwt_key_set
+
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 JWT_ALGORITHM = "HS256"
 JWT_SECRET_KEY = os.getenv("SECRET_KEY", "")
 JWT_REFRESH_SECRET_KEY = os.getenv("REFRESH_SECRET_KEY", "")
+# Once signing keys are set up, whether access tokens without a kid, signed
+# with SECRET_KEY, are still accepted. Turn it on while switching and off
+# once the last of those tokens has expired.
+JWT_ACCEPT_HS256_TOKENS = (
+    os.getenv("JWT_ACCEPT_HS256_TOKENS", "false").lower() == "true"
+)
 
 
 class JWTService:
@@ -19,9 +28,24 @@ class JWTService:
         )
 
         to_encode.update(
-            {"exp": expire, "iat": datetime.now(timezone.utc), "type": "access"}
+            {
+                "exp": expire,
+                "iat": datetime.now(timezone.utc),
+                "type": "access",
+                "jti": uuid.uuid4().hex,
+            }
         )
 
+        # Other services verify access tokens with our public keys (JWKS)
+        key = jwt_key_set.signing_key
+        if key is not None:
+            return jwt.encode(
+                to_encode,
+                key.private_key,
+                algorithm=key.algorithm,
+                headers={"kid": key.kid},
+            )
+
         return jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
 
     @staticmethod
@@ -30,7 +54,12 @@ class JWTService:
         expire = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
 
         to_encode.update(
-            {"exp": expire, "iat": datetime.now(timezone.utc), "type": "refresh"}
+            {
+                "exp": expire,
+                "iat": datetime.now(timezone.utc),
+                "type": "refresh",
+                "jti": uuid.uuid4().hex,
+            }
         )
 
         return jwt.encode(to_encode, JWT_REFRESH_SECRET_KEY, algorithm=JWT_ALGORITHM)
@@ -38,10 +67,28 @@ class JWTService:
     @staticmethod
     def decode_token(token: str, verify_exp: bool = True) -> dict:
         try:
+            # The kid picks the key, and the key fixes the algorithm; the
+            # token's own alg header is never trusted. Tokens without a kid
+            # are signed with SECRET_KEY when there are no signing keys, or
+            # were before they were set up.
+            kid = jwt.get_unverified_header(token).get("kid")
+            if kid is None:
+                if jwt_key_set.enabled and not JWT_ACCEPT_HS256_TOKENS:
+                    raise ValueError("Invalid token")
+                key, algorithm = JWT_SECRET_KEY, JWT_ALGORITHM
+            elif not isinstance(kid, str):
+                raise ValueError("Invalid token")
+            else:
+                verification_key = jwt_key_set.verification_key(kid)
+                if verification_key is None:
+                    raise ValueError("Invalid token")
+                key = verification_key.public_key
+                algorithm = verification_key.algorithm
+
             payload = jwt.decode(
                 token,
-                JWT_SECRET_KEY,
-                algorithms=[JWT_ALGORITHM],
+                key,
+                algorithms=[algorithm],
                 options={"verify_exp": verify_exp},
             )
             return payload
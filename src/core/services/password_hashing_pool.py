@@ -0,0 +1,159 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Optional
+
+from src.core.metrics import (
+    PASSWORD_HASH_DURATION,
+    PASSWORD_HASH_QUEUE_DEPTH,
+    PASSWORD_HASH_REJECTIONS,
+)
+from src.core.password_hashers import PasswordHasher, get_hasher, identify
+
+# Request threads per app worker, exported by gunicorn.conf.py
+GUNICORN_THREADS = int(os.getenv("GUNICORN_THREADS", "2"))
+# Hashing processes per app worker; 0 hashes on the request thread. One
+# fewer than the request threads, so a login storm always leaves a thread
+# for the other endpoints.
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS", str(max(1, GUNICORN_THREADS - 1)))
+)
+# Hashes that may wait for a free process before requests are turned away
+PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "0"))
+# Seconds a login waits for a free slot before it is turned away, about one
+# hash, so logins that arrive together are served one after the other
+PASSWORD_HASH_WAIT = float(os.getenv("PASSWORD_HASH_WAIT", "0.5"))
+PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", "10"))
+
+
+class PasswordHashingBusyError(Exception):
+    """Raised when the hashing pool has no room for another hash"""
+
+
+class PasswordHashingPool:
+    """Runs password hashes in a small process pool with a bounded queue.
+
+    A password hash takes a few hundred milliseconds of CPU. In a pool of
+    ``workers`` processes it can't starve the app's threads of the GIL or
+    of more than ``workers`` cores, however many logins arrive at once. At
+    most ``workers + queue_size`` hashes are running or waiting, and so at
+    most that many request threads are waiting on one. Beyond that a hash
+    waits up to ``wait`` seconds for a slot and then raises
+    ``PasswordHashingBusyError``, so a login storm fails fast instead of
+    tying up every request thread.
+
+    Processes are spawned rather than forked, since forking a threaded
+    worker is unsafe. They only import the hashing library, not the app.
+    New hashes use ``hasher``, the configured algorithm by default; stored
+    hashes are verified with whichever algorithm made them.
+    """
+
+    def __init__(
+        self, workers=None, queue_size=None, timeout=None, hasher=None, wait=None
+    ):
+        self.workers = PASSWORD_HASH_WORKERS if workers is None else workers
+        self.queue_size = PASSWORD_HASH_QUEUE_SIZE if queue_size is None else queue_size
+        self.wait = PASSWORD_HASH_WAIT if wait is None else wait
+        self.timeout = timeout or PASSWORD_HASH_TIMEOUT
+        self.hasher: PasswordHasher = hasher or get_hasher()
+
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def hash(self, password: str, wait: bool = True) -> str:
+        """Hash ``password``; ``wait=False`` gives up at once when busy"""
+        return self.hasher.hash(password, run=partial(self._run, "hash", wait))
+
+    def verify(self, pw_hash: str, password: str) -> bool:
+        return identify(pw_hash).verify(
+            pw_hash, password, run=partial(self._run, "verify", True)
+        )
+
+    def needs_rehash(self, pw_hash: str) -> bool:
+        """Whether ``pw_hash`` was made under an older hashing policy"""
+        return self.hasher.needs_rehash(pw_hash)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def _run(self, operation: str, wait: bool, func, *args, **kwargs):
+        if wait and self.wait > 0:
+            acquired = self._slots.acquire(timeout=self.wait)
+        else:
+            acquired = self._slots.acquire(blocking=False)
+        if not acquired:
+            PASSWORD_HASH_REJECTIONS.labels(operation=operation).inc()
+            raise PasswordHashingBusyError("Too many password hashes in progress")
+
+        PASSWORD_HASH_QUEUE_DEPTH.inc()
+        start = time.perf_counter()
+        released = threading.Lock()
+
+        def release(_=None):
+            # Called by whichever of the request thread and the future's
+            # callback gets there first
+            if not released.acquire(blocking=False):
+                return
+            PASSWORD_HASH_QUEUE_DEPTH.dec()
+            PASSWORD_HASH_DURATION.labels(operation=operation).observe(
+                time.perf_counter() - start
+            )
+            self._slots.release()
+
+        if self.workers == 0:
+            try:
+                return func(*args, **kwargs)
+            finally:
+                release()
+
+        executor = self._get_executor()
+        try:
+            future: Future = executor.submit(func, *args, **kwargs)
+        except Exception:
+            release()
+            self._discard(executor)
+            raise
+        # The slot is held until the hash is done, even if this request
+        # stopped waiting for it, so the queue bound holds
+        future.add_done_callback(release)
+
+        try:
+            return future.result(self.timeout)
+        except FutureTimeoutError:
+            raise PasswordHashingBusyError("Password hash timed out")
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+        finally:
+            # The callback may run only after the result is returned; free
+            # the slot first so this thread's next hash, such as the rehash
+            # after a login, finds it free
+            if future.done():
+                release()
+
+    def _discard(self, executor: ProcessPoolExecutor):
+        # A pool whose process died stays broken; start a new one next time
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+
+password_hashing_pool = PasswordHashingPool()
@@ -0,0 +1,147 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from flask import current_app
+
+from src.core.db_routing import read_only
+from src.core.metrics import (
+    RANDOM_POOL_EVICTIONS,
+    RANDOM_POOL_REFILL_LATENCY,
+    RANDOM_POOL_REQUESTS,
+    RANDOM_POOL_SIZE,
+)
+from src.core.services.random_string_service import random_string_service
+
+RANDOM_POOL_ENABLED = os.getenv("RANDOM_POOL_ENABLED", "false").lower() == "true"
+RANDOM_POOL_SIZE_LIMIT = int(os.getenv("RANDOM_POOL_SIZE", "256"))
+RANDOM_POOL_LOW_WATER = int(os.getenv("RANDOM_POOL_LOW_WATER", "64"))
+RANDOM_POOL_MAX_STALENESS = float(os.getenv("RANDOM_POOL_MAX_STALENESS", "5"))
+
+logger = logging.getLogger(__name__)
+
+
+class RandomStringPool:
+    """Per-worker reservoir of prefetched random strings.
+
+    A refill draws ``size`` uniform samples in one query and replaces the
+    whole pool; every sample is served at most once. Refills run on a
+    background thread when the pool drops below ``low_water`` or its batch
+    is half way to ``max_staleness``. A batch older than ``max_staleness``
+    is evicted rather than served, so a newly saved string becomes eligible
+    within ``max_staleness`` seconds.
+    """
+
+    def __init__(
+        self,
+        enabled=None,
+        size=None,
+        low_water=None,
+        max_staleness=None,
+        service=None,
+    ):
+        self.enabled = RANDOM_POOL_ENABLED if enabled is None else enabled
+        self.size = size or RANDOM_POOL_SIZE_LIMIT
+        self.low_water = RANDOM_POOL_LOW_WATER if low_water is None else low_water
+        self.max_staleness = max_staleness or RANDOM_POOL_MAX_STALENESS
+        self.service = service or random_string_service
+
+        self._items = deque()
+        self._fetched_at = 0.0
+        self._last_attempt = float("-inf")
+        self._lock = threading.Lock()
+        self._refill_thread: Optional[threading.Thread] = None
+
+    def get(self) -> Optional[str]:
+        """Return a random string value, or None if there are no strings"""
+        if not self.enabled:
+            row = self.service.pick_one()
+            return row.value if row else None
+
+        value = self._take()
+        self._maybe_schedule_refill()
+
+        if value is not None:
+            RANDOM_POOL_REQUESTS.labels(result="hit").inc()
+            return value
+
+        RANDOM_POOL_REQUESTS.labels(result="miss").inc()
+        row = self.service.pick_one()
+        return row.value if row else None
+
+    def refill(self):
+        """Fetch a fresh batch and swap it in; runs inside an app context"""
+        start = time.perf_counter()
+        values = [row.value for row in self.service.sample(self.size)]
+        RANDOM_POOL_REFILL_LATENCY.observe(time.perf_counter() - start)
+
+        with self._lock:
+            if self._items:
+                RANDOM_POOL_EVICTIONS.inc(len(self._items))
+            self._items = deque(values)
+            self._fetched_at = time.monotonic()
+            RANDOM_POOL_SIZE.set(len(self._items))
+
+    def wait_for_refill(self, timeout=None):
+        """Block until an in-flight background refill has finished"""
+        thread = self._refill_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._fetched_at = 0.0
+            self._last_attempt = float("-inf")
+            RANDOM_POOL_SIZE.set(0)
+
+    def _take(self) -> Optional[str]:
+        with self._lock:
+            if not self._items:
+                return None
+
+            if time.monotonic() - self._fetched_at > self.max_staleness:
+                RANDOM_POOL_EVICTIONS.inc(len(self._items))
+                self._items.clear()
+                RANDOM_POOL_SIZE.set(0)
+                return None
+
+            value = self._items.popleft()
+            RANDOM_POOL_SIZE.set(len(self._items))
+            return value
+
+    def _maybe_schedule_refill(self):
+        now = time.monotonic()
+        with self._lock:
+            if self._refill_thread is not None and self._refill_thread.is_alive():
+                return
+
+            age = now - self._fetched_at
+            if len(self._items) >= self.low_water and age < self.max_staleness / 2:
+                return
+
+            # Don't hammer an empty or tiny table with back-to-back refills
+            if now - self._last_attempt < min(1.0, self.max_staleness / 2):
+                return
+
+            self._last_attempt = now
+            self._refill_thread = threading.Thread(
+                target=self._refill_in_background,
+                args=(current_app._get_current_object(),),
+                name="random-string-pool-refill",
+                daemon=True,
+            )
+            self._refill_thread.start()
+
+    def _refill_in_background(self, app):
+        with app.app_context(), read_only():
+            try:
+                self.refill()
+            except Exception as e:
+                logger.error(f"Random string pool refill failed: {e}")
+
+
+random_string_pool = RandomStringPool()
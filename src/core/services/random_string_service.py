@@ -0,0 +1,439 @@
+import bisect
+import itertools
+import os
+import random
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select
+
+from src.core.models.string import String
+from src.core.services.string_write_service import STRING_ID_GENERATOR
+from src.core.sharding import current_shard, get_shards, on_shard
+from src.factory import db
+
+# Number of candidate ids probed per round trip. Each candidate hits with
+# probability (row count / id span), so even a table where half of the ids
+# have been deleted misses all of them with probability 2 ** -32.
+RANDOM_PROBE_SIZE = 32
+# Sparse ids are sampled through windows over the first 8 bytes of
+# value_hash: rows expected per window, and the most a window may hold
+# before the round is redrawn with more slots
+HASH_WINDOW_ROWS = 4
+HASH_WINDOW_SLOTS = 16
+HASH_SPACE = 1 << 64
+HASH_WINDOWS_PER_QUERY = 200
+# Rounds in a row that may find no new row before a draw gives up, and
+# windows per round
+HASH_ROUNDS = 8
+HASH_WINDOWS_PER_ROUND = 5 * HASH_WINDOWS_PER_QUERY
+# Hashes read after a random point to estimate a shard's row count
+HASH_ESTIMATE_ROWS = 64
+# Seconds the per-shard row estimates that weight the choice of shard may
+# be stale. Defaults to the random pool's max staleness, so a string saved
+# on a shard that was empty can be drawn within the same bound.
+RANDOM_COUNT_TTL = float(
+    os.getenv("RANDOM_COUNT_TTL", os.getenv("RANDOM_POOL_MAX_STALENESS", "5"))
+)
+
+
+class RandomStringService:
+    """Uniform random selection of stored strings.
+
+    Instead of ``COUNT(*)`` followed by ``OFFSET``, which both walk the table,
+    the selector reads ``MIN(id)``/``MAX(id)`` from the primary key index and
+    probes random ids in that range. Probes that land on a deleted id are
+    rejected, which keeps every existing row equally likely regardless of
+    the gaps in the id sequence.
+
+    With sharded strings each draw first picks a shard with probability
+    proportional to its estimated row count, re-estimated every
+    ``count_ttl`` seconds (see ``_estimate_rows``), then a uniform row on
+    that shard.
+    A shard holds only about ``1 / len(shards)`` of the ids in its range, so
+    probes are scaled up by the shard count.
+
+    Snowflake ids leave almost every id in the range unused, so with
+    ``sparse_ids`` rows are drawn through ``value_hash`` instead; see
+    ``_sample_by_hash``. The same method finishes a draw whose id probes
+    keep missing, so no draw counts or offsets into the table.
+    """
+
+    def __init__(
+        self,
+        rng: Optional[random.Random] = None,
+        probe_size=None,
+        count_ttl=None,
+        sparse_ids=None,
+    ):
+        self.rng = rng or random.Random()
+        self.probe_size = probe_size or RANDOM_PROBE_SIZE
+        self.count_ttl = RANDOM_COUNT_TTL if count_ttl is None else count_ttl
+        self.sparse_ids = (
+            STRING_ID_GENERATOR == "snowflake" if sparse_ids is None else sparse_ids
+        )
+        # Estimated rows per shard and when they were estimated
+        self._shard_counts: Dict[Optional[str], Tuple[int, float]] = {}
+        # Rows per shard as last measured by the hash windows
+        self._hash_estimates: Dict[Optional[str], int] = {}
+
+    def id_bounds(self):
+        """Return ``(min_id, max_id)`` or ``(None, None)`` for an empty table"""
+        # Separate subqueries so each side is a single index seek; SQLite
+        # only optimizes a lone MIN() or MAX() per SELECT.
+        return db.session.query(
+            select(func.min(String.id)).scalar_subquery(),
+            select(func.max(String.id)).scalar_subquery(),
+        ).one()
+
+    def pick_one(self) -> Optional[String]:
+        """Return a uniformly random row, or None if the table is empty"""
+        shards = get_shards()
+        if shards is None:
+            return self._pick_one()
+
+        counts = self._counts(shards)
+        if not any(counts.values()):
+            return None
+
+        key = self.rng.choices(list(counts), weights=list(counts.values()))[0]
+        with on_shard(key):
+            return self._pick_one(scale=len(shards))
+
+    def _pick_one(self, scale=1) -> Optional[String]:
+        if self.sparse_ids:
+            rows = self._sample_by_hash(1)
+            return rows[0] if rows else None
+
+        low, high = self.id_bounds()
+        if low is None:
+            return None
+
+        candidates = [
+            self.rng.randint(low, high) for _ in range(self.probe_size * scale)
+        ]
+        rows = self._rows_by_id(candidates)
+
+        # Taking the first hit in draw order is sequential rejection sampling,
+        # so the result is uniform over existing rows.
+        for candidate in candidates:
+            if candidate in rows:
+                return rows[candidate]
+
+        rows = self._sample_by_hash(1)
+        return rows[0] if rows else None
+
+    def sample(self, n: int) -> List[String]:
+        """Return ``n`` uniformly random rows, drawn with replacement.
+
+        All candidates for a batch go out in a single ``IN`` query; further
+        rounds are only needed when the id range is sparse enough that the
+        first round came back short.
+        """
+        shards = get_shards()
+        if shards is None:
+            return self._sample(n)
+
+        counts = {key: count for key, count in self._counts(shards).items() if count}
+        if not counts or n <= 0:
+            return []
+
+        draws = Counter(
+            self.rng.choices(list(counts), weights=list(counts.values()), k=n)
+        )
+        picked: List[String] = []
+        for key, k in draws.items():
+            with on_shard(key):
+                picked.extend(self._sample(k, scale=len(shards)))
+        self.rng.shuffle(picked)
+        return picked
+
+    def _sample(self, n: int, scale=1) -> List[String]:
+        if self.sparse_ids:
+            return self._sample_by_hash(n)
+
+        low, high = self.id_bounds()
+        if low is None or n <= 0:
+            return []
+
+        picked: List[String] = []
+        for _ in range(3):
+            missing = n - len(picked)
+            if missing == 0:
+                return picked
+
+            candidates = [
+                self.rng.randint(low, high)
+                for _ in range((missing * 2 + self.probe_size) * scale)
+            ]
+            rows = self._rows_by_id(candidates)
+            picked.extend(
+                [rows[candidate] for candidate in candidates if candidate in rows][
+                    :missing
+                ]
+            )
+
+        if len(picked) < n:
+            picked.extend(self._sample_by_hash(n - len(picked)))
+        return picked
+
+    def sample_unique(self, n: int) -> List[String]:
+        """Return up to ``n`` distinct uniformly random rows.
+
+        Candidates are a prefix of a random permutation of the id range, so
+        the first ``n`` existing ids form a uniform random subset. A short
+        round is redrawn with a longer prefix; fewer than ``n`` rows come
+        back only when the table holds fewer than ``n`` strings.
+        """
+        shards = get_shards()
+        if shards is None:
+            return self._sample_unique(n)
+
+        counts = self._counts(shards)
+        total = sum(counts.values())
+        if total == 0 or n <= 0:
+            return []
+
+        if n >= total:
+            # The counts are estimates; take all there is and trim
+            per_shard = Counter({key: n for key, count in counts.items() if count})
+        else:
+            # Which shards a uniform n-subset of all rows falls on
+            keys = list(counts)
+            bounds = list(itertools.accumulate(counts.values()))
+            per_shard = Counter(
+                keys[bisect.bisect_right(bounds, position)]
+                for position in self.rng.sample(range(total), n)
+            )
+
+        picked: List[String] = []
+        for key, k in per_shard.items():
+            with on_shard(key):
+                picked.extend(self._sample_unique(k, scale=len(shards)))
+        self.rng.shuffle(picked)
+        return picked[:n]
+
+    def _sample_unique(self, n: int, scale=1) -> List[String]:
+        if self.sparse_ids:
+            return self._sample_by_hash(n, unique=True)
+
+        low, high = self.id_bounds()
+        if low is None or n <= 0:
+            return []
+
+        span = high - low + 1
+        draws = (n * 2 + self.probe_size) * scale
+        for _ in range(3):
+            candidates = self.rng.sample(range(low, high + 1), min(span, draws))
+            rows = self._rows_by_id(candidates)
+            picked = [rows[candidate] for candidate in candidates if candidate in rows]
+            if len(picked) >= n or len(candidates) == span:
+                return picked[:n]
+            draws *= 4
+
+        return self._sample_by_hash(n, unique=True)
+
+    def _sample_by_hash(self, n: int, unique=False) -> List[String]:
+        """Uniform rows found through random windows over ``value_hash``.
+
+        Hashes are spread evenly, and a window of fixed width contains any
+        given row with the same probability. Each window picks one of its
+        slots at random and yields its row in that slot, if it has one, so
+        every row is equally likely per window as long as no window holds
+        more rows than slots. A round with a fuller window, which takes a
+        value stored many times, is redrawn with more slots.
+
+        Widths start from the estimate the last draw on this shard left, or
+        from ``_estimate_rows`` on the first one, and are recomputed after
+        every round from the rows its windows held. A stale estimate costs
+        a round instead of ever-wider windows, and the table is never
+        counted.
+
+        Rows whose hash hasn't been backfilled can't fall in a window. If
+        the windows come back short while such rows exist, the rest are
+        drawn with ``_sample_by_seek``.
+        """
+        if n <= 0 or self.id_bounds()[0] is None:
+            return []
+        key = current_shard()
+        estimate = self._hash_estimates.get(key) or self._estimate_rows()
+
+        slots = HASH_WINDOW_SLOTS
+        draws: List[int] = []
+        seen = set()
+        stalled = 0
+        while len(draws) < n and stalled < HASH_ROUNDS:
+            missing = n - len(draws)
+            stalled += 1
+            width = max(1, HASH_SPACE * HASH_WINDOW_ROWS // max(estimate, 1))
+            # Enough windows to expect twice the rows still missing
+            count = min(
+                missing * 2 * slots // HASH_WINDOW_ROWS + self.probe_size,
+                HASH_WINDOWS_PER_ROUND,
+            )
+            starts = [self.rng.randrange(1 - width, HASH_SPACE) for _ in range(count)]
+            windows = self._hash_windows(starts, width)
+
+            held = sum(len(window) for window in windows)
+            covered = sum(
+                min(start + width, HASH_SPACE) - max(start, 0) for start in starts
+            )
+            estimate = held * HASH_SPACE // covered if held else estimate // 4
+
+            largest = max(len(window) for window in windows)
+            if largest > slots:
+                slots = 1 << (largest - 1).bit_length()
+                continue
+            for window in windows:
+                slot = self.rng.randrange(slots)
+                if slot >= len(window) or (unique and window[slot] in seen):
+                    continue
+                draws.append(window[slot])
+                seen.add(window[slot])
+                stalled = 0
+                if len(draws) == n:
+                    break
+
+        self._hash_estimates[key] = max(estimate, 1)
+
+        rows = self._rows_by_id(draws)
+        picked = [rows[id_] for id_ in draws if id_ in rows]
+        if len(picked) < n and self._has_unhashed_rows():
+            picked.extend(
+                self._sample_by_seek(n - len(picked), seen if unique else None)
+            )
+        return picked
+
+    def _estimate_rows(self) -> int:
+        """Row count estimated from a run of hashes, without counting.
+
+        Reads the first ``HASH_ESTIMATE_ROWS`` hashes after a random point,
+        wrapping around to the start of the hash space: at most two index
+        ranges. Fewer hashes than that are all there are. Otherwise hashes
+        are spread evenly, so the share of the space they span gives the
+        count to within about an eighth.
+        """
+        start = self.rng.randrange(HASH_SPACE)
+        hashes = self._hashes_from(start, HASH_ESTIMATE_ROWS)
+        if len(hashes) < HASH_ESTIMATE_ROWS:
+            hashes += [
+                hash_ + HASH_SPACE
+                for hash_ in self._hashes_from(0, HASH_ESTIMATE_ROWS - len(hashes))
+                if hash_ < start
+            ]
+        if len(hashes) < HASH_ESTIMATE_ROWS:
+            return len(hashes)
+        return (HASH_ESTIMATE_ROWS - 1) * HASH_SPACE // (hashes[-1] - start + 1)
+
+    def _hashes_from(self, start: int, limit: int) -> List[int]:
+        """First ``limit`` hash prefixes at or after ``start``, in order"""
+        return [
+            int.from_bytes(bytes(row.value_hash[:8]), "big")
+            for row in db.session.query(String.value_hash)
+            .filter(String.value_hash >= start.to_bytes(8, "big"))
+            .order_by(String.value_hash)
+            .limit(limit)
+        ]
+
+    def _has_unhashed_rows(self) -> bool:
+        return db.session.query(
+            db.session.query(String.id).filter(String.value_hash.is_(None)).exists()
+        ).scalar()
+
+    def _sample_by_seek(self, n: int, seen=None) -> List[String]:
+        """Rows at the first id at or after random points in the id range.
+
+        Two index seeks per row, for rows without a hash. A row is as
+        likely as the gap of unused ids before it is wide, so this is only
+        uniform where ids are dense. With ``seen`` the rows are distinct
+        from it and each other, and fewer may come back.
+        """
+        low, high = self.id_bounds()
+        if low is None:
+            return []
+
+        picked: List[String] = []
+        for _ in range(n if seen is None else 2 * n):
+            point = self.rng.randint(low, high)
+            row = (
+                db.session.query(String)
+                .filter(String.id >= point)
+                .order_by(String.id)
+                .first()
+            )
+            if row is None:
+                # Deleted since the bounds were read
+                continue
+            if seen is not None:
+                if row.id in seen:
+                    continue
+                seen.add(row.id)
+            picked.append(row)
+            if len(picked) == n:
+                break
+        return picked
+
+    def _hash_windows(self, starts: List[int], width: int) -> List[List[int]]:
+        """Ids in each window ``[start, start + width)`` of hash prefixes"""
+        bounds = [
+            (
+                max(start, 0).to_bytes(8, "big"),
+                None
+                if start + width >= HASH_SPACE
+                else (start + width).to_bytes(8, "big"),
+            )
+            for start in starts
+        ]
+
+        windows = []
+        # OR-ed ranges nest one level per term on SQLite, which caps depth
+        for offset in range(0, len(bounds), HASH_WINDOWS_PER_QUERY):
+            chunk = bounds[offset : offset + HASH_WINDOWS_PER_QUERY]
+            ranges = [
+                String.value_hash >= low
+                if high is None
+                else and_(String.value_hash >= low, String.value_hash < high)
+                for low, high in chunk
+            ]
+            hits = sorted(
+                (bytes(row.value_hash[:8]), row.id)
+                for row in db.session.query(String.id, String.value_hash).filter(
+                    or_(*ranges)
+                )
+            )
+            prefixes = [prefix for prefix, _ in hits]
+            for low, high in chunk:
+                first = bisect.bisect_left(prefixes, low)
+                last = (
+                    len(prefixes)
+                    if high is None
+                    else bisect.bisect_left(prefixes, high)
+                )
+                windows.append([id_ for _, id_ in hits[first:last]])
+        return windows
+
+    def _shard_count(self, key: str) -> int:
+        """Estimated rows on shard ``key``, at most ``count_ttl`` seconds old"""
+        cached = self._shard_counts.get(key)
+        if cached is not None and time.monotonic() - cached[1] < self.count_ttl:
+            return cached[0]
+
+        with on_shard(key):
+            count = self._estimate_rows()
+            if not count and self.id_bounds()[0] is not None:
+                # Only rows without a hash yet; keep them drawable
+                count = 1
+        self._shard_counts[key] = (count, time.monotonic())
+        return count
+
+    def _counts(self, shards) -> Dict[str, int]:
+        return {key: self._shard_count(key) for key in shards}
+
+    def _rows_by_id(self, ids) -> Dict[int, String]:
+        return {
+            row.id: row for row in db.session.query(String).filter(String.id.in_(ids))
+        }
+
+
+random_string_service = RandomStringService()
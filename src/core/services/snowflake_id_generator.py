@@ -0,0 +1,259 @@
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+from typing import Callable, List, Mapping, Optional
+
+# Ids are 63 bits: milliseconds since the epoch, the worker id and a
+# per-millisecond sequence, so they fit a signed BIGINT and sort by time
+SNOWFLAKE_EPOCH_MS = 1767225600000  # 2026-01-01T00:00:00Z
+WORKER_ID_BITS = 10
+SEQUENCE_BITS = 12
+# Worker ids derived from the environment combine a pod slot with the
+# process slot inside the pod, which leaves room for 16 processes per pod
+PROCESS_SLOT_BITS = 4
+
+MAX_WORKER_ID = (1 << WORKER_ID_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+# A clock stepped back by more than this raises instead of waiting
+MAX_CLOCK_ROLLBACK_MS = 2000
+
+# Redis (or compatible) server that leases worker ids to processes
+STRING_ID_LEASE_URL = os.getenv("STRING_ID_LEASE_URL", "")
+# A lease not renewed for this long is free for another process to take
+STRING_ID_LEASE_SECONDS = int(os.getenv("STRING_ID_LEASE_SECONDS", "30"))
+
+# Renews the lease only if this process still holds it
+RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class WorkerIdLease:
+    """A worker id held in Redis for as long as this process renews it.
+
+    Each id is a key set with NX and an expiry, so no two live processes
+    hold the same one. A thread renews the key every third of the expiry.
+    If renewals fail for long enough that another process could have taken
+    the id, ``held`` turns false and the generator stops handing out ids.
+    """
+
+    KEY = "string_ids:worker:{}"
+
+    def __init__(
+        self,
+        client,
+        ttl: int = STRING_ID_LEASE_SECONDS,
+        clock: Optional[Callable[[], float]] = None,
+    ):
+        self.client = client
+        self.ttl = ttl
+        self.clock = clock or time.monotonic
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+        self.worker_id: Optional[int] = None
+        self._valid_until = 0.0
+        self._renew = client.register_script(RENEW_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str) -> "WorkerIdLease":
+        import redis
+
+        return cls(redis.Redis.from_url(url))
+
+    @property
+    def held(self) -> bool:
+        # A second of margin for the time the last renewal took to arrive
+        return self.clock() < self._valid_until - 1
+
+    def acquire(self) -> int:
+        start = random.randrange(MAX_WORKER_ID + 1)
+        for offset in range(MAX_WORKER_ID + 1):
+            worker_id = (start + offset) % (MAX_WORKER_ID + 1)
+            requested_at = self.clock()
+            key = self.KEY.format(worker_id)
+            if self.client.set(key, self.owner, nx=True, ex=self.ttl):
+                self.worker_id = worker_id
+                self._valid_until = requested_at + self.ttl
+                threading.Thread(target=self._keep_renewing, daemon=True).start()
+                return worker_id
+        raise RuntimeError("Every Snowflake worker id is leased")
+
+    def renew(self) -> bool:
+        requested_at = self.clock()
+        key = self.KEY.format(self.worker_id)
+        if not self._renew(keys=[key], args=[self.owner, self.ttl]):
+            # Expired and maybe taken by someone else; never use it again
+            self._valid_until = 0.0
+            return False
+        self._valid_until = requested_at + self.ttl
+        return True
+
+    def _keep_renewing(self):
+        while True:
+            time.sleep(self.ttl / 3)
+            try:
+                if not self.renew():
+                    return
+            except Exception:
+                # Retried on the next tick; held turns false if it keeps failing
+                pass
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def worker_id_from_environment(environ: Mapping[str, str] = os.environ) -> int:
+    """Worker id of this process when the environment fixes one.
+
+    Under gunicorn the id combines a pod slot with the slot gunicorn handed
+    to this worker (see ``gunicorn.conf.py``), so the workers of one pod
+    never share an id. The pod slot is ``STRING_ID_WORKER_ID`` if set,
+    otherwise a StatefulSet pod's ``POD_INDEX`` (from the
+    ``apps.kubernetes.io/pod-index`` label). A single process outside
+    gunicorn uses ``STRING_ID_WORKER_ID`` as its whole id. Raises
+    ValueError when there is no source; pod names are never hashed, as two
+    pods could collide.
+    """
+    explicit = environ.get("STRING_ID_WORKER_ID")
+    process = environ.get("GUNICORN_WORKER_SLOT")
+    if explicit and not process:
+        worker_id = int(explicit)
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(
+                f"STRING_ID_WORKER_ID must be between 0 and {MAX_WORKER_ID}"
+            )
+        return worker_id
+
+    pod = explicit or environ.get("POD_INDEX")
+    if not pod or not process:
+        raise ValueError(
+            "Snowflake ids need STRING_ID_WORKER_ID, POD_INDEX with gunicorn "
+            "or STRING_ID_LEASE_URL"
+        )
+
+    name = "STRING_ID_WORKER_ID" if explicit else "POD_INDEX"
+    pod_bits = WORKER_ID_BITS - PROCESS_SLOT_BITS
+    pod_slot, process_slot = int(pod), int(process)
+    if not 0 <= pod_slot < 1 << pod_bits or process_slot >= 1 << PROCESS_SLOT_BITS:
+        raise ValueError(
+            f"Under gunicorn {name} must be below {1 << pod_bits} and gunicorn "
+            f"may run at most {1 << PROCESS_SLOT_BITS} workers"
+        )
+    return pod_slot << PROCESS_SLOT_BITS | process_slot
+
+
+def check_worker_id_source(environ: Mapping[str, str] = os.environ):
+    """Refuse to start when this process would have no unique worker id.
+
+    The app is created after gunicorn forks, so ``GUNICORN_WORKER_SLOT`` is
+    already set in its workers and the full id can be checked here.
+    """
+    if environ.get("STRING_ID_WORKER_ID") or (
+        environ.get("POD_INDEX") and environ.get("GUNICORN_WORKER_SLOT")
+    ):
+        try:
+            worker_id_from_environment(environ)
+        except ValueError as exc:
+            raise RuntimeError(str(exc)) from exc
+        return
+    if environ.get("POD_INDEX") or environ.get("STRING_ID_LEASE_URL"):
+        return
+    raise RuntimeError(
+        "STRING_ID_GENERATOR=snowflake needs STRING_ID_WORKER_ID, POD_INDEX "
+        "(StatefulSet) or STRING_ID_LEASE_URL"
+    )
+
+
+class SnowflakeIdGenerator:
+    """Time-ordered 64-bit ids generated without a database round trip.
+
+    Each id is ``timestamp | worker id | sequence``. Worker ids are set
+    explicitly, derived from a StatefulSet pod index and gunicorn slot, or
+    leased; one worker never reuses a millisecond and sequence pair, so ids
+    are unique as long as worker ids are. Up to 4096 ids per millisecond per
+    worker; a bigger burst waits for the next millisecond. Has the same ``allocate``
+    interface as the database-backed ``StringIdAllocator``.
+    """
+
+    def __init__(
+        self,
+        worker_id: Optional[int] = None,
+        epoch_ms: int = SNOWFLAKE_EPOCH_MS,
+        clock: Optional[Callable[[], int]] = None,
+        lease: Optional[WorkerIdLease] = None,
+    ):
+        if worker_id is not None and not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"worker_id must be between 0 and {MAX_WORKER_ID}")
+        self._worker_id = worker_id
+        self.lease = lease
+        self.epoch_ms = epoch_ms
+        self.clock = clock or _now_ms
+        self._last_ms = -1
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    @property
+    def worker_id(self) -> int:
+        # Resolved on first use, after gunicorn has forked the worker
+        if self._worker_id is None and self.lease is None:
+            fixed = os.getenv("STRING_ID_WORKER_ID") or os.getenv("POD_INDEX")
+            if fixed or not STRING_ID_LEASE_URL:
+                self._worker_id = worker_id_from_environment()
+            else:
+                self.lease = WorkerIdLease.from_url(STRING_ID_LEASE_URL)
+        if self._worker_id is None:
+            self._worker_id = self.lease.acquire()
+        if self.lease is not None and not self.lease.held:
+            raise RuntimeError("Lost the lease on this worker's Snowflake id")
+        return self._worker_id
+
+    def next_id(self) -> int:
+        return self.allocate(1)[0]
+
+    def allocate(self, n: int) -> List[int]:
+        ids: List[int] = []
+        with self._lock:
+            worker = self.worker_id << SEQUENCE_BITS
+            while len(ids) < n:
+                now = self._tick()
+                base = (now - self.epoch_ms) << (WORKER_ID_BITS + SEQUENCE_BITS)
+                take = min(n - len(ids), MAX_SEQUENCE + 1 - self._sequence)
+                first = base | worker | self._sequence
+                ids.extend(range(first, first + take))
+                self._sequence += take
+        return ids
+
+    def _tick(self) -> int:
+        """Current millisecond with sequence numbers left in it"""
+        now = self.clock()
+        if now < self._last_ms:
+            # The clock was stepped back; reusing a millisecond could
+            # repeat ids, so wait until it passes the last one again
+            if self._last_ms - now > MAX_CLOCK_ROLLBACK_MS:
+                raise RuntimeError(
+                    f"Clock moved back {self._last_ms - now} ms; refusing to "
+                    f"generate ids"
+                )
+        while now < self._last_ms or (
+            now == self._last_ms and self._sequence > MAX_SEQUENCE
+        ):
+            time.sleep(0.0001)
+            now = self.clock()
+
+        if now != self._last_ms:
+            self._last_ms = now
+            self._sequence = 0
+        return now
+
+    def timestamp_ms(self, id_: int) -> int:
+        """Unix time in milliseconds at which ``id_`` was generated"""
+        return (id_ >> (WORKER_ID_BITS + SEQUENCE_BITS)) + self.epoch_ms
+
+
+snowflake_id_generator = SnowflakeIdGenerator()
@@ -0,0 +1,119 @@
+import csv
+import heapq
+import io
+import itertools
+import json
+from typing import Iterator, Optional
+
+from sqlalchemy import select
+
+from src.core.metrics import STRINGS_EXPORTED
+from src.core.models.string import String
+from src.core.sharding import each_shard
+from src.factory import db
+
+# Rows read per keyset chunk; each chunk is one short read transaction
+EXPORT_CHUNK_SIZE = 5000
+# Rows the driver fetches from the server-side cursor at a time
+EXPORT_FETCH_SIZE = 500
+
+CSV_HEADER = ("id", "value", "created_at")
+
+
+class StringExportService:
+    """Streams the strings table as NDJSON or CSV.
+
+    Rows are read in primary-key order with ``WHERE id > :last_id LIMIT n``
+    chunks. Each chunk is fetched through a server-side cursor, encoded into
+    a text buffer, and its transaction is ended before the buffer is handed
+    to the client, so a slow download never holds a transaction or more than
+    one encoded chunk in memory. The export stops at the highest id present
+    when it started; rows saved later are picked up by the next export with
+    ``since_id``. Sharded strings are merged from every shard in id order.
+    """
+
+    def __init__(self, chunk_size=None, fetch_size=None):
+        self.chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+        self.fetch_size = fetch_size or EXPORT_FETCH_SIZE
+
+    def upper_bound(self, since_id: int = 0) -> Optional[int]:
+        """Highest id an export started now would include"""
+        upto_id = None
+        for _ in each_shard():
+            highest = db.session.query(db.func.max(String.id)).scalar()
+            if highest is not None:
+                upto_id = max(upto_id or highest, highest)
+        db.session.rollback()
+        if upto_id is None or upto_id <= since_id:
+            return None
+        return upto_id
+
+    def stream(
+        self, fmt: str, since_id: int = 0, upto_id: Optional[int] = None
+    ) -> Iterator[str]:
+        """Yield the export in chunks of encoded text"""
+        if fmt == "csv":
+            buffer = io.StringIO()
+            csv.writer(buffer).writerow(CSV_HEADER)
+            yield buffer.getvalue()
+
+        if upto_id is None:
+            return
+
+        last_id = since_id
+        while last_id < upto_id:
+            buffer = io.StringIO()
+            count, last_id = self._encode_chunk(fmt, buffer, last_id, upto_id)
+            if not count:
+                break
+            STRINGS_EXPORTED.labels(format=fmt).inc(count)
+            yield buffer.getvalue()
+
+    def _encode_chunk(self, fmt, buffer, last_id, upto_id):
+        columns = String.__table__.c
+        statement = (
+            select(columns.id, columns.value, columns.created_at)
+            .where(columns.id > last_id, columns.id <= upto_id)
+            .order_by(columns.id)
+            .limit(self.chunk_size)
+        )
+        writer = csv.writer(buffer) if fmt == "csv" else None
+        count = 0
+
+        try:
+            # With shards, each shard streams its next rows in id order and
+            # the streams are merged
+            results = [
+                db.session.execute(
+                    statement, execution_options={"stream_results": True}
+                ).yield_per(self.fetch_size)
+                for _ in each_shard()
+            ]
+            rows = heapq.merge(*results, key=lambda row: row.id)
+
+            for row in itertools.islice(rows, self.chunk_size):
+                created_at = row.created_at.isoformat() if row.created_at else None
+                if writer is not None:
+                    writer.writerow((row.id, row.value, created_at or ""))
+                else:
+                    buffer.write(
+                        json.dumps(
+                            {
+                                "id": row.id,
+                                "value": row.value,
+                                "created_at": created_at,
+                            },
+                            ensure_ascii=False,
+                        )
+                    )
+                    buffer.write("\n")
+                count += 1
+                last_id = row.id
+        finally:
+            # Read-only; ends the transaction before the chunk is sent
+            db.session.rollback()
+
+        return count, last_id
+
+
+string_export_service = StringExportService()
@@ -0,0 +1,92 @@
+import os
+import threading
+from typing import List
+
+from sqlalchemy.exc import IntegrityError
+
+from src.core.models.string import String, StringIdSequence
+from src.core.sharding import get_shards
+from src.factory import db
+
+# Ids reserved from the primary per round trip. Ids left in a block when a
+# worker exits are skipped, so a larger block means fewer round trips but
+# bigger gaps.
+STRING_ID_BLOCK_SIZE = int(os.getenv("STRING_ID_BLOCK_SIZE", "1000"))
+
+SEQUENCE_NAME = "strings"
+
+
+class StringIdAllocator:
+    """Hands out globally unique string ids for sharded inserts.
+
+    Blocks of ids are reserved from ``string_id_sequences`` on the primary
+    in a short transaction of their own and then served from memory. The
+    sequence starts above the highest id on any shard, so sharding an
+    existing table keeps its ids.
+    """
+
+    def __init__(self, block_size=None):
+        self.block_size = block_size or STRING_ID_BLOCK_SIZE
+        self._next = 0
+        self._end = 0
+        self._lock = threading.Lock()
+
+    def allocate(self, n: int) -> List[int]:
+        ids: List[int] = []
+        with self._lock:
+            while len(ids) < n:
+                if self._next >= self._end:
+                    self._next, self._end = self._reserve(
+                        max(self.block_size, n - len(ids))
+                    )
+                take = min(n - len(ids), self._end - self._next)
+                ids.extend(range(self._next, self._next + take))
+                self._next += take
+        return ids
+
+    def reset(self):
+        """Drop the ids reserved by this process"""
+        with self._lock:
+            self._next = self._end = 0
+
+    def _reserve(self, size: int):
+        table = StringIdSequence.__table__
+        name = table.c.name == SEQUENCE_NAME
+
+        while True:
+            # UPDATE first so the row is locked before it is read back
+            with db.engine.begin() as connection:
+                result = connection.execute(
+                    table.update().where(name).values(next_id=table.c.next_id + size)
+                )
+                if result.rowcount:
+                    end = connection.execute(
+                        db.select(table.c.next_id).where(name)
+                    ).scalar()
+                    return end - size, end
+
+            start = self._highest_id() + 1
+            try:
+                with db.engine.begin() as connection:
+                    connection.execute(
+                        table.insert().values(name=SEQUENCE_NAME, next_id=start + size)
+                    )
+                return start, start + size
+            except IntegrityError:
+                # Another worker created the sequence first; reserve from it
+                continue
+
+    def _highest_id(self) -> int:
+        # Own connections, so the request's session transaction is untouched.
+        # The primary counts too: it may still hold rows from before sharding.
+        highest = 0
+        for key in [None, *(get_shards() or [])]:
+            with db.get_engine(bind=key).connect() as connection:
+                highest = max(
+                    highest,
+                    connection.execute(db.select(db.func.max(String.id))).scalar() or 0,
+                )
+        return highest
+
+
+string_id_allocator = StringIdAllocator()
@@ -0,0 +1,117 @@
+import json
+import logging
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from src.core.metrics import STRINGS_SAVED
+from src.core.schemas.strings import StringCreateSchema, StringImportLineErrorSchema
+from src.core.services.string_write_service import string_write_service
+from src.factory import db
+
+# Valid strings buffered before a multi-row insert and commit
+IMPORT_CHUNK_SIZE = 1000
+# A line holds one {"string": ...} object of at most 1000 characters; even
+# fully \u-escaped that is well below 16 KiB
+IMPORT_MAX_LINE_BYTES = 16 * 1024
+# Only the first errors are reported so memory stays bounded on bad input
+IMPORT_MAX_REPORTED_ERRORS = 100
+
+logger = logging.getLogger(__name__)
+
+
+class StringImport:
+    """Progress of one NDJSON import"""
+
+    def __init__(self):
+        self.lines = 0
+        self.saved = 0
+        self.failed = 0
+        self.errors: List[StringImportLineErrorSchema] = []
+
+
+class StringImportService:
+    """Streams NDJSON from a file-like object into the strings table.
+
+    The body is read one bounded line at a time and valid strings are
+    inserted and committed every ``chunk_size`` rows, so memory use does not
+    depend on the size of the upload. Each chunk is its own transaction; if
+    the import fails part way, the strings committed so far are kept and
+    reported in ``saved``.
+    """
+
+    def __init__(self, chunk_size=None, max_line_bytes=None, max_errors=None):
+        self.chunk_size = chunk_size or IMPORT_CHUNK_SIZE
+        self.max_line_bytes = max_line_bytes or IMPORT_MAX_LINE_BYTES
+        self.max_errors = (
+            IMPORT_MAX_REPORTED_ERRORS if max_errors is None else max_errors
+        )
+
+    def run(self, stream: BinaryIO, progress: Optional[StringImport] = None):
+        progress = progress or StringImport()
+        pending: List[str] = []
+
+        for line_number, line in self._iter_lines(stream):
+            progress.lines = line_number
+            if line is None:
+                self._reject(
+                    progress,
+                    line_number,
+                    f"Line exceeds {self.max_line_bytes} bytes",
+                )
+                continue
+            if not line.strip():
+                continue
+
+            try:
+                value = StringCreateSchema.model_validate(json.loads(line)).string
+            except (ValueError, ValidationError) as e:
+                # json.JSONDecodeError and UnicodeDecodeError are ValueErrors
+                self._reject(progress, line_number, str(e))
+                continue
+
+            pending.append(value)
+            if len(pending) >= self.chunk_size:
+                self._flush(pending, progress)
+
+        if pending:
+            self._flush(pending, progress)
+
+        return progress
+
+    def _flush(self, pending: List[str], progress: StringImport):
+        string_write_service.insert_many(pending)
+        db.session.commit()
+
+        progress.saved += len(pending)
+        STRINGS_SAVED.inc(len(pending))
+        logger.info(f"Imported {progress.saved} strings after {progress.lines} lines")
+        pending.clear()
+
+    def _reject(self, progress: StringImport, line_number: int, message: str):
+        progress.failed += 1
+        if len(progress.errors) < self.max_errors:
+            progress.errors.append(
+                StringImportLineErrorSchema(line=line_number, message=message)
+            )
+
+    def _iter_lines(self, stream: BinaryIO) -> Iterator[Tuple[int, Optional[bytes]]]:
+        """Yield ``(line_number, line)``; ``line`` is None if it was too long"""
+        line_number = 0
+        while True:
+            line = stream.readline(self.max_line_bytes + 1)
+            if not line:
+                return
+
+            line_number += 1
+            if len(line) > self.max_line_bytes and not line.endswith(b"\n"):
+                # Skip the rest of the oversized line without buffering it
+                while line and not line.endswith(b"\n"):
+                    line = stream.readline(self.max_line_bytes)
+                yield line_number, None
+                continue
+
+            yield line_number, line
+
+
+string_import_service = StringImportService()
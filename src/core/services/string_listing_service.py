@@ -0,0 +1,151 @@
+import base64
+import binascii
+import json
+import os
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from src.core.models.string import String
+from src.core.sharding import get_shards, on_shard
+from src.factory import db
+
+# Seconds a cached row count may be served before it is recounted
+STRINGS_COUNT_TTL = float(os.getenv("STRINGS_COUNT_TTL", "60"))
+
+# Bounds of the BIGINT id column; ids outside them fail in the driver
+MIN_ID, MAX_ID = -(2**63), 2**63 - 1
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor can't be decoded"""
+
+
+def encode_cursor(payload: dict) -> str:
+    """Wrap a cursor payload in an opaque URL-safe token"""
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError):
+        raise InvalidCursorError("Invalid cursor")
+
+    if not isinstance(payload, dict):
+        raise InvalidCursorError("Invalid cursor")
+    return payload
+
+
+def cursor_id(value) -> int:
+    """The id stored in a cursor, which must be an integer a BIGINT can hold"""
+    # bool is an int subclass; a cursor never stores one
+    if type(value) is not int or not MIN_ID <= value <= MAX_ID:
+        raise InvalidCursorError("Invalid cursor")
+    return value
+
+
+class CachedRowCount:
+    """Row count of the strings table, recounted at most once per ``ttl``.
+
+    Counts one ``shard`` if given, otherwise every shard together.
+    """
+
+    def __init__(self, ttl=None, shard=None):
+        self.ttl = STRINGS_COUNT_TTL if ttl is None else ttl
+        self.shard = shard
+        self._value: Optional[int] = None
+        self._counted_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> int:
+        with self._lock:
+            if self._value is not None and (
+                time.monotonic() - self._counted_at < self.ttl
+            ):
+                return self._value
+
+        value = self._count()
+        with self._lock:
+            self._value = value
+            self._counted_at = time.monotonic()
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._value = None
+
+    def _count(self) -> int:
+        shards = [self.shard] if self.shard is not None else get_shards()
+        if not shards:
+            return db.session.query(String).count()
+
+        total = 0
+        for key in shards:
+            with on_shard(key):
+                total += db.session.query(String).count()
+        return total
+
+
+class StringListingService:
+    """Keyset pagination over the strings table.
+
+    Pages are ``WHERE id > :last_id ORDER BY id LIMIT n`` range scans on the
+    primary key, so a deep page costs the same as the first one. Cursors are
+    opaque tokens wrapping the last id served and the sort order.
+    """
+
+    def __init__(self, row_count=None):
+        self.row_count = row_count or CachedRowCount()
+
+    def page(
+        self, cursor: Optional[str], limit: int, order: str = "asc"
+    ) -> Tuple[List[String], Optional[str]]:
+        """Return the rows after ``cursor`` and the cursor for the next page"""
+        last_id = self._last_id(cursor, order) if cursor else None
+
+        # One extra row tells whether another page follows
+        shards = get_shards()
+        if shards is None:
+            rows = self._rows(last_id, limit + 1, order)
+        else:
+            # Each shard's first rows after the cursor hold the merged page
+            rows = []
+            for key in shards:
+                with on_shard(key):
+                    rows.extend(self._rows(last_id, limit + 1, order))
+            rows.sort(key=lambda row: row.id, reverse=order == "desc")
+            rows = rows[: limit + 1]
+
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        return rows, encode_cursor({"id": rows[-1].id, "order": order})
+
+    def _rows(self, last_id: Optional[int], limit: int, order: str) -> List[String]:
+        query = db.session.query(String)
+        if order == "desc":
+            if last_id is not None:
+                query = query.filter(String.id < last_id)
+            query = query.order_by(String.id.desc())
+        else:
+            if last_id is not None:
+                query = query.filter(String.id > last_id)
+            query = query.order_by(String.id)
+        return query.limit(limit).all()
+
+    def _last_id(self, cursor: str, order: str) -> int:
+        payload = decode_cursor(cursor)
+        if payload.get("order") != order:
+            raise InvalidCursorError("Invalid cursor")
+        return cursor_id(payload.get("id"))
+
+    def total(self) -> int:
+        """Cached, possibly slightly stale, number of stored strings"""
+        return self.row_count.get()
+
+
+string_listing_service = StringListingService()
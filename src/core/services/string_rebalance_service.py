@@ -0,0 +1,103 @@
+import os
+import time
+from collections import defaultdict
+from typing import Callable, Optional
+
+from sqlalchemy import select
+
+from src.core.models.string import String, content_hash
+from src.core.sharding import get_shards, on_shard
+from src.factory import db
+
+STRINGS_REBALANCE_BATCH_SIZE = int(os.getenv("STRINGS_REBALANCE_BATCH_SIZE", "1000"))
+STRINGS_REBALANCE_PAUSE_MS = float(os.getenv("STRINGS_REBALANCE_PAUSE_MS", "100"))
+
+
+class StringRebalanceService:
+    """Moves strings onto the shard their content hash maps to.
+
+    Run it after changing the shard list. Every shard is walked in primary
+    key order, ``batch_size`` rows at a time. Misplaced rows are copied to
+    their shard with the same id and committed there before they are
+    deleted from the source, so a crash leaves at worst a duplicate that
+    the next run cleans up; copies skip ids the target already has.
+    """
+
+    def __init__(self, batch_size=None, pause_ms=None):
+        self.batch_size = batch_size or STRINGS_REBALANCE_BATCH_SIZE
+        self.pause_ms = STRINGS_REBALANCE_PAUSE_MS if pause_ms is None else pause_ms
+
+    def run(self, progress: Optional[Callable[[str, int], None]] = None) -> int:
+        """Move misplaced rows and return how many were moved"""
+        shards = get_shards()
+        if shards is None:
+            raise ValueError("Strings are not sharded")
+
+        moved = 0
+        for source in shards:
+            moved += self._drain(shards, source, progress)
+        return moved
+
+    def _drain(self, shards, source, progress) -> int:
+        table = String.__table__
+        columns = (table.c.id, table.c.value, table.c.created_at)
+        last_id = 0
+        moved = 0
+
+        while True:
+            with on_shard(source):
+                rows = db.session.execute(
+                    select(*columns)
+                    .where(table.c.id > last_id)
+                    .order_by(table.c.id)
+                    .limit(self.batch_size)
+                ).all()
+            db.session.commit()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            targets = defaultdict(list)
+            for row in rows:
+                target = shards.shard_for(row.value)
+                if target != source:
+                    targets[target].append(row)
+
+            for target, group in targets.items():
+                ids = [row.id for row in group]
+                with on_shard(target):
+                    present = set(
+                        db.session.execute(
+                            select(table.c.id).where(table.c.id.in_(ids))
+                        ).scalars()
+                    )
+                    copies = [
+                        {
+                            "id": row.id,
+                            "value": row.value,
+                            "value_hash": content_hash(row.value),
+                            "created_at": row.created_at,
+                        }
+                        for row in group
+                        if row.id not in present
+                    ]
+                    if copies:
+                        db.session.execute(table.insert(), copies)
+                db.session.commit()
+
+                with on_shard(source):
+                    db.session.execute(table.delete().where(table.c.id.in_(ids)))
+                db.session.commit()
+                moved += len(group)
+
+            if progress is not None:
+                progress(source, moved)
+            if len(rows) < self.batch_size:
+                break
+            if self.pause_ms:
+                time.sleep(self.pause_ms / 1000)
+
+        return moved
+
+
+string_rebalance_service = StringRebalanceService()
@@ -0,0 +1,157 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Mapping, Optional
+
+from src.core.metrics import RETENTION_BATCH_DURATION, STRINGS_PURGED
+from src.core.models.string import String
+from src.core.sharding import each_shard
+from src.factory import db
+
+# Strings older than this many days are purged; 0 keeps strings forever
+STRINGS_RETENTION_DAYS = float(os.getenv("STRINGS_RETENTION_DAYS", "0"))
+STRINGS_RETENTION_BATCH_SIZE = int(os.getenv("STRINGS_RETENTION_BATCH_SIZE", "1000"))
+# Pause between batches so replicas keep up and other writers get the locks
+STRINGS_RETENTION_PAUSE_MS = float(os.getenv("STRINGS_RETENTION_PAUSE_MS", "100"))
+# Run the purge periodically inside the app. Under gunicorn only the worker
+# in slot 0 runs it; concurrent purges are safe but do redundant work.
+STRINGS_RETENTION_SCHEDULE_ENABLED = (
+    os.getenv("STRINGS_RETENTION_SCHEDULE_ENABLED", "false").lower() == "true"
+)
+STRINGS_RETENTION_INTERVAL = float(os.getenv("STRINGS_RETENTION_INTERVAL", "3600"))
+
+logger = logging.getLogger(__name__)
+
+
+class StringRetentionService:
+    """Deletes strings older than ``max_age_days`` in small batches.
+
+    Each batch selects up to ``batch_size`` expired ids in primary-key order
+    and deletes them by primary key in its own short transaction, then
+    sleeps ``pause_ms``. No statement scans or locks more than one batch of
+    rows, and the pause bounds the write rate seen by replicas.
+    ``created_at`` is compared against UTC, which is what the database
+    stores for ``CURRENT_TIMESTAMP`` with the default server time zone.
+    """
+
+    def __init__(self, max_age_days=None, batch_size=None, pause_ms=None):
+        self.max_age_days = (
+            STRINGS_RETENTION_DAYS if max_age_days is None else max_age_days
+        )
+        self.batch_size = batch_size or STRINGS_RETENTION_BATCH_SIZE
+        self.pause_ms = STRINGS_RETENTION_PAUSE_MS if pause_ms is None else pause_ms
+
+    def cutoff(self, now: Optional[datetime] = None) -> datetime:
+        return (now or datetime.utcnow()) - timedelta(days=self.max_age_days)
+
+    def count_expired(self, now: Optional[datetime] = None) -> int:
+        """Number of rows the next purge would delete"""
+        cutoff = self.cutoff(now)
+        total = 0
+        for _ in each_shard():
+            total += db.session.query(String).filter(String.created_at < cutoff).count()
+        return total
+
+    def purge(
+        self, now: Optional[datetime] = None, max_batches: Optional[int] = None
+    ) -> int:
+        """Delete expired rows and return how many were deleted.
+
+        With sharded strings the shards are purged one after another and
+        ``max_batches`` applies to each shard.
+        """
+        if self.max_age_days <= 0:
+            raise ValueError("Retention is disabled; max_age_days must be positive")
+
+        # Fixed at the start so a long purge doesn't chase its own tail
+        cutoff = self.cutoff(now)
+        return sum(self._purge(cutoff, max_batches) for _ in each_shard())
+
+    def _purge(self, cutoff: datetime, max_batches: Optional[int]) -> int:
+        table = String.__table__
+        last_id = 0
+        purged = 0
+        batches = 0
+
+        while max_batches is None or batches < max_batches:
+            start = time.perf_counter()
+            ids = [
+                row.id
+                for row in db.session.query(String.id)
+                .filter(String.id > last_id, String.created_at < cutoff)
+                .order_by(String.id)
+                .limit(self.batch_size)
+            ]
+            if ids:
+                db.session.execute(table.delete().where(table.c.id.in_(ids)))
+            db.session.commit()
+            RETENTION_BATCH_DURATION.observe(time.perf_counter() - start)
+
+            if not ids:
+                break
+
+            STRINGS_PURGED.inc(len(ids))
+            purged += len(ids)
+            batches += 1
+            last_id = ids[-1]
+
+            if len(ids) < self.batch_size:
+                break
+            if self.pause_ms:
+                time.sleep(self.pause_ms / 1000)
+
+        return purged
+
+
+def runs_scheduled_purge(environ: Mapping[str, str] = os.environ) -> bool:
+    """Whether this process is the one of its pod that runs the schedule.
+
+    That is the gunicorn worker in slot 0 (see ``gunicorn.conf.py``); a
+    worker that replaces it gets the same slot. A process outside gunicorn
+    runs it too.
+    """
+    return environ.get("GUNICORN_WORKER_SLOT", "0") == "0"
+
+
+class RetentionScheduler:
+    """Runs a retention purge every ``interval`` seconds on a daemon thread"""
+
+    def __init__(self, service=None, interval=None):
+        self.service = service or string_retention_service
+        self.interval = interval or STRINGS_RETENTION_INTERVAL
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, app):
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(app,),
+            name="string-retention",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self, app):
+        while not self._stopped.wait(self.interval):
+            with app.app_context():
+                try:
+                    purged = self.service.purge()
+                    logger.info(f"Retention purge deleted {purged} strings")
+                except Exception as e:
+                    db.session.rollback()
+                    logger.error(f"Retention purge failed: {e}")
+
+
+string_retention_service = StringRetentionService()
+retention_scheduler = RetentionScheduler()
@@ -0,0 +1,136 @@
+import math
+import re
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from src.core.services.string_listing_service import (
+    InvalidCursorError,
+    cursor_id,
+    decode_cursor,
+    encode_cursor,
+)
+from src.core.sharding import get_shards, on_shard
+from src.factory import db
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# Both engines rank in a subquery so the keyset condition can refer to the
+# score; higher scores are better and ties are broken by descending id.
+_MYSQL_HITS = """
+    SELECT id, value, created_at,
+           MATCH(value) AGAINST (:q IN NATURAL LANGUAGE MODE) AS score
+    FROM strings
+    WHERE MATCH(value) AGAINST (:q IN NATURAL LANGUAGE MODE)
+"""
+
+# bm25() is lower-is-better, so it is negated to match MySQL's relevance
+_SQLITE_HITS = """
+    SELECT strings.id, strings.value, strings.created_at,
+           -bm25(strings_fts) AS score
+    FROM strings_fts JOIN strings ON strings.id = strings_fts.rowid
+    WHERE strings_fts MATCH :q
+"""
+
+# Other engines have no index here; rows are scored by the words they contain
+_LIKE_HITS = """
+    SELECT id, value, created_at, {score} AS score
+    FROM strings
+    WHERE {match}
+"""
+
+
+class StringSearchService:
+    """Ranked full-text search over stored strings.
+
+    Uses the ``ft_strings_value`` FULLTEXT index on MySQL and the
+    ``strings_fts`` FTS5 table on SQLite. Other databases fall back to a
+    LIKE scan of the table, ranked by the number of query words a string
+    contains. Results are ordered by relevance
+    and paginated with a ``(score, id)`` keyset cursor. With sharded strings
+    every shard is searched and the hits are merged; each shard scores
+    against its own index statistics, which is close enough when rows are
+    spread evenly.
+    """
+
+    def search(
+        self, q: str, cursor: Optional[str], limit: int
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Return a page of ``{id, value, created_at, score}`` rows"""
+        after = self._after(cursor) if cursor else None
+        hits, params = self._hits_query(db.session.connection().dialect.name, q)
+        if not params or not all(params.values()):
+            return [], None
+
+        params["limit"] = limit + 1
+        keyset = ""
+        if after is not None:
+            keyset = (
+                "WHERE score < :after_score "
+                "OR (score = :after_score AND id < :after_id)"
+            )
+            params.update(after_score=after[0], after_id=after[1])
+
+        statement = text(
+            f"SELECT id, value, created_at, score FROM ({hits}) AS hits "
+            f"{keyset} ORDER BY score DESC, id DESC LIMIT :limit"
+        )
+        shards = get_shards()
+        if shards is None:
+            rows = self._hits(statement, params)
+        else:
+            rows = []
+            for key in shards:
+                with on_shard(key):
+                    rows.extend(self._hits(statement, params))
+            rows.sort(key=lambda row: (row["score"], row["id"]), reverse=True)
+            rows = rows[: limit + 1]
+
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, encode_cursor({"score": last["score"], "id": last["id"]})
+
+    def _hits(self, statement, params) -> List[dict]:
+        return [dict(row) for row in db.session.execute(statement, params).mappings()]
+
+    def _hits_query(self, dialect: str, q: str) -> Tuple[str, Dict[str, str]]:
+        """The ranked hits subquery for ``dialect`` and its parameters"""
+        if dialect == "mysql":
+            return _MYSQL_HITS, {"q": q}
+        if dialect == "sqlite":
+            return _SQLITE_HITS, {"q": self._fts5_query(q)}
+
+        # Words are \w+, so only "_" is a LIKE wildcard to escape
+        params = {
+            f"word_{i}": "%" + token.replace("_", "!_") + "%"
+            for i, token in enumerate(_TOKEN.findall(q))
+        }
+        matches = [f"value LIKE :{name} ESCAPE '!'" for name in params]
+        score = " + ".join(f"CASE WHEN {match} THEN 1 ELSE 0 END" for match in matches)
+        hits = _LIKE_HITS.format(score=score or "0", match=" OR ".join(matches))
+        return hits, params
+
+    def _after(self, cursor: str) -> Tuple[float, int]:
+        payload = decode_cursor(cursor)
+        score = payload.get("score")
+        if (
+            isinstance(score, bool)
+            or not isinstance(score, (int, float))
+            or not math.isfinite(score)
+        ):
+            raise InvalidCursorError("Invalid cursor")
+        return score, cursor_id(payload.get("id"))
+
+    def _fts5_query(self, q: str) -> str:
+        """Quote each word so user input can't use FTS5 query syntax.
+
+        Words are ORed, like MySQL's natural language mode, and bm25 ranks
+        rows matching more of them higher.
+        """
+        return " OR ".join(f'"{token}"' for token in _TOKEN.findall(q))
+
+
+string_search_service = StringSearchService()
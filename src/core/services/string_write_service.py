@@ -0,0 +1,186 @@
+import os
+from typing import Dict, List, Optional
+
+from flask import current_app
+
+from src.core.models.string import String, content_hash
+from src.core.services.snowflake_id_generator import (
+    SnowflakeIdGenerator,
+    snowflake_id_generator,
+)
+from src.core.services.string_id_allocator import string_id_allocator
+from src.core.sharding import get_shards, on_shard
+from src.factory import db
+
+# Rows per multi-row INSERT statement. Keeps statements well under MySQL's
+# max_allowed_packet for 1000-character strings.
+BULK_INSERT_CHUNK_SIZE = 500
+# When enabled, saving a value that is already stored returns the existing id
+STRINGS_DEDUP_ENABLED = os.getenv("STRINGS_DEDUP_ENABLED", "false").lower() == "true"
+# Where string ids come from: "sequence" leaves them to the database, either
+# auto-increment or, when sharded, blocks of string_id_sequences; "snowflake"
+# generates them in each worker without any round trip
+STRING_ID_GENERATOR = os.getenv("STRING_ID_GENERATOR", "sequence").lower()
+
+
+class StringWriteService:
+    """Multi-row inserts into the strings table.
+
+    When strings are sharded, values are inserted on their shard with ids
+    from the global id allocator. With Snowflake ids, rows are always
+    inserted with ids generated in the worker.
+
+    Methods run on ``db.session`` unless given another ``session``.
+    """
+
+    def __init__(self, chunk_size=None, deduplicate=None, id_allocator=None):
+        self.chunk_size = chunk_size or BULK_INSERT_CHUNK_SIZE
+        self.deduplicate = STRINGS_DEDUP_ENABLED if deduplicate is None else deduplicate
+        if id_allocator is None:
+            id_allocator = (
+                snowflake_id_generator
+                if STRING_ID_GENERATOR == "snowflake"
+                else string_id_allocator
+            )
+        self.id_allocator = id_allocator
+
+    @property
+    def sharded(self) -> bool:
+        return get_shards() is not None
+
+    @property
+    def assigns_ids(self) -> bool:
+        """Whether rows are inserted with ids chosen before the insert"""
+        return self.sharded or isinstance(self.id_allocator, SnowflakeIdGenerator)
+
+    def save_many(self, values: List[str]) -> List[int]:
+        """Insert ``values``, commit them and return their ids in order.
+
+        With ``SQLALCHEMY_SHARD_TWO_PHASE`` a write that spans shards runs
+        in a session of its own that prepares every shard before
+        committing (XA), so it is saved on all of them or on none. Other
+        writes commit ``db.session`` as usual; XA is never used for them.
+        """
+        shards = get_shards()
+        if (
+            shards is None
+            or not current_app.config.get("SQLALCHEMY_SHARD_TWO_PHASE")
+            or len(shards.partition(values)) < 2
+        ):
+            ids = self.insert_many(values)
+            db.session.commit()
+            return ids
+
+        session = self._two_phase_session()
+        try:
+            ids = self.insert_many(values, session)
+            session.commit()
+            return ids
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def insert_many(self, values: List[str], session=None) -> List[int]:
+        """Insert ``values`` and return their ids in the same order.
+
+        Each chunk is a single ``INSERT ... VALUES (...), (...)`` statement.
+        A multi-row insert with a known row count is a "simple insert" for
+        InnoDB, which allocates its auto-increment ids as one consecutive
+        block, so the ids can be derived from the cursor's ``lastrowid``.
+        In deduplicate mode values that are already stored, or repeated in
+        ``values``, are inserted at most once and share an id.
+        The caller owns the transaction and must commit or roll back.
+        """
+        session = session or db.session
+        if not self.deduplicate:
+            return self._insert(values, session)
+
+        known = self.existing_ids(values, session)
+        new_values = list(dict.fromkeys(v for v in values if v not in known))
+        known.update(zip(new_values, self._insert(new_values, session)))
+        return [known[value] for value in values]
+
+    def existing_ids(self, values: List[str], session=None) -> Dict[str, int]:
+        """Map each already stored value to its lowest id via the hash index"""
+        session = session or db.session
+        shards = get_shards()
+        if shards is None:
+            return self._existing_ids(values, session)
+
+        found: Dict[str, int] = {}
+        for key, group in shards.partition(values).items():
+            with on_shard(key):
+                found.update(self._existing_ids(group, session))
+        return found
+
+    def find_id(self, value: str) -> Optional[int]:
+        return self.existing_ids([value]).get(value)
+
+    def _existing_ids(self, values: List[str], session) -> Dict[str, int]:
+        found: Dict[str, int] = {}
+        hashes = list({content_hash(value) for value in values})
+
+        for start in range(0, len(hashes), self.chunk_size):
+            rows = (
+                session.query(String.id, String.value)
+                .filter(String.value_hash.in_(hashes[start : start + self.chunk_size]))
+                .order_by(String.id)
+            )
+            for string_id, value in rows:
+                # Compare values as well so a hash collision can't match
+                found.setdefault(value, string_id)
+
+        return {value: found[value] for value in values if value in found}
+
+    def _insert(self, values: List[str], session) -> List[int]:
+        if self.assigns_ids:
+            return self._insert_with_ids(values, session)
+
+        ids: List[int] = []
+        table = String.__table__
+
+        for start in range(0, len(values), self.chunk_size):
+            chunk = values[start : start + self.chunk_size]
+            result = session.execute(
+                table.insert().values([{"value": value} for value in chunk])
+            )
+            ids.extend(self._chunk_ids(result.lastrowid, len(chunk), session))
+
+        return ids
+
+    def _insert_with_ids(self, values: List[str], session) -> List[int]:
+        # Ids are known up front, so chunks don't wait on lastrowid
+        ids = self.id_allocator.allocate(len(values))
+        rows = [{"id": id_, "value": value} for id_, value in zip(ids, values)]
+
+        shards = get_shards()
+        if shards is None:
+            self._insert_rows(rows, session)
+            return ids
+
+        for key, group in shards.partition(rows, lambda row: row["value"]).items():
+            with on_shard(key):
+                self._insert_rows(group, session)
+
+        return ids
+
+    def _insert_rows(self, rows: List[dict], session):
+        table = String.__table__
+        for start in range(0, len(rows), self.chunk_size):
+            session.execute(
+                table.insert().values(rows[start : start + self.chunk_size])
+            )
+
+    def _chunk_ids(self, lastrowid: int, size: int, session) -> range:
+        # MySQL reports the first id of a multi-row insert, SQLite the last
+        if session.connection().dialect.name == "sqlite":
+            return range(lastrowid - size + 1, lastrowid + 1)
+        return range(lastrowid, lastrowid + size)
+
+    def _two_phase_session(self):
+        return db.create_session({"twophase": True})()
+
+
+string_write_service = StringWriteService()
@@ -0,0 +1,91 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from src.core.metrics import TOKEN_CACHE_REQUESTS, TOKEN_CACHE_SIZE
+from src.core.schemas.auth import TokenPayloadSchema
+
+# Verified access tokens kept per worker; 0 verifies every request
+TOKEN_CACHE_SIZE_LIMIT = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+
+class VerifiedTokenCache:
+    """LRU cache of access tokens that already passed ``jwt_required``.
+
+    A client sends the same access token with every request until it
+    expires, and each one costs a signature check, a JSON parse and the
+    payload's pydantic validation. Only tokens that passed all of those go
+    in, keyed by their SHA-256 digest so the tokens themselves aren't kept,
+    and an entry is dropped once the token's ``exp`` has passed. Tokens
+    without an ``exp`` are never cached. At most ``max_size`` tokens are
+    kept; the least recently used one makes room for a new one.
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        clock: Optional[Callable[[], float]] = None,
+    ):
+        self.max_size = TOKEN_CACHE_SIZE_LIMIT if max_size is None else max_size
+        self.clock = clock or time.time
+
+        self._entries: "OrderedDict[bytes, Tuple[TokenPayloadSchema, int]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[TokenPayloadSchema]:
+        """Payload of ``token`` if it was verified and hasn't expired"""
+        if self.max_size <= 0:
+            return None
+
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= self.clock():
+                del self._entries[key]
+                TOKEN_CACHE_SIZE.set(len(self._entries))
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        TOKEN_CACHE_REQUESTS.labels(result="miss" if entry is None else "hit").inc()
+        return None if entry is None else entry[0]
+
+    def put(self, token: str, token_data: TokenPayloadSchema):
+        """Remember a token that has just been fully verified"""
+        if self.max_size <= 0 or token_data.exp is None:
+            return
+        if token_data.exp <= self.clock():
+            return
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (token_data, token_data.exp)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            TOKEN_CACHE_SIZE.set(len(self._entries))
+
+    def discard(self, token: str):
+        with self._lock:
+            self._entries.pop(self._key(token), None)
+            TOKEN_CACHE_SIZE.set(len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            TOKEN_CACHE_SIZE.set(0)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+verified_token_cache = VerifiedTokenCache()
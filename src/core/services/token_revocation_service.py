@@ -0,0 +1,181 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from src.core.bloom_filter import BloomFilter
+from src.core.metrics import TOKEN_REVOCATION_CHECKS, TOKEN_REVOCATION_FILTER_SIZE
+from src.core.models.revoked_token import RevokedToken
+from src.factory import db
+
+REVOCATION_FILTER_CAPACITY = int(os.getenv("REVOCATION_FILTER_CAPACITY", "100000"))
+REVOCATION_FILTER_ERROR_RATE = float(os.getenv("REVOCATION_FILTER_ERROR_RATE", "0.001"))
+# Other workers honour a revocation within this many seconds
+REVOCATION_REFRESH_SECONDS = float(os.getenv("REVOCATION_REFRESH_SECONDS", "5"))
+# How often the filter is rebuilt to drop revocations of expired tokens
+REVOCATION_REBUILD_SECONDS = float(os.getenv("REVOCATION_REBUILD_SECONDS", "3600"))
+# A refresh rereads this far back, for revocations that committed after a
+# later one had already been seen
+REVOCATION_REFRESH_OVERLAP = timedelta(seconds=30)
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class TokenRevocationService:
+    """Revoked token ids in the database, fronted by a per-worker Bloom filter.
+
+    Almost every token checked was never revoked, and the filter answers
+    that from memory. Only ids the filter reports, revoked or a false
+    positive, are looked up in ``revoked_tokens``. The filter picks up new
+    rows every ``refresh_seconds`` with a query on ``revoked_at``, and is
+    rebuilt from the unexpired rows every ``rebuild_seconds``, since
+    entries can't be removed from it.
+    """
+
+    def __init__(
+        self,
+        capacity=None,
+        error_rate=None,
+        refresh_seconds=None,
+        rebuild_seconds=None,
+        clock: Optional[Callable[[], float]] = None,
+    ):
+        self.capacity = capacity or REVOCATION_FILTER_CAPACITY
+        self.error_rate = error_rate or REVOCATION_FILTER_ERROR_RATE
+        self.refresh_seconds = (
+            REVOCATION_REFRESH_SECONDS if refresh_seconds is None else refresh_seconds
+        )
+        self.rebuild_seconds = (
+            REVOCATION_REBUILD_SECONDS if rebuild_seconds is None else rebuild_seconds
+        )
+        self.clock = clock or time.monotonic
+
+        self._filter: Optional[BloomFilter] = None
+        self._seen_until: Optional[datetime] = None
+        self._refreshed_at = float("-inf")
+        self._rebuilt_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def revoke(self, jti: str, exp: int):
+        """Revoke the token ``jti``, which expires at Unix time ``exp``"""
+        expires_at = datetime.fromtimestamp(exp, timezone.utc).replace(tzinfo=None)
+        db.session.add(RevokedToken(jti=jti, expires_at=expires_at))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Already revoked
+            db.session.rollback()
+
+        # This worker honours it at once, the others on their next refresh
+        if self._filter is not None:
+            self._add(self._filter, jti)
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if jti is None:
+            # Issued before tokens had an id; they can only expire
+            return False
+
+        self._refresh_if_stale()
+        if jti not in self._filter:
+            TOKEN_REVOCATION_CHECKS.labels(result="clear").inc()
+            return False
+
+        revoked = (
+            db.session.query(RevokedToken.id).filter_by(jti=jti).first() is not None
+        )
+        TOKEN_REVOCATION_CHECKS.labels(
+            result="revoked" if revoked else "false_positive"
+        ).inc()
+        return revoked
+
+    def purge_expired(self, batch_size: int = 1000) -> int:
+        """Delete rows of tokens that have expired anyway"""
+        purged = 0
+        while True:
+            ids = [
+                row.id
+                for row in db.session.query(RevokedToken.id)
+                .filter(RevokedToken.expires_at <= _utcnow())
+                .limit(batch_size)
+            ]
+            if not ids:
+                return purged
+            db.session.query(RevokedToken).filter(RevokedToken.id.in_(ids)).delete(
+                synchronize_session=False
+            )
+            db.session.commit()
+            purged += len(ids)
+
+    def _refresh_if_stale(self):
+        now = self.clock()
+        if self._filter is None:
+            # Nothing can be answered before the first load, so wait for it
+            with self._lock:
+                if self._filter is None:
+                    self._rebuild(now)
+            return
+
+        if now - self._refreshed_at < self.refresh_seconds:
+            return
+        # One thread refreshes; the others keep using the current filter
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if (
+                now - self._rebuilt_at >= self.rebuild_seconds
+                or self._filter.count > self._filter.capacity
+            ):
+                self._rebuild(now)
+            else:
+                self._refresh(now)
+        except SQLAlchemyError as e:
+            logger.warning(f"Revoked token refresh failed: {str(e)}")
+            self._refreshed_at = now
+        finally:
+            self._lock.release()
+
+    def _rebuild(self, now: float):
+        rows = (
+            db.session.query(RevokedToken.jti)
+            .filter(RevokedToken.expires_at > _utcnow())
+            .all()
+        )
+        bloom = BloomFilter(max(self.capacity, 2 * len(rows)), self.error_rate)
+        for row in rows:
+            self._add(bloom, row.jti)
+
+        # Expired rows count too, or the next refresh would reread them
+        self._seen_until = db.session.query(
+            db.func.max(RevokedToken.revoked_at)
+        ).scalar()
+        self._filter = bloom
+        self._rebuilt_at = self._refreshed_at = now
+
+    def _refresh(self, now: float):
+        query = db.session.query(RevokedToken.jti, RevokedToken.revoked_at)
+        if self._seen_until is not None:
+            query = query.filter(
+                RevokedToken.revoked_at >= self._seen_until - REVOCATION_REFRESH_OVERLAP
+            )
+        for row in query:
+            self._add(self._filter, row.jti)
+            if self._seen_until is None or row.revoked_at > self._seen_until:
+                self._seen_until = row.revoked_at
+        self._refreshed_at = now
+
+    @staticmethod
+    def _add(bloom: BloomFilter, jti: str):
+        if jti not in bloom:
+            bloom.add(jti)
+            TOKEN_REVOCATION_FILTER_SIZE.set(bloom.count)
+
+
+token_revocation_service = TokenRevocationService()
@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event, orm
+
+from src.core.metrics import USER_CACHE_REQUESTS, USER_CACHE_SIZE
+from src.core.models.user import User
+
+USER_CACHE_SIZE_LIMIT = int(os.getenv("USER_CACHE_SIZE", "10000"))
+# Longest a worker serves a user that another worker changed or deleted;
+# changes made through this worker invalidate its entry at once
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+
+
+class CachedUser(NamedTuple):
+    id: str
+    email: str
+
+
+class UserCache:
+    """Per-worker LRU cache of the user fields the token endpoints need.
+
+    Entries expire ``ttl`` seconds after they were loaded. Every user has a
+    version that ``invalidate`` bumps; a load only stores its result if the
+    version didn't change while it ran, so a load that raced with an update
+    can't put the old row back.
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        ttl: Optional[float] = None,
+        clock: Optional[Callable[[], float]] = None,
+    ):
+        self.max_size = USER_CACHE_SIZE_LIMIT if max_size is None else max_size
+        self.ttl = USER_CACHE_TTL if ttl is None else ttl
+        self.clock = clock or time.monotonic
+
+        self._entries: "OrderedDict[str, Tuple[CachedUser, float]]" = OrderedDict()
+        # Bounded like the entries; a version only matters while a load of
+        # that user is running
+        self._versions: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> Optional[CachedUser]:
+        """The user with id ``user_id``, or None if there is none"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] <= self.clock():
+                del self._entries[user_id]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(user_id)
+            version = self._versions.get(user_id, 0)
+
+        if entry is not None:
+            USER_CACHE_REQUESTS.labels(result="hit").inc()
+            return entry[0]
+
+        USER_CACHE_REQUESTS.labels(result="miss").inc()
+        user = self._load(user_id)
+        if user is not None:
+            self._store(user, version)
+        return user
+
+    def put(self, user: User):
+        """Cache a user another path has just read, such as login"""
+        cached = CachedUser(str(user.id), user.email)
+        with self._lock:
+            version = self._versions.get(cached.id, 0)
+        self._store(cached, version)
+
+    def invalidate(self, user_id: str):
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._versions[user_id] = self._versions.pop(user_id, 0) + 1
+            while len(self._versions) > max(self.max_size, 1):
+                self._versions.popitem(last=False)
+            USER_CACHE_SIZE.set(len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            USER_CACHE_SIZE.set(0)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _load(self, user_id: str) -> Optional[CachedUser]:
+        user = User.query.filter_by(id=user_id).first()
+        return None if user is None else CachedUser(str(user.id), user.email)
+
+    def _store(self, user: CachedUser, version: int):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if self._versions.get(user.id, 0) != version:
+                return
+            self._entries[user.id] = (user, self.clock() + self.ttl)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            USER_CACHE_SIZE.set(len(self._entries))
+
+
+user_cache = UserCache()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target):
+    user_id = str(target.id)
+    user_cache.invalidate(user_id)
+    # Again after the commit, in case a load read the old row in between
+    session = orm.object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(user_id)
+
+
+@event.listens_for(orm.Session, "after_commit")
+def _invalidate_committed_users(session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(orm.Session, "after_rollback")
+def _forget_rolled_back_users(session):
+    session.info.pop("changed_user_ids", None)
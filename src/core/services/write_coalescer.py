@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+from typing import List, Optional
+
+from src.core.metrics import SAVE_BATCH_SIZE, SAVE_QUEUE_WAIT
+from src.core.services.string_write_service import string_write_service
+from src.factory import db
+
+SAVE_COALESCING_ENABLED = (
+    os.getenv("SAVE_COALESCING_ENABLED", "false").lower() == "true"
+)
+SAVE_COALESCE_MAX_WAIT_MS = float(os.getenv("SAVE_COALESCE_MAX_WAIT_MS", "3"))
+SAVE_COALESCE_MAX_BATCH = int(os.getenv("SAVE_COALESCE_MAX_BATCH", "64"))
+
+
+class CoalescedWriteError(Exception):
+    """Raised in every request whose string was part of a failed batch"""
+
+
+class _PendingBatch:
+    def __init__(self):
+        self.values: List[str] = []
+        self.enqueued_at: List[float] = []
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.ids: Optional[List[int]] = None
+        self.error: Optional[Exception] = None
+
+
+class WriteCoalescer:
+    """Group commit for concurrent string saves within a worker.
+
+    The first request to arrive opens a batch and becomes its leader; it
+    waits up to ``max_wait_ms`` (or until ``max_batch`` strings have joined),
+    then inserts the whole batch with one multi-row INSERT and commits once.
+    The other requests block until the leader has finished and then return
+    their own id, or raise ``CoalescedWriteError`` if the batch failed.
+    """
+
+    def __init__(self, enabled=None, max_wait_ms=None, max_batch=None, writer=None):
+        self.enabled = SAVE_COALESCING_ENABLED if enabled is None else enabled
+        self.max_wait = (max_wait_ms or SAVE_COALESCE_MAX_WAIT_MS) / 1000
+        self.max_batch = max_batch or SAVE_COALESCE_MAX_BATCH
+        self.writer = writer or string_write_service
+
+        self._lock = threading.Lock()
+        self._open: Optional[_PendingBatch] = None
+
+    def save(self, value: str) -> int:
+        """Queue ``value`` for the next group commit and return its id"""
+        with self._lock:
+            batch = self._open
+            leader = batch is None
+            if leader:
+                batch = self._open = _PendingBatch()
+
+            index = len(batch.values)
+            batch.values.append(value)
+            batch.enqueued_at.append(time.perf_counter())
+
+            if len(batch.values) >= self.max_batch:
+                self._open = None
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.max_wait)
+            with self._lock:
+                if self._open is batch:
+                    self._open = None
+            self._flush(batch)
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise CoalescedWriteError(
+                f"Batched save failed: {batch.error}"
+            ) from batch.error
+
+        return batch.ids[index]
+
+    def _flush(self, batch: _PendingBatch):
+        flushed_at = time.perf_counter()
+        for enqueued_at in batch.enqueued_at:
+            SAVE_QUEUE_WAIT.observe(flushed_at - enqueued_at)
+        SAVE_BATCH_SIZE.observe(len(batch.values))
+
+        try:
+            batch.ids = self.writer.save_many(batch.values)
+        except Exception as e:
+            db.session.rollback()
+            batch.error = e
+        finally:
+            batch.done.set()
+
+
+save_coalescer = WriteCoalescer()
@@ -0,0 +1,108 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, TypeVar
+
+from flask import current_app, g, has_app_context
+
+SHARD_BIND_PREFIX = "shard_"
+# Tables whose statements follow the on_shard() context; everything else,
+# such as users, stays on the primary database
+SHARDED_TABLES = frozenset({"strings"})
+
+T = TypeVar("T")
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """Jump consistent hash of a 64-bit key (Lamping & Veach, 2014).
+
+    Growing from ``n`` to ``n + 1`` buckets moves only the ``1 / (n + 1)``
+    of keys that land in the new bucket; every other key stays put, so
+    adding a shard only moves rows onto that shard.
+    """
+    b, j = -1, 0
+    while j < buckets:
+        b = j
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        j = int((b + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+    return b
+
+
+class ShardSet:
+    """The configured string shards and the mapping of values onto them.
+
+    A string's shard is chosen by jump hashing the first 8 bytes of its
+    content hash, so a value can be looked up by content on one shard.
+    """
+
+    def __init__(self, bind_keys: List[str]):
+        self.bind_keys = list(bind_keys)
+
+    def __bool__(self):
+        return bool(self.bind_keys)
+
+    def __len__(self):
+        return len(self.bind_keys)
+
+    def __iter__(self):
+        return iter(self.bind_keys)
+
+    def shard_for_hash(self, digest: bytes) -> str:
+        bucket = jump_hash(int.from_bytes(digest[:8], "big"), len(self.bind_keys))
+        return self.bind_keys[bucket]
+
+    def shard_for(self, value: str) -> str:
+        from src.core.models.string import content_hash
+
+        return self.shard_for_hash(content_hash(value))
+
+    def partition(
+        self, items: Iterable[T], value: Callable[[T], str] = lambda item: item
+    ) -> Dict[str, List[T]]:
+        """Group ``items`` by the shard of ``value(item)``, keeping order"""
+        groups: Dict[str, List[T]] = defaultdict(list)
+        for item in items:
+            groups[self.shard_for(value(item))].append(item)
+        return groups
+
+
+def get_shards() -> Optional[ShardSet]:
+    """The current app's shards, or None when strings aren't sharded"""
+    if not has_app_context():
+        return None
+    shards = current_app.extensions.get("string_shards")
+    return shards or None
+
+
+def current_shard() -> Optional[Hashable]:
+    return g.get("db_shard") if has_app_context() else None
+
+
+@contextmanager
+def on_shard(key: str):
+    """Send statements on the strings table to shard ``key``.
+
+    Inside the block ``db.session`` reads and writes strings on that shard
+    only. The session keeps one transaction per shard it touched and
+    commits them one after another, so a failed commit can leave earlier
+    shards committed. ``StringWriteService.save_many`` commits a write that
+    spans shards with XA instead when ``SQLALCHEMY_SHARD_TWO_PHASE`` is set.
+    ORM objects added in the block must be flushed before it ends; a flush
+    at commit time no longer knows the shard.
+    """
+    previous = g.get("db_shard")
+    g.db_shard = key
+    try:
+        yield
+    finally:
+        g.db_shard = previous
+
+
+def each_shard() -> Iterator[Optional[str]]:
+    """Run a loop body once on every shard, or once if strings aren't sharded"""
+    shards = get_shards()
+    if shards is None:
+        yield None
+        return
+    for key in shards:
+        with on_shard(key):
+            yield key
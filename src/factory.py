@@ -6,27 +6,38 @@ from dotenv import load_dotenv
 from flask import Flask, Response, json
 from flask_bcrypt import Bcrypt
 from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
 from flask_migrate import Migrate
-from flask_sqlalchemy import SQLAlchemy
 
 from src.config.config import Config
+from src.core.db_routing import RoutingSQLAlchemy
 from src.core.health import HealthCheck
 from src.core.logging import setup_logging
 from src.core.metrics import setup_metrics
+from src.core.rate_limit_storage import BoundedMemoryStorage  # noqa: F401
+from src.core.rate_limits import rate_limit_key, tier_limits
 from src.core.security import configure_security
 
 VERSION = os.getenv("APP_VERSION", "1.0.0")
+# bounded-memory:// counts per worker; leased+redis://host:6379/0 shares the
+# counts, but only for fixed windows
+RATELIMIT_STORAGE_URI = os.getenv("RATELIMIT_STORAGE_URI", "bounded-memory://")
+RATELIMIT_STRATEGY = os.getenv(
+    "RATELIMIT_STRATEGY",
+    "fixed-window"
+    if RATELIMIT_STORAGE_URI.startswith("leased+")
+    else "sliding-window-counter",
+)
 
-db = SQLAlchemy()
+db = RoutingSQLAlchemy()
 migrate = Migrate()
 bcrypt = Bcrypt()
 health_check = HealthCheck()
 limiter = Limiter(
-    key_func=get_remote_address,
-    default_limits=["20000 per day", "5000 per hour"],
-    storage_uri="memory://",
-    strategy="fixed-window",
+    key_func=rate_limit_key,
+    # Anonymous, user or service limits, see src/core/rate_limits.py
+    default_limits=[tier_limits],
+    storage_uri=RATELIMIT_STORAGE_URI,
+    strategy=RATELIMIT_STRATEGY,
     # Don't count 429 responses against limit
     default_limits_deduct_when=lambda response: response.status_code != 429,
     default_limits_exempt_when=lambda: False,  # No exemptions
@@ -61,6 +72,13 @@ def create_app(config=config):
     app.secret_key = config.SECRET_KEY
     app.config["SQLALCHEMY_DATABASE_URI"] = config.SQLALCHEMY_DATABASE_URI
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = config.SQLALCHEMY_TRACK_MODIFICATIONS
+    app.config["SQLALCHEMY_REPLICA_URIS"] = getattr(
+        config, "SQLALCHEMY_REPLICA_URIS", []
+    )
+    app.config["SQLALCHEMY_SHARD_URIS"] = getattr(config, "SQLALCHEMY_SHARD_URIS", [])
+    app.config["SQLALCHEMY_SHARD_TWO_PHASE"] = getattr(
+        config, "SQLALCHEMY_SHARD_TWO_PHASE", False
+    )
 
     if "mysql" in config.SQLALCHEMY_DATABASE_URI:
         app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
@@ -80,11 +98,32 @@ def create_app(config=config):
     setup_metrics(app)
 
     # import models to let the migrate tool know
+    from src.core.models.revoked_token import RevokedToken
     from src.core.models.string import String
     from src.core.models.user import User
 
     register_blueprints(app)
 
+    from src.core.commands import register_commands
+
+    register_commands(app)
+
+    from src.core.services.string_retention_service import (
+        STRINGS_RETENTION_SCHEDULE_ENABLED,
+        retention_scheduler,
+        runs_scheduled_purge,
+    )
+
+    if STRINGS_RETENTION_SCHEDULE_ENABLED and runs_scheduled_purge():
+        retention_scheduler.start(app)
+
+    from src.core.services.snowflake_id_generator import check_worker_id_source
+    from src.core.services.string_write_service import STRING_ID_GENERATOR
+
+    if STRING_ID_GENERATOR == "snowflake":
+        # Without a unique worker id two processes could issue the same ids
+        check_worker_id_source()
+
     return app
 
 
@@ -93,8 +132,10 @@ def register_blueprints(app):
 
     from src.api.v1.routes import api
     from src.api.v1.swagger import API_URL, SWAGGER_URL, swagger
+    from src.api.well_known import well_known
 
     app.register_blueprint(api, url_prefix="/api/v1")
+    app.register_blueprint(well_known, url_prefix="/.well-known")
 
     app.register_blueprint(swagger, url_prefix="/api/v1")
     app.register_blueprint(
@@ -1,27 +1,60 @@
 from http import HTTPStatus
-from typing import Any, Dict
+from typing import Any, Dict, Union
 
-from flask import Response, json
+from flask import Response
+from pydantic import BaseModel
+from pydantic_core import to_json
 
 from src.core.schemas.base import ErrorResponseSchema
 
+# Error messages that never change, encoded once here instead of per response
+CONSTANT_ERROR_MESSAGES = (
+    "Request must be JSON",
+    "Internal server error",
+    "No strings found",
+    "Missing authentication token",
+    "Invalid token",
+    "Token has expired",
+    "Invalid token structure",
+    "Invalid token type",
+    "Invalid authentication token",
+    "Token has been revoked",
+    "Invalid email or password",
+    "Invalid refresh token",
+    "Refresh token has expired",
+    "Refresh token has been revoked",
+    "User not found",
+    "Authentication failed",
+)
+
+
+def encode_error(message: str) -> bytes:
+    return to_json(ErrorResponseSchema(message=message, status="failed"))
+
+
+ERROR_BODIES = {message: encode_error(message) for message in CONSTANT_ERROR_MESSAGES}
+
 
 def create_error_response(message: str, status_code: int) -> Response:
     """Create a standardized error response"""
-    error_schema = ErrorResponseSchema(message=message, status="failed")
+    body = ERROR_BODIES.get(message)
     return Response(
-        response=json.dumps(error_schema.model_dump()),
+        response=encode_error(message) if body is None else body,
         status=status_code,
         mimetype="application/json",
     )
 
 
 def create_success_response(
-    data: Dict[str, Any], status_code: int = HTTPStatus.OK
+    data: Union[BaseModel, Dict[str, Any]], status_code: int = HTTPStatus.OK
 ) -> Response:
-    """Create a standardized success response"""
+    """Create a standardized success response.
+
+    Pass the response schema itself rather than its ``model_dump()``; it is
+    serialized straight to JSON bytes without an intermediate dict.
+    """
     return Response(
-        response=json.dumps(data),
+        response=to_json(data),
         status=status_code,
         mimetype="application/json",
     )
@@ -5,6 +5,8 @@ from flask import Flask
 
 from src import app
 from src.config.testing import TestConfig
+from src.core.services.token_cache import verified_token_cache
+from src.core.services.user_cache import user_cache
 from src.factory import create_app, db
 
 
@@ -25,6 +27,9 @@ def app_with_db():
 
 @pytest.fixture(scope="function")
 def client(app_with_db):
+    # Tokens verified or users cached in one test must not leak into the next
+    verified_token_cache.clear()
+    user_cache.clear()
     with app_with_db.test_client() as client:
         yield client
 
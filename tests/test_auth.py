@@ -1,12 +1,29 @@
 import json
+import threading
+import time
+import uuid
 from http import HTTPStatus
 from unittest.mock import patch
 
 import pytest
 
-from src.core.models.user import User
+from src.api.v1.controllers import auth_controller
+from src.core.models.user import User, uuid7
+from src.core.password_hashers import (
+    Argon2idHasher,
+    BcryptHasher,
+    ScryptHasher,
+    identify,
+)
+from src.core.schemas.auth import TokenPayloadSchema
 from src.core.services.jwt_service import JWTService
-from src.factory import bcrypt, db
+from src.core.services.password_hashing_pool import (
+    GUNICORN_THREADS,
+    PasswordHashingPool,
+)
+from src.core.services.token_cache import VerifiedTokenCache, verified_token_cache
+from src.core.services.user_cache import UserCache, user_cache
+from src.factory import bcrypt, db, limiter
 
 
 @pytest.fixture
@@ -136,6 +153,154 @@ def test_login_user_not_found(client):
     assert data["status"] == "failed"
 
 
+def test_login_rejected_when_hashing_pool_is_full(client, test_user, monkeypatch):
+    monkeypatch.setattr(
+        auth_controller,
+        "password_hashing_pool",
+        PasswordHashingPool(workers=0, queue_size=0, wait=0),
+    )
+
+    response = client.post(
+        "/api/v1/auth/login",
+        json={"email": test_user.email, "password": "password123"},
+        content_type="application/json",
+    )
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "1"
+    assert json.loads(response.data)["status"] == "failed"
+
+
+def test_concurrent_logins_with_default_pool(app_with_db, test_user, monkeypatch):
+    limiter.reset()
+    # Older cost than the policy, so each login also rehashes
+    hasher = BcryptHasher(rounds=5)
+    test_user.password = BcryptHasher(rounds=4).hash("password123")
+    db.session.commit()
+    pool = PasswordHashingPool(hasher=hasher)
+    monkeypatch.setattr(auth_controller, "password_hashing_pool", pool)
+    # Start the hashing process, which a running worker already has
+    pool.hash("warm up")
+
+    start = threading.Barrier(2)
+    statuses = []
+
+    def login():
+        with app_with_db.test_client() as client:
+            start.wait()
+            response = client.post(
+                "/api/v1/auth/login",
+                json={"email": test_user.email, "password": "password123"},
+            )
+            statuses.append(response.status_code)
+
+    try:
+        threads = [threading.Thread(target=login) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+    finally:
+        pool.shutdown()
+
+    assert statuses == [HTTPStatus.OK, HTTPStatus.OK]
+    db.session.expire_all()
+    stored = User.query.filter_by(email=test_user.email).one().password
+    assert not hasher.needs_rehash(stored)
+
+
+def test_default_pool_leaves_a_request_thread_free():
+    pool = PasswordHashingPool()
+
+    assert pool.workers + pool.queue_size < GUNICORN_THREADS
+
+
+def test_other_endpoints_are_served_while_the_pool_is_saturated(
+    client, test_user, monkeypatch
+):
+    pool = PasswordHashingPool(workers=0, queue_size=0, wait=0.1)
+    monkeypatch.setattr(auth_controller, "password_hashing_pool", pool)
+    release = threading.Event()
+    # Hold the only slot as a slow login would
+    holder = threading.Thread(target=pool._run, args=("hash", True, release.wait))
+    holder.start()
+    try:
+        time.sleep(0.05)
+        login = client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "password123"},
+        )
+        health = client.get("/health")
+    finally:
+        release.set()
+        holder.join(timeout=5)
+
+    assert login.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert health.status_code == HTTPStatus.OK
+
+
+def test_slot_is_free_when_the_hash_returns(app_with_db):
+    pool = PasswordHashingPool(workers=1, queue_size=0)
+    try:
+        # The rehash after a login must never find the verify's slot taken
+        for _ in range(20):
+            pool.hash("password123")
+    finally:
+        pool.shutdown()
+
+
+def test_hashing_pool_matches_flask_bcrypt(app_with_db):
+    pool = PasswordHashingPool(workers=1, queue_size=0)
+    try:
+        with app_with_db.app_context():
+            pw_hash = pool.hash("password123")
+
+        assert bcrypt.check_password_hash(pw_hash, "password123")
+        assert pool.verify(pw_hash, "password123")
+        assert not pool.verify(pw_hash, "wrong password")
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.parametrize(
+    "hasher",
+    [
+        BcryptHasher(rounds=4),
+        ScryptHasher(ln=10),
+        Argon2idHasher(time_cost=1, memory_cost=1024, parallelism=1),
+    ],
+    ids=lambda hasher: hasher.name,
+)
+def test_password_hashers_round_trip(hasher):
+    encoded = hasher.hash("password123")
+
+    assert isinstance(identify(encoded), type(hasher))
+    assert identify(encoded).verify(encoded, "password123")
+    assert not identify(encoded).verify(encoded, "wrong password")
+    assert not hasher.needs_rehash(encoded)
+    assert type(hasher)().needs_rehash(encoded)
+
+
+def test_login_rehashes_to_current_policy(client, test_user, monkeypatch):
+    hasher = Argon2idHasher(time_cost=1, memory_cost=1024, parallelism=1)
+    monkeypatch.setattr(
+        auth_controller,
+        "password_hashing_pool",
+        PasswordHashingPool(workers=0, queue_size=1, hasher=hasher),
+    )
+
+    response = client.post(
+        "/api/v1/auth/login",
+        json={"email": test_user.email, "password": "password123"},
+        content_type="application/json",
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    stored = User.query.filter_by(email=test_user.email).one().password
+    assert stored.startswith("$argon2id$v=19$m=1024,t=1,p=1$")
+    assert hasher.verify(stored, "password123")
+
+
 def test_refresh_token_missing(client):
     response = client.post(
         "/api/v1/auth/refresh", json={}, content_type="application/json"
@@ -161,6 +326,45 @@ def test_refresh_token_invalid(client):
     assert data["status"] == "failed"
 
 
+def test_refresh_token_success(client, auth_tokens):
+    response = client.post(
+        "/api/v1/auth/refresh",
+        json={"refresh_token": auth_tokens["refresh"]},
+        content_type="application/json",
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    data = json.loads(response.data)
+    assert data["status"] == "success"
+    assert "access_token" in data
+
+
+def test_user_id_is_stored_as_binary(session, test_user):
+    stored = session.execute(
+        db.text("SELECT id FROM users WHERE email = :email"),
+        {"email": test_user.email},
+    ).scalar()
+
+    assert bytes(stored) == uuid.UUID(test_user.id).bytes
+    payload = JWTService.decode_token(
+        JWTService.create_access_token(
+            {"user_id": str(test_user.id), "email": test_user.email}
+        )
+    )
+    assert User.query.filter_by(id=payload["user_id"]).one() is test_user
+
+
+def test_user_ids_are_time_ordered():
+    ids = []
+    for _ in range(3):
+        ids.append(uuid7())
+        time.sleep(0.002)
+
+    assert all(value.version == 7 for value in ids)
+    assert all(value.variant == uuid.RFC_4122 for value in ids)
+    assert [value.bytes for value in ids] == sorted(value.bytes for value in ids)
+
+
 def test_protected_endpoint_with_valid_token(client, auth_tokens):
     response = client.post(
         "/api/v1/strings/save",
@@ -268,3 +472,141 @@ def test_malformed_authorization_header(client):
     assert response.status_code == HTTPStatus.UNAUTHORIZED
     data = json.loads(response.data)
     assert data["status"] == "failed"
+
+
+class TestVerifiedTokenCache:
+    def test_repeat_requests_skip_verification(self, client, auth_tokens):
+        headers = {"Authorization": f"Bearer {auth_tokens['access']}"}
+        client.post("/api/v1/strings/save", json={"string": "first"}, headers=headers)
+
+        with patch(
+            "src.core.services.jwt_service.JWTService.decode_token"
+        ) as mock_decode:
+            response = client.post(
+                "/api/v1/strings/save", json={"string": "second"}, headers=headers
+            )
+
+        assert response.status_code == HTTPStatus.CREATED
+        mock_decode.assert_not_called()
+
+    def test_rejected_tokens_are_not_cached(self, client, auth_tokens):
+        headers = {"Authorization": f"Bearer {auth_tokens['refresh']}"}
+
+        for _ in range(2):
+            response = client.post(
+                "/api/v1/strings/save", json={"string": "x"}, headers=headers
+            )
+            assert response.status_code == HTTPStatus.UNAUTHORIZED
+        assert len(verified_token_cache) == 0
+
+    def test_entries_expire_and_stay_bounded(self):
+        now = [1000.0]
+        cache = VerifiedTokenCache(max_size=2, clock=lambda: now[0])
+
+        def payload(exp):
+            return TokenPayloadSchema(
+                user_id="u", email="a@example.com", exp=exp, type="access"
+            )
+
+        cache.put("a", payload(1010))
+        cache.put("b", payload(1010))
+        cache.get("a")
+        cache.put("c", payload(1010))
+        cache.put("no exp", payload(None))
+
+        assert cache.get("b") is None
+        assert cache.get("a").exp == 1010
+        assert cache.get("c") is not None
+        assert cache.get("no exp") is None
+
+        now[0] = 1010
+        assert cache.get("a") is None
+        assert len(cache) == 1
+
+
+class TestUserCache:
+    @pytest.fixture
+    def cached_user(self, session):
+        password = bcrypt.generate_password_hash("password123").decode("utf-8")
+        user = User(email="cached@example.com", password=password)
+        session.add(user)
+        session.commit()
+        yield user
+        if User.query.filter_by(id=user.id).first():
+            session.delete(user)
+            session.commit()
+
+    def refresh(self, client, user):
+        token = JWTService.create_refresh_token(
+            {"user_id": str(user.id), "email": user.email}
+        )
+        return client.post("/api/v1/auth/refresh", json={"refresh_token": token})
+
+    def test_refresh_reads_user_from_cache(self, client, cached_user):
+        user_id = str(cached_user.id)
+        assert self.refresh(client, cached_user).status_code == HTTPStatus.OK
+        assert user_cache.get(user_id).email == "cached@example.com"
+
+        with patch.object(UserCache, "_load") as load:
+            response = self.refresh(client, cached_user)
+
+        assert response.status_code == HTTPStatus.OK
+        load.assert_not_called()
+
+    def test_login_fills_the_cache(self, client, cached_user):
+        limiter.reset()
+        response = client.post(
+            "/api/v1/auth/login",
+            json={"email": "cached@example.com", "password": "password123"},
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        with patch.object(UserCache, "_load") as load:
+            assert self.refresh(client, cached_user).status_code == HTTPStatus.OK
+        load.assert_not_called()
+
+    def test_changes_invalidate_the_entry(self, client, session, cached_user):
+        self.refresh(client, cached_user)
+
+        cached_user.email = "renamed@example.com"
+        session.commit()
+        response = self.refresh(client, cached_user)
+
+        payload = JWTService.decode_token(json.loads(response.data)["access_token"])
+        assert payload["email"] == "renamed@example.com"
+
+        session.delete(cached_user)
+        session.commit()
+        assert self.refresh(client, cached_user).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+
+    def test_entries_expire_after_ttl(self, app_with_db, cached_user):
+        now = [0.0]
+        cache = UserCache(ttl=60, clock=lambda: now[0])
+        user_id = str(cached_user.id)
+
+        with app_with_db.app_context():
+            cache.get(user_id)
+            with patch.object(UserCache, "_load") as load:
+                cache.get(user_id)
+                now[0] = 60
+                cache.get(user_id)
+
+        assert load.call_count == 1
+
+    def test_load_racing_an_update_is_not_stored(self, app_with_db, cached_user):
+        cache = UserCache()
+        user_id = str(cached_user.id)
+        original_load = UserCache._load
+
+        def load_then_update(self, user_id):
+            user = original_load(self, user_id)
+            cache.invalidate(user_id)
+            return user
+
+        with app_with_db.app_context():
+            with patch.object(UserCache, "_load", load_then_update):
+                assert cache.get(user_id).email == "cached@example.com"
+
+        assert len(cache) == 0
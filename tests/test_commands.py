@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+
+from src.core.models.string import String, content_hash
+
+
+def test_backfill_hashes(app_with_db, session):
+    rows = [String(value=f"legacy {i}") for i in range(5)]
+    session.add_all(rows)
+    session.commit()
+
+    # Simulate rows written before the value_hash column existed
+    session.query(String).update({String.value_hash: None})
+    session.commit()
+
+    result = app_with_db.test_cli_runner().invoke(
+        args=["strings", "backfill-hashes", "--batch-size", "2"]
+    )
+
+    assert result.exit_code == 0
+    assert "Done" in result.output
+    for row in session.query(String).all():
+        assert row.value_hash == content_hash(row.value)
+
+
+def test_purge(app_with_db, session):
+    session.query(String).delete()
+    old = datetime.utcnow() - timedelta(days=40)
+    session.add_all([String(value=f"old {i}", created_at=old) for i in range(5)])
+    session.add(String(value="recent"))
+    session.commit()
+
+    runner = app_with_db.test_cli_runner()
+    result = runner.invoke(
+        args=["strings", "purge", "--max-age-days", "30", "--dry-run"]
+    )
+    assert result.exit_code == 0
+    assert "5 strings" in result.output
+    assert session.query(String).count() == 6
+
+    result = runner.invoke(
+        args=[
+            "strings",
+            "purge",
+            "--max-age-days",
+            "30",
+            "--batch-size",
+            "2",
+            "--pause-ms",
+            "0",
+        ]
+    )
+    assert result.exit_code == 0
+    assert "Done, 5 strings purged" in result.output
+    assert [row.value for row in session.query(String).all()] == ["recent"]
+
+
+def test_purge_requires_retention_period(app_with_db):
+    result = app_with_db.test_cli_runner().invoke(args=["strings", "purge"])
+
+    assert result.exit_code != 0
+    assert "max-age-days" in result.output
+
+
+def test_calibrate_hashing(app_with_db):
+    result = app_with_db.test_cli_runner().invoke(
+        args=[
+            "auth",
+            "calibrate-hashing",
+            "--algorithm",
+            "bcrypt",
+            "--target-ms",
+            "20",
+            "--samples",
+            "1",
+        ]
+    )
+
+    assert result.exit_code == 0
+    assert "PASSWORD_HASH_ALGORITHM=bcrypt" in result.output
+    assert "BCRYPT_ROUNDS=4: " in result.output
+
+
+def test_calibrate_hashing_with_unreachable_target(app_with_db):
+    result = app_with_db.test_cli_runner().invoke(
+        args=["auth", "calibrate-hashing", "--algorithm", "scrypt", "--target-ms", "0"]
+    )
+
+    assert result.exit_code != 0
+    assert "cheapest scrypt parameters" in result.output
@@ -0,0 +1,163 @@
+import json
+import time
+from http import HTTPStatus
+
+import pytest
+from itsdangerous import Signer
+from sqlalchemy.exc import OperationalError
+
+from src.config.testing import TestConfig as BaseTestConfig
+from src.core.db_routing import (
+    READ_YOUR_WRITES_COOKIE,
+    READ_YOUR_WRITES_SECONDS,
+    ReplicaSet,
+    _primary_until,
+    read_only,
+)
+from src.core.models.string import String
+from src.factory import create_app, db
+
+
+class ReplicaConfig(BaseTestConfig):
+    def __init__(self, primary, replicas):
+        super().__init__()
+        self.SQLALCHEMY_DATABASE_URI = f"sqlite:///{primary}"
+        self.SQLALCHEMY_REPLICA_URIS = [f"sqlite:///{path}" for path in replicas]
+
+
+def create_replica_app(tmp_path, replicas=("replica_0", "replica_1")):
+    """An app with a primary and replica SQLite files.
+
+    Nothing replicates between the files; the only row in each is its
+    name, so a query's result shows which database served it. Replicas
+    whose file can't be opened are left broken.
+    """
+    paths = [tmp_path / f"{name}.sqlite3" for name in replicas]
+    app = create_app(ReplicaConfig(tmp_path / "primary.sqlite3", paths))
+
+    # The scoped session is per thread, not per app; don't reuse the test
+    # suite's session bound to the in-memory database
+    db.session.remove()
+    with app.app_context():
+        for key in ["primary"] + [f"replica_{i}" for i in range(len(replicas))]:
+            engine = db.get_engine(app, bind=None if key == "primary" else key)
+            try:
+                db.Model.metadata.create_all(engine)
+            except OperationalError:
+                continue
+            engine.execute(String.__table__.insert(), [{"value": key}])
+        db.session.remove()
+
+    # Setting up a broken replica ejects it; let requests find out again
+    replicas = app.extensions["db_replicas"]
+    for key in replicas.bind_keys:
+        replicas.restore(key)
+
+    return app
+
+
+@pytest.fixture
+def replica_app(tmp_path):
+    # Not used inside an app context, so each request gets its own context
+    # and session like it would in production
+    yield create_replica_app(tmp_path)
+    db.session.remove()
+
+
+def served_by(client):
+    """Name of the database that served a read-only request"""
+    response = client.get("/api/v1/strings", query_string={"limit": 1})
+    assert response.status_code == HTTPStatus.OK
+    return json.loads(response.data)["items"][0]["value"]
+
+
+class TestReadReplicas:
+    def test_reads_round_robin_over_replicas(self, replica_app):
+        client = replica_app.test_client()
+
+        served = [served_by(client) for _ in range(4)]
+
+        assert sorted(served) == ["replica_0", "replica_0", "replica_1", "replica_1"]
+        assert served[0] != served[1]
+
+    def test_writes_go_to_primary(self, replica_app):
+        with replica_app.app_context(), read_only():
+            db.session.add(String(value="written in read_only block"))
+            db.session.commit()
+
+        primary = db.get_engine(replica_app)
+        replica = db.get_engine(replica_app, bind="replica_0")
+        query = (
+            "SELECT count(*) FROM strings WHERE value = 'written in read_only block'"
+        )
+        assert primary.execute(query).scalar() == 1
+        assert replica.execute(query).scalar() == 0
+
+    def test_failed_replica_is_ejected(self, tmp_path):
+        # replica_1's directory doesn't exist, so SQLite can't open it
+        app = create_replica_app(tmp_path, ["replica_0", "missing/replica_1"])
+        replicas = app.extensions["db_replicas"]
+
+        client = app.test_client()
+        for _ in range(2):
+            client.get("/api/v1/strings")
+
+        assert not replicas.is_healthy("replica_1")
+        assert [served_by(client) for _ in range(3)] == ["replica_0"] * 3
+
+        replicas.eject("replica_0")
+        assert served_by(client) == "primary"
+
+    def test_health_reports_replicas(self, replica_app):
+        response = replica_app.test_client().get("/health/detailed")
+
+        data = json.loads(response.data)
+        assert data["components"]["replicas"] == {
+            "replica_0": "healthy",
+            "replica_1": "healthy",
+        }
+
+    def test_read_your_writes(self, replica_app):
+        client = replica_app.test_client()
+
+        response = client.post(
+            "/api/v1/auth/register",
+            json={"email": "replica@example.com", "password": "securepassword123"},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert READ_YOUR_WRITES_COOKIE in response.headers["Set-Cookie"]
+
+        assert served_by(client) == "primary"
+
+        client.cookie_jar.clear()
+        assert served_by(client).startswith("replica")
+
+    def test_read_your_writes_cookie_must_be_signed(self, replica_app):
+        client = replica_app.test_client()
+
+        client.set_cookie("localhost", READ_YOUR_WRITES_COOKIE, "9999999999")
+        assert served_by(client).startswith("replica")
+
+        signer = Signer(replica_app.secret_key, salt=READ_YOUR_WRITES_COOKIE)
+        far_future = signer.sign("9999999999").decode()
+        with replica_app.test_request_context(
+            headers={"Cookie": f"{READ_YOUR_WRITES_COOKIE}={far_future}"}
+        ):
+            assert _primary_until() <= time.time() + READ_YOUR_WRITES_SECONDS
+
+
+class TestReplicaSet:
+    def test_choose_skips_ejected(self):
+        replicas = ReplicaSet(["a", "b", "c"], eject_seconds=60)
+        replicas.eject("b")
+
+        assert {replicas.choose() for _ in range(6)} == {"a", "c"}
+
+        replicas.restore("b")
+        assert {replicas.choose() for _ in range(6)} == {"a", "b", "c"}
+
+    def test_choose_returns_none_when_all_ejected(self):
+        replicas = ReplicaSet(["a"], eject_seconds=60)
+        replicas.eject("a")
+
+        assert replicas.choose() is None
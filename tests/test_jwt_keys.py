@@ -0,0 +1,136 @@
+import base64
+import json
+from http import HTTPStatus
+
+import jwt
+import pytest
+
+from src.api import well_known
+from src.core.services import jwt_service
+from src.core.services.jwt_keys import JWTKeySet
+from src.core.services.jwt_service import JWTService
+
+USER = {"user_id": "0190a6a4-5b4e-7000-8000-000000000000", "email": "a@example.com"}
+
+
+@pytest.fixture
+def keys_dir(app_with_db, tmp_path):
+    runner = app_with_db.test_cli_runner()
+    for kid, algorithm in (("2026-01", "RS256"), ("2026-07", "EdDSA")):
+        result = runner.invoke(
+            args=[
+                "auth",
+                "generate-signing-key",
+                kid,
+                "--algorithm",
+                algorithm,
+                "--keys-dir",
+                str(tmp_path),
+            ]
+        )
+        assert result.exit_code == 0, result.output
+    return str(tmp_path)
+
+
+def use_key_set(monkeypatch, key_set):
+    monkeypatch.setattr(jwt_service, "jwt_key_set", key_set)
+    monkeypatch.setattr(well_known, "jwt_key_set", key_set)
+
+
+def test_tokens_name_their_signing_key(keys_dir, monkeypatch):
+    use_key_set(monkeypatch, JWTKeySet(keys_dir, signing_kid="2026-07"))
+
+    token = JWTService.create_access_token(USER)
+
+    assert jwt.get_unverified_header(token) == {
+        "alg": "EdDSA",
+        "kid": "2026-07",
+        "typ": "JWT",
+    }
+    assert JWTService.decode_token(token)["user_id"] == USER["user_id"]
+
+
+def test_tokens_from_previous_key_verify_after_rotation(keys_dir, monkeypatch):
+    use_key_set(monkeypatch, JWTKeySet(keys_dir, signing_kid="2026-01"))
+    old_token = JWTService.create_access_token(USER)
+
+    use_key_set(monkeypatch, JWTKeySet(keys_dir, signing_kid="2026-07"))
+
+    assert jwt.get_unverified_header(old_token)["alg"] == "RS256"
+    assert JWTService.decode_token(old_token)["email"] == USER["email"]
+
+
+def test_unknown_kid_and_algorithm_swap_are_rejected(keys_dir, monkeypatch):
+    use_key_set(monkeypatch, JWTKeySet(keys_dir, signing_kid="2026-07"))
+    unknown = jwt.encode(USER, "secret", algorithm="HS256", headers={"kid": "1999"})
+    swapped = jwt.encode(USER, "secret", algorithm="HS256", headers={"kid": "2026-01"})
+
+    for token in (unknown, swapped):
+        with pytest.raises(ValueError, match="Invalid token"):
+            JWTService.decode_token(token)
+
+
+def test_malformed_kid_is_rejected(keys_dir, monkeypatch):
+    use_key_set(monkeypatch, JWTKeySet(keys_dir, signing_kid="2026-07"))
+
+    valid = jwt.encode(USER, "secret", algorithm="HS256").split(".")
+    for kid in ([], {"a": 1}, 7):
+        # PyJWT won't encode such a header, so build it by hand
+        header = json.dumps({"alg": "HS256", "typ": "JWT", "kid": kid}).encode()
+        encoded = base64.urlsafe_b64encode(header).decode().rstrip("=")
+        token = ".".join([encoded, *valid[1:]])
+        with pytest.raises(ValueError, match="Invalid token"):
+            JWTService.decode_token(token)
+
+
+def test_tokens_without_kid_need_the_switch_flag(keys_dir, monkeypatch):
+    use_key_set(monkeypatch, JWTKeySet("", signing_kid=""))
+    hs256_token = JWTService.create_access_token(USER)
+
+    use_key_set(monkeypatch, JWTKeySet(keys_dir, signing_kid="2026-07"))
+    with pytest.raises(ValueError, match="Invalid token"):
+        JWTService.decode_token(hs256_token)
+
+    monkeypatch.setattr(jwt_service, "JWT_ACCEPT_HS256_TOKENS", True)
+    assert JWTService.decode_token(hs256_token)["user_id"] == USER["user_id"]
+
+
+def test_signing_key_must_be_chosen(keys_dir):
+    with pytest.raises(ValueError, match="JWT_SIGNING_KEY_ID"):
+        JWTKeySet(keys_dir).signing_key
+
+
+def test_protected_endpoint_accepts_signed_token(client, keys_dir, monkeypatch):
+    use_key_set(monkeypatch, JWTKeySet(keys_dir, signing_kid="2026-01"))
+
+    response = client.post(
+        "/api/v1/strings/save",
+        json={"string": "signed with RS256"},
+        headers={"Authorization": f"Bearer {JWTService.create_access_token(USER)}"},
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+
+
+def test_jwks_endpoint(client, keys_dir, monkeypatch):
+    use_key_set(monkeypatch, JWTKeySet(keys_dir, signing_kid="2026-07"))
+    token = JWTService.create_access_token(USER)
+
+    response = client.get("/.well-known/jwks.json")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["Cache-Control"] == "public, max-age=300"
+    keys = {jwk["kid"]: jwk for jwk in json.loads(response.data)["keys"]}
+    assert sorted(keys) == ["2026-01", "2026-07"]
+    assert all("d" not in jwk for jwk in keys.values())
+
+    # A verifier needs nothing but the published key
+    public_key = jwt.PyJWK(keys["2026-07"]).key
+    assert jwt.decode(token, public_key, algorithms=["EdDSA"])["email"] == (
+        USER["email"]
+    )
+
+    cached = client.get(
+        "/.well-known/jwks.json", headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
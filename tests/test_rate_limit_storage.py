@@ -0,0 +1,166 @@
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter, SlidingWindowCounterRateLimiter
+
+from src.core.rate_limit_storage import (
+    BoundedMemoryStorage,
+    InProcessCounterBackend,
+    LeasedStorage,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingBackend(InProcessCounterBackend):
+    def __init__(self, clock):
+        super().__init__(clock)
+        self.calls = 0
+
+    def incr(self, key, amount, expiry):
+        self.calls += 1
+        return super().incr(key, amount, expiry)
+
+    def get(self, key):
+        self.calls += 1
+        return super().get(key)
+
+
+def make_workers(count, backend, clock, **options):
+    return [
+        FixedWindowRateLimiter(LeasedStorage(backend=backend, clock=clock, **options))
+        for _ in range(count)
+    ]
+
+
+def test_uri_selects_leased_storage():
+    assert isinstance(storage_from_string("leased+memory://"), LeasedStorage)
+
+
+def test_workers_share_one_limit():
+    clock = FakeClock()
+    workers = make_workers(4, InProcessCounterBackend(clock), clock, lease_fraction=0)
+    limit = parse("10 per minute")
+
+    admitted = sum(workers[i % 4].hit(limit, "client") for i in range(40))
+
+    assert admitted == 10
+
+
+def test_hits_within_the_lease_stay_local():
+    clock = FakeClock()
+    backend = CountingBackend(clock)
+    workers = make_workers(4, backend, clock, lease_fraction=0.05, sync_interval=60)
+    limit = parse("1000 per minute")
+
+    admitted = sum(workers[i % 4].hit(limit, "client") for i in range(2000))
+
+    # Each worker may overshoot by at most its lease of 50
+    assert 1000 <= admitted <= 1000 + 4 * 50
+    assert backend.calls < 2000 / 4
+
+
+def test_small_limits_lease_at_least_one_hit():
+    clock = FakeClock()
+    backend = CountingBackend(clock)
+    workers = make_workers(4, backend, clock, sync_interval=60)
+    limit = parse("10 per minute")
+
+    # The default lease of 0.5% rounds up to one hit per worker, so each
+    # worker's second hit is counted locally
+    assert all(workers[i % 4].hit(limit, "client") for i in range(8))
+    assert backend.calls == 4
+
+    admitted = 8 + sum(workers[i % 4].hit(limit, "client") for i in range(32))
+    assert 10 <= admitted <= 10 + 4
+
+
+def test_counts_sync_after_the_interval():
+    clock = FakeClock()
+    backend = InProcessCounterBackend(clock)
+    this_worker, other_worker = make_workers(
+        2, backend, clock, lease_fraction=0.1, sync_interval=1
+    )
+    limit = parse("100 per minute")
+
+    other_worker.hit(limit, "client")
+    for _ in range(5):
+        this_worker.hit(limit, "client")
+    assert other_worker.storage.get(limit.key_for("client")) == 1
+
+    clock.now += 1
+    other_worker.hit(limit, "client")
+    clock.now += 1
+
+    assert this_worker.storage.get(limit.key_for("client")) == 7
+
+
+def test_counts_reset_with_the_window():
+    clock = FakeClock()
+    worker = make_workers(1, InProcessCounterBackend(clock), clock)[0]
+    limit = parse("2 per minute")
+
+    assert worker.hit(limit, "client") and worker.hit(limit, "client")
+    assert not worker.hit(limit, "client")
+
+    clock.now += 60
+    assert worker.hit(limit, "client")
+
+
+def make_sliding_limiter(clock, **options):
+    return SlidingWindowCounterRateLimiter(BoundedMemoryStorage(clock=clock, **options))
+
+
+def test_sliding_window_stops_bursts_at_window_edges():
+    clock = FakeClock()
+    clock.now = 1_000_050.0  # 10 seconds before a minute ends
+    limiter = make_sliding_limiter(clock)
+    limit = parse("10 per minute")
+
+    assert sum(limiter.hit(limit, "client") for _ in range(10)) == 10
+    clock.now += 15
+    # A fixed window would allow another 10 here; the last minute holds 10
+    assert sum(limiter.hit(limit, "client") for _ in range(10)) <= 3
+
+
+def test_idle_keys_are_evicted():
+    clock = FakeClock()
+    limiter = make_sliding_limiter(clock)
+    limit = parse("10 per minute")
+
+    for i in range(50):
+        limiter.hit(limit, f"client-{i}")
+    clock.now += 180
+    limiter.hit(limit, "new-client")
+
+    assert limiter.storage.tracked_keys == 1
+
+
+def test_tracked_keys_are_capped():
+    clock = FakeClock()
+    limiter = make_sliding_limiter(clock, max_keys=50)
+    limit = parse("10 per minute")
+
+    for i in range(100):
+        limiter.hit(limit, f"client-{i}")
+
+    assert limiter.storage.tracked_keys == 50
+    # The least recently used clients were dropped first
+    assert limiter.storage.get_sliding_window(limit.key_for("client-99"), 60)[2] == 1
+    assert limiter.storage.get_sliding_window(limit.key_for("client-0"), 60)[2] == 0
+
+
+def test_bounded_storage_supports_fixed_windows():
+    clock = FakeClock()
+    limiter = FixedWindowRateLimiter(BoundedMemoryStorage(clock=clock))
+    limit = parse("2 per minute")
+
+    assert limiter.hit(limit, "client") and limiter.hit(limit, "client")
+    assert not limiter.hit(limit, "client")
+    clock.now += 60
+    assert limiter.hit(limit, "client")
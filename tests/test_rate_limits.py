@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+
+from src.core import rate_limits
+from src.core.rate_limits import client_address, rate_limit_key, rate_limit_tier
+from src.core.services.jwt_service import JWTService
+from src.factory import limiter
+
+USER = {"user_id": "0190a6a4-5b4e-7000-8000-000000000000", "email": "a@example.com"}
+
+
+def request_context(app, headers=None):
+    return app.test_request_context(
+        headers=headers or {}, environ_base={"REMOTE_ADDR": "10.0.0.2"}
+    )
+
+
+@pytest.mark.parametrize(
+    "forwarded_for, trusted_proxies, expected",
+    [
+        (None, 0, "10.0.0.2"),
+        ("203.0.113.7", 0, "10.0.0.2"),
+        ("203.0.113.7", 1, "203.0.113.7"),
+        ("1.2.3.4, 203.0.113.7", 1, "203.0.113.7"),
+        ("203.0.113.7, 10.0.0.9", 2, "203.0.113.7"),
+        (None, 1, "10.0.0.2"),
+    ],
+)
+def test_client_address(app_with_db, forwarded_for, trusted_proxies, expected):
+    headers = {"X-Forwarded-For": forwarded_for} if forwarded_for else {}
+    with request_context(app_with_db, headers):
+        assert client_address(trusted_proxies) == expected
+
+
+def test_key_and_tier_follow_the_access_token(app_with_db, monkeypatch):
+    token = JWTService.create_access_token(USER)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with request_context(app_with_db, headers):
+        assert rate_limit_key() == f"user:{USER['user_id']}"
+        assert rate_limit_tier() == "user"
+
+    monkeypatch.setattr(
+        rate_limits, "RATELIMIT_SERVICE_USER_IDS", frozenset([USER["user_id"]])
+    )
+    with request_context(app_with_db, headers):
+        assert rate_limit_tier() == "service"
+
+    with request_context(app_with_db, {"Authorization": "Bearer forged"}):
+        assert rate_limit_key() == "ip:10.0.0.2"
+        assert rate_limit_tier() == "anonymous"
+
+
+def test_token_is_verified_once_per_request(client, monkeypatch):
+    limiter.reset()
+    decoded = []
+    decode_token = JWTService.decode_token
+
+    def counting_decode(token, *args, **kwargs):
+        decoded.append(token)
+        return decode_token(token, *args, **kwargs)
+
+    monkeypatch.setattr(JWTService, "decode_token", counting_decode)
+
+    response = client.post(
+        "/api/v1/strings/save",
+        json={"string": "rate limited per user"},
+        headers={"Authorization": f"Bearer {JWTService.create_access_token(USER)}"},
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert len(decoded) == 1
@@ -0,0 +1,359 @@
+import json
+import random
+import time
+from collections import Counter
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.config.testing import TestConfig as BaseTestConfig
+from src.core.models.string import String
+from src.core.models.user import User
+from src.core.services.jwt_service import JWTService
+from src.core.services.random_string_pool import RANDOM_POOL_MAX_STALENESS
+from src.core.services.random_string_service import RandomStringService
+from src.core.services.string_export_service import StringExportService
+from src.core.services.string_id_allocator import StringIdAllocator, string_id_allocator
+from src.core.services.string_listing_service import StringListingService
+from src.core.services.string_write_service import StringWriteService
+from src.core.sharding import ShardSet, get_shards, jump_hash, on_shard
+from src.factory import bcrypt, create_app, db
+
+SHARDS = ["shard_0", "shard_1", "shard_2"]
+
+
+class ShardConfig(BaseTestConfig):
+    def __init__(self, primary, shards):
+        super().__init__()
+        self.SQLALCHEMY_DATABASE_URI = f"sqlite:///{primary}"
+        self.SQLALCHEMY_SHARD_URIS = [f"sqlite:///{path}" for path in shards]
+
+
+def create_sharded_app(tmp_path, shard_count=len(SHARDS)):
+    paths = [tmp_path / f"shard_{i}.sqlite3" for i in range(shard_count)]
+    app = create_app(ShardConfig(tmp_path / "primary.sqlite3", paths))
+
+    # The scoped session is per thread, not per app; don't reuse the test
+    # suite's session bound to the in-memory database
+    db.session.remove()
+    with app.app_context():
+        db.create_all(bind=None)
+        for key in get_shards():
+            db.Model.metadata.create_all(db.get_engine(app, bind=key))
+    return app
+
+
+@pytest.fixture
+def sharded_app(tmp_path):
+    string_id_allocator.reset()
+    app = create_sharded_app(tmp_path)
+    with app.app_context():
+        yield app
+        db.session.remove()
+    string_id_allocator.reset()
+
+
+def shard_values(key):
+    with on_shard(key):
+        return [row.value for row in db.session.query(String).order_by(String.id)]
+
+
+def all_ids():
+    ids = []
+    for key in get_shards():
+        with on_shard(key):
+            ids.extend(row.id for row in db.session.query(String.id))
+    return ids
+
+
+def insert_on_shard(key, values):
+    with on_shard(key):
+        db.session.add_all([String(id=i, value=v) for i, v in values])
+        db.session.flush()
+    db.session.commit()
+
+
+class TestShardRouting:
+    def test_jump_hash_only_moves_keys_to_new_bucket(self):
+        keys = range(0, 2**64, 2**64 // 5000)
+        for buckets in range(1, 6):
+            for key in keys:
+                before, after = jump_hash(key, buckets), jump_hash(key, buckets + 1)
+                assert after == before or after == buckets
+
+    def test_inserts_are_routed_by_content(self, sharded_app):
+        shards = get_shards()
+        values = [f"sharded {i}" for i in range(60)]
+
+        ids = StringWriteService().insert_many(values)
+        db.session.commit()
+
+        assert sorted(all_ids()) == sorted(ids)
+        assert len(set(ids)) == len(ids)
+        for key in SHARDS:
+            stored = shard_values(key)
+            assert stored, "every shard should get some of 60 values"
+            assert all(shards.shard_for(value) == key for value in stored)
+
+    def test_existing_ids_looks_up_the_right_shard(self, sharded_app):
+        service = StringWriteService(deduplicate=True)
+        first = service.insert_many(["a", "b", "c"])
+        db.session.commit()
+
+        assert service.insert_many(["c", "d", "a"]) == [
+            first[2],
+            first[2] + 1,
+            first[0],
+        ]
+        assert service.find_id("b") == first[1]
+
+    def test_save_endpoint(self, sharded_app):
+        password = bcrypt.generate_password_hash("password123").decode("utf-8")
+        user = User(email="shards@example.com", password=password)
+        db.session.add(user)
+        db.session.commit()
+        token = JWTService.create_access_token(
+            {"user_id": str(user.id), "email": user.email}
+        )
+
+        client = sharded_app.test_client()
+        response = client.post(
+            "/api/v1/strings/save",
+            json={"string": "saved on a shard"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == HTTPStatus.CREATED
+        new_id = json.loads(response.data)["id"]
+        key = get_shards().shard_for("saved on a shard")
+        with on_shard(key):
+            assert db.session.get(String, new_id).value == "saved on a shard"
+
+        with sharded_app.test_client() as client:
+            response = client.get(
+                "/api/v1/strings/exists", query_string={"value": "saved on a shard"}
+            )
+        assert json.loads(response.data) == {"exists": True, "id": new_id}
+
+
+class TestShardedIds:
+    def test_allocator_reserves_blocks(self, sharded_app):
+        first = StringIdAllocator(block_size=10)
+        second = StringIdAllocator(block_size=10)
+
+        a = first.allocate(3)
+        b = second.allocate(25)
+        c = first.allocate(9)
+
+        assert a == [1, 2, 3]
+        assert len(set(a + b + c)) == len(a + b + c)
+        assert b == list(range(11, 36))
+
+    def test_allocator_starts_above_existing_rows(self, sharded_app):
+        insert_on_shard("shard_1", [(500, "legacy row")])
+
+        assert StringIdAllocator().allocate(1) == [501]
+
+    def test_allocator_starts_above_rows_left_on_the_primary(self, sharded_app):
+        insert_on_shard("shard_1", [(500, "sharded row")])
+        db.session.add(String(id=900, value="row from before sharding"))
+        db.session.commit()
+
+        assert StringIdAllocator().allocate(1) == [901]
+
+
+class TestShardedCommits:
+    @pytest.fixture
+    def xa_sessions(self, sharded_app, monkeypatch):
+        sessions = []
+
+        def two_phase_session(service):
+            # SQLite can't prepare transactions; record the XA session and
+            # commit through a plain one
+            sessions.append(db.create_session({"twophase": True})())
+            return db.create_session({})()
+
+        monkeypatch.setattr(StringWriteService, "_two_phase_session", two_phase_session)
+        return sessions
+
+    def test_writes_spanning_shards_use_two_phase_commit(
+        self, sharded_app, xa_sessions, monkeypatch
+    ):
+        monkeypatch.setitem(sharded_app.config, "SQLALCHEMY_SHARD_TWO_PHASE", True)
+        values = [f"span {i}" for i in range(20)]
+        assert len(get_shards().partition(values)) > 1
+
+        ids = StringWriteService().save_many(values)
+
+        assert len(xa_sessions) == 1 and xa_sessions[0].twophase
+        assert not db.session().twophase
+        assert sorted(all_ids()) == sorted(ids)
+
+    def test_single_shard_writes_skip_two_phase_commit(
+        self, sharded_app, xa_sessions, monkeypatch
+    ):
+        monkeypatch.setitem(sharded_app.config, "SQLALCHEMY_SHARD_TWO_PHASE", True)
+
+        ids = StringWriteService().save_many(["only one"])
+
+        assert xa_sessions == []
+        assert all_ids() == ids
+
+    def test_two_phase_commit_is_off_by_default(self, xa_sessions):
+        StringWriteService().save_many([f"plain {i}" for i in range(20)])
+
+        assert xa_sessions == []
+
+
+class TestShardedReads:
+    @pytest.fixture
+    def spread_strings(self, sharded_app):
+        ids = StringWriteService().insert_many([f"spread {i}" for i in range(40)])
+        db.session.commit()
+        return ids
+
+    def test_listing_merges_shards_in_id_order(self, spread_strings):
+        listing = StringListingService()
+        seen, cursor = [], None
+        while True:
+            rows, cursor = listing.page(cursor, 7, "desc")
+            seen.extend(row.id for row in rows)
+            if cursor is None:
+                break
+
+        assert seen == sorted(spread_strings, reverse=True)
+        assert listing.total() == 40
+
+    def test_export_merges_shards_in_id_order(self, spread_strings):
+        export = StringExportService(chunk_size=6, fetch_size=2)
+
+        body = "".join(export.stream("ndjson", 0, export.upper_bound()))
+
+        assert [json.loads(line)["id"] for line in body.splitlines()] == sorted(
+            spread_strings
+        )
+
+    def test_search_covers_every_shard(self, spread_strings):
+        client = db.get_app().test_client()
+
+        response = client.get(
+            "/api/v1/strings/search", query_string={"q": "spread", "limit": 100}
+        )
+
+        assert len(json.loads(response.data)["items"]) == 40
+
+    def test_sample_unique_returns_rows_from_all_shards(self, spread_strings):
+        service = RandomStringService(rng=random.Random(5), count_ttl=0)
+
+        rows = service.sample_unique(100)
+
+        assert sorted(row.id for row in rows) == sorted(spread_strings)
+
+    def test_random_choice_is_proportional_to_shard_size(self, sharded_app):
+        insert_on_shard("shard_0", [(i, f"big {i}") for i in range(1, 91)])
+        insert_on_shard("shard_2", [(i, f"small {i}") for i in range(91, 101)])
+        service = RandomStringService(rng=random.Random(7), count_ttl=60)
+
+        picks = Counter(
+            row.value.split()[0] for row in service.sample(2000) + [service.pick_one()]
+        )
+
+        assert 0.85 < picks["big"] / sum(picks.values()) < 0.95
+
+    def test_shard_weights_are_estimated_without_counting(self, sharded_app):
+        insert_on_shard("shard_0", [(i, f"big {i}") for i in range(1, 201)])
+        insert_on_shard("shard_1", [(i, f"small {i}") for i in range(201, 221)])
+        service = RandomStringService(rng=random.Random(11), count_ttl=0)
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(Engine, "before_cursor_execute", record)
+        try:
+            picks = Counter(row.value.split()[0] for row in service.sample(1000))
+        finally:
+            event.remove(Engine, "before_cursor_execute", record)
+
+        assert not [s for s in statements if "count(" in s.lower()]
+        # 200 of 220 rows, within the estimate's error
+        assert 0.8 < picks["big"] / sum(picks.values()) < 0.98
+
+    def test_new_rows_on_an_empty_shard_are_drawn_after_the_count_ttl(
+        self, sharded_app
+    ):
+        insert_on_shard("shard_0", [(1, "old")])
+        service = RandomStringService(rng=random.Random(3), count_ttl=0.05)
+        assert {row.value for row in service.sample(20)} == {"old"}
+
+        insert_on_shard("shard_1", [(2, "new")])
+        time.sleep(0.06)
+
+        assert "new" in {row.value for row in service.sample(50)}
+
+    def test_count_ttl_follows_the_pool_staleness(self):
+        assert RandomStringService().count_ttl == RANDOM_POOL_MAX_STALENESS
+
+
+class TestRebalance:
+    def test_rebalance_moves_rows_to_their_shard(self, sharded_app):
+        values = [(i, f"misplaced {i}") for i in range(1, 31)]
+        insert_on_shard("shard_0", values)
+        # A leftover copy from an interrupted run
+        copied = next(v for v in values if get_shards().shard_for(v[1]) == "shard_1")
+        insert_on_shard("shard_1", [copied])
+
+        result = sharded_app.test_cli_runner().invoke(
+            args=["strings", "rebalance", "--batch-size", "7", "--pause-ms", "0"]
+        )
+
+        assert result.exit_code == 0, result.output
+        shards = get_shards()
+        assert sorted(all_ids()) == list(range(1, 31))
+        for key in SHARDS:
+            assert all(shards.shard_for(value) == key for value in shard_values(key))
+
+        result = sharded_app.test_cli_runner().invoke(args=["strings", "rebalance"])
+        assert "Done, 0 rows moved" in result.output
+
+    def test_adding_a_shard_only_moves_rows_to_it(self, tmp_path):
+        string_id_allocator.reset()
+        app = create_sharded_app(tmp_path, shard_count=2)
+        with app.app_context():
+            StringWriteService().insert_many([f"grow {i}" for i in range(50)])
+            db.session.commit()
+            before = {key: set(shard_values(key)) for key in ["shard_0", "shard_1"]}
+        db.session.remove()
+
+        app = create_sharded_app(tmp_path, shard_count=3)
+        with app.app_context():
+            result = app.test_cli_runner().invoke(
+                args=["strings", "rebalance", "--pause-ms", "0"]
+            )
+            assert result.exit_code == 0, result.output
+
+            after = {key: set(shard_values(key)) for key in SHARDS}
+            assert after["shard_0"] <= before["shard_0"]
+            assert after["shard_1"] <= before["shard_1"]
+            assert after["shard_2"]
+        db.session.remove()
+        string_id_allocator.reset()
+
+    def test_rebalance_requires_shards(self, app_with_db):
+        result = app_with_db.test_cli_runner().invoke(args=["strings", "rebalance"])
+
+        assert result.exit_code != 0
+
+
+class TestShardSet:
+    def test_partition_keeps_order(self):
+        shards = ShardSet(["a", "b"])
+        values = [f"v{i}" for i in range(20)]
+
+        groups = shards.partition(values)
+
+        assert sorted(sum(groups.values(), [])) == sorted(values)
+        for key, group in groups.items():
+            assert group == [v for v in values if shards.shard_for(v) == key]
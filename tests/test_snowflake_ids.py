@@ -0,0 +1,296 @@
+import json
+import random
+import runpy
+from http import HTTPStatus
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.models.string import String
+from src.core.models.user import User
+from src.core.services.jwt_service import JWTService
+from src.core.services.random_string_service import RandomStringService
+from src.core.services.snowflake_id_generator import (
+    SEQUENCE_BITS,
+    SNOWFLAKE_EPOCH_MS,
+    SnowflakeIdGenerator,
+    WorkerIdLease,
+    check_worker_id_source,
+    worker_id_from_environment,
+)
+from src.core.services.string_write_service import (
+    StringWriteService,
+    string_write_service,
+)
+from src.factory import bcrypt
+
+EPOCH = SNOWFLAKE_EPOCH_MS
+
+
+class FakeClock:
+    def __init__(self, *times):
+        self.times = list(times)
+
+    def __call__(self):
+        return self.times.pop(0) if len(self.times) > 1 else self.times[0]
+
+
+class TestSnowflakeIdGenerator:
+    def test_ids_pack_time_worker_and_sequence(self):
+        generator = SnowflakeIdGenerator(worker_id=5, clock=FakeClock(EPOCH + 1000))
+
+        first, second = generator.allocate(2)
+
+        assert first == (1000 << 22) | (5 << SEQUENCE_BITS)
+        assert second == first + 1
+        assert generator.timestamp_ms(first) == EPOCH + 1000
+
+    def test_ids_increase_across_milliseconds(self):
+        generator = SnowflakeIdGenerator(
+            worker_id=1, clock=FakeClock(EPOCH + 1, EPOCH + 1, EPOCH + 2)
+        )
+
+        ids = [generator.next_id() for _ in range(3)]
+
+        assert ids == sorted(ids)
+        assert ids[2] == (2 << 22) | (1 << SEQUENCE_BITS)
+
+    def test_exhausted_sequence_waits_for_next_millisecond(self):
+        clock = FakeClock(EPOCH, EPOCH, EPOCH, EPOCH + 1)
+        generator = SnowflakeIdGenerator(worker_id=0, clock=clock)
+
+        ids = generator.allocate(4097)
+
+        assert len(set(ids)) == 4097
+        assert ids[-1] == 1 << 22
+
+    def test_clock_moving_back_never_repeats_ids(self):
+        clock = FakeClock(EPOCH + 10, EPOCH + 9, EPOCH + 10, EPOCH + 11)
+        generator = SnowflakeIdGenerator(worker_id=0, clock=clock)
+
+        first = generator.next_id()
+        second = generator.next_id()
+
+        assert second > first
+
+    def test_large_clock_rollback_raises(self):
+        generator = SnowflakeIdGenerator(
+            worker_id=0, clock=FakeClock(EPOCH + 10_000, EPOCH)
+        )
+        generator.next_id()
+
+        with pytest.raises(RuntimeError):
+            generator.next_id()
+
+    def test_different_workers_never_collide(self):
+        clock = FakeClock(EPOCH + 7)
+        ids = set()
+        for worker_id in range(4):
+            ids.update(SnowflakeIdGenerator(worker_id, clock=clock).allocate(100))
+
+        assert len(ids) == 400
+
+
+class TestWorkerIds:
+    def test_explicit_worker_id(self):
+        assert worker_id_from_environment({"STRING_ID_WORKER_ID": "42"}) == 42
+        with pytest.raises(ValueError):
+            worker_id_from_environment({"STRING_ID_WORKER_ID": "1024"})
+
+    def test_explicit_worker_id_is_combined_with_the_gunicorn_slot(self):
+        ids = {
+            worker_id_from_environment(
+                {"STRING_ID_WORKER_ID": "5", "GUNICORN_WORKER_SLOT": str(slot)}
+            )
+            for slot in range(4)
+        }
+
+        assert ids == {(5 << 4) | slot for slot in range(4)}
+        with pytest.raises(ValueError):
+            worker_id_from_environment(
+                {"STRING_ID_WORKER_ID": "64", "GUNICORN_WORKER_SLOT": "0"}
+            )
+
+    def test_statefulset_ordinal_and_gunicorn_slot(self):
+        environ = {"POD_INDEX": "3", "GUNICORN_WORKER_SLOT": "2"}
+
+        assert worker_id_from_environment(environ) == (3 << 4) | 2
+
+    @pytest.mark.parametrize(
+        "environ",
+        [
+            {},
+            {"POD_NAME": "flask-api-7d9f8-x2x4q", "GUNICORN_WORKER_SLOT": "0"},
+            {"POD_INDEX": "3"},
+            {"POD_INDEX": "64", "GUNICORN_WORKER_SLOT": "0"},
+        ],
+    )
+    def test_refuses_without_a_unique_source(self, environ):
+        with pytest.raises(ValueError):
+            worker_id_from_environment(environ)
+
+    def test_startup_check(self):
+        check_worker_id_source({"POD_INDEX": "0"})
+        check_worker_id_source({"STRING_ID_LEASE_URL": "redis://redis:6379/0"})
+        with pytest.raises(RuntimeError):
+            check_worker_id_source({"POD_NAME": "flask-api-7d9f8-x2x4q"})
+        with pytest.raises(RuntimeError):
+            check_worker_id_source(
+                {"STRING_ID_WORKER_ID": "100", "GUNICORN_WORKER_SLOT": "0"}
+            )
+
+    def test_gunicorn_hands_out_lowest_free_slot(self):
+        hooks = runpy.run_path(str(Path(__file__).parent.parent / "gunicorn.conf.py"))
+        live = {1: SimpleNamespace(id_slot=0), 2: SimpleNamespace(id_slot=2)}
+        server = SimpleNamespace(WORKERS=live)
+        worker = SimpleNamespace()
+
+        hooks["pre_fork"](server, worker)
+
+        assert worker.id_slot == 1
+
+
+class FakeRedis:
+    def __init__(self):
+        self.keys = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.keys:
+            return None
+        self.keys[key] = value
+        return True
+
+    def register_script(self, script):
+        def renew(keys, args):
+            return int(self.keys.get(keys[0]) == args[0])
+
+        return renew
+
+
+class TestWorkerIdLease:
+    def test_processes_lease_different_ids(self):
+        client = FakeRedis()
+
+        worker_ids = {WorkerIdLease(client).acquire() for _ in range(50)}
+
+        assert len(worker_ids) == 50
+        assert len(client.keys) == 50
+
+    def test_all_ids_leased_raises(self):
+        client = FakeRedis()
+        client.keys = {WorkerIdLease.KEY.format(n): "other" for n in range(1024)}
+
+        with pytest.raises(RuntimeError):
+            WorkerIdLease(client).acquire()
+
+    def test_generator_stops_when_the_lease_lapses(self):
+        now = [0.0]
+        client = FakeRedis()
+        lease = WorkerIdLease(client, ttl=30, clock=lambda: now[0])
+        generator = SnowflakeIdGenerator(lease=lease, clock=FakeClock(EPOCH + 1))
+
+        generator.next_id()
+        now[0] = 25.0
+        assert lease.renew()
+        now[0] = 50.0
+        generator.next_id()
+
+        # Another process took the id after renewals stopped arriving
+        client.keys[WorkerIdLease.KEY.format(lease.worker_id)] = "other"
+        assert not lease.renew()
+        with pytest.raises(RuntimeError):
+            generator.next_id()
+
+
+class TestSnowflakeWrites:
+    @pytest.fixture
+    def snowflake_strings(self, session):
+        session.query(String).delete()
+        session.commit()
+        service = StringWriteService(id_allocator=SnowflakeIdGenerator(worker_id=9))
+        ids = service.insert_many([f"snowflake {i}" for i in range(30)])
+        session.commit()
+        return dict(zip(ids, (f"snowflake {i}" for i in range(30))))
+
+    def test_insert_many_uses_generated_ids(self, snowflake_strings):
+        rows = {row.id: row.value for row in String.query}
+
+        assert rows == snowflake_strings
+        assert all(id_ > 2**40 for id_ in rows)
+
+    def test_save_endpoint(self, client, session, monkeypatch):
+        password = bcrypt.generate_password_hash("password123").decode("utf-8")
+        user = User(email="snowflake@example.com", password=password)
+        session.add(user)
+        session.commit()
+        token = JWTService.create_access_token(
+            {"user_id": str(user.id), "email": user.email}
+        )
+        generator = SnowflakeIdGenerator(worker_id=9)
+        monkeypatch.setattr(string_write_service, "id_allocator", generator)
+
+        response = client.post(
+            "/api/v1/strings/save",
+            json={"string": "snowflake"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == HTTPStatus.CREATED
+        new_id = json.loads(response.data)["id"]
+        assert new_id >> SEQUENCE_BITS & 0x3FF == 9
+
+    def test_random_selection_is_uniform_over_sparse_ids(self, snowflake_strings):
+        """Chi-square goodness of fit against a uniform distribution"""
+        service = RandomStringService(rng=random.Random(99), sparse_ids=True)
+        samples_per_row = 100
+        counts = {value: 0 for value in snowflake_strings.values()}
+
+        for row in service.sample(samples_per_row * len(counts)):
+            counts[row.value] += 1
+
+        chi_square = sum(
+            (observed - samples_per_row) ** 2 / samples_per_row
+            for observed in counts.values()
+        )
+        # 30 rows -> 29 degrees of freedom, critical value at p=0.001 is 58.30
+        assert chi_square < 58.30
+
+    @pytest.mark.parametrize("estimate", [1, 10**6])
+    def test_stale_estimate_only_sizes_the_first_round(
+        self, snowflake_strings, estimate
+    ):
+        service = RandomStringService(rng=random.Random(11), sparse_ids=True)
+        service._hash_estimates[None] = estimate
+        samples_per_row = 30
+        counts = {value: 0 for value in snowflake_strings.values()}
+
+        for row in service.sample(samples_per_row * len(counts)):
+            counts[row.value] += 1
+
+        assert sum(counts.values()) == samples_per_row * len(counts)
+        chi_square = sum(
+            (observed - samples_per_row) ** 2 / samples_per_row
+            for observed in counts.values()
+        )
+        assert chi_square < 58.30
+
+    def test_values_stored_many_times_widen_the_slots(self, snowflake_strings):
+        service = StringWriteService(id_allocator=SnowflakeIdGenerator(worker_id=9))
+        service.insert_many(["repeated"] * 40)
+        sampler = RandomStringService(rng=random.Random(5), sparse_ids=True)
+
+        rows = sampler.sample(700)
+
+        assert len(rows) == 700
+        repeated = sum(row.value == "repeated" for row in rows) / len(rows)
+        assert 0.5 < repeated < 0.65
+
+    def test_sample_unique_over_sparse_ids(self, snowflake_strings):
+        service = RandomStringService(rng=random.Random(3), sparse_ids=True)
+
+        rows = service.sample_unique(12)
+
+        assert len({row.id for row in rows}) == 12
+        assert len(service.sample_unique(100)) == 30
+        assert service.pick_one().id in snowflake_strings
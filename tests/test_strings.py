@@ -1,14 +1,44 @@
+import csv
+import io
 import json
 import random
 import string
+import threading
+from datetime import datetime, timedelta
 from http import HTTPStatus
 from unittest.mock import patch
 
 import pytest
+from sqlalchemy import event
 
-from src.core.models.string import String
+from src.api.v1.controllers.strings_controller import (
+    BATCH_MAX_STRINGS,
+    batch_size_limit,
+)
+from src.core.models.string import String, content_hash
 from src.core.models.user import User
+from src.core.schemas.strings import MAX_BATCH_STRINGS
 from src.core.services.jwt_service import JWTService
+from src.core.services.random_string_pool import RandomStringPool
+from src.core.services.random_string_service import RandomStringService
+from src.core.services.string_export_service import StringExportService
+from src.core.services.string_import_service import StringImportService
+from src.core.services.string_listing_service import (
+    CachedRowCount,
+    StringListingService,
+    encode_cursor,
+)
+from src.core.services.string_retention_service import (
+    RetentionScheduler,
+    StringRetentionService,
+    runs_scheduled_purge,
+)
+from src.core.services.string_search_service import StringSearchService
+from src.core.services.string_write_service import (
+    StringWriteService,
+    string_write_service,
+)
+from src.core.services.write_coalescer import CoalescedWriteError, WriteCoalescer
 from src.factory import bcrypt, db
 
 
@@ -286,6 +316,633 @@ class TestStringSave:
                 assert saved_string.value == strings[i]
 
 
+class TestStringBatchSave:
+    """Tests for the batch save endpoint"""
+
+    def test_batch_save_returns_ids_in_order(self, client, auth_header):
+        values = [f"batch string {i}" for i in range(5)]
+        response = client.post(
+            "/api/v1/strings/save/batch",
+            json=[{"string": value} for value in values],
+            headers=auth_header,
+        )
+
+        assert response.status_code == HTTPStatus.CREATED
+        data = json.loads(response.data)
+        assert data["status"] == "success"
+        assert data["saved"] == 5
+        assert data["errors"] == []
+
+        with client.application.app_context():
+            for value, string_id in zip(values, data["ids"]):
+                assert String.query.get(string_id).value == value
+
+    def test_batch_save_atomic_rejects_whole_batch(self, client, auth_header):
+        response = client.post(
+            "/api/v1/strings/save/batch",
+            json=[{"string": "atomic ok"}, {"string": ""}, {"string": 5}],
+            headers=auth_header,
+        )
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        data = json.loads(response.data)
+        assert data["status"] == "failed"
+        assert data["saved"] == 0
+        assert [error["index"] for error in data["errors"]] == [1, 2]
+
+        with client.application.app_context():
+            assert String.query.filter_by(value="atomic ok").first() is None
+
+    def test_batch_save_partial_saves_valid_items(self, client, auth_header):
+        response = client.post(
+            "/api/v1/strings/save/batch?atomic=false",
+            json=[{"string": "partial ok"}, {"not_string": "x"}, "bare"],
+            headers=auth_header,
+        )
+
+        assert response.status_code == HTTPStatus.CREATED
+        data = json.loads(response.data)
+        assert data["saved"] == 1
+        assert data["ids"][1:] == [None, None]
+        assert [error["index"] for error in data["errors"]] == [1, 2]
+
+        with client.application.app_context():
+            assert String.query.get(data["ids"][0]).value == "partial ok"
+
+    def test_batch_save_requires_array(self, client, auth_header):
+        for body in ({"string": "not a list"}, []):
+            response = client.post(
+                "/api/v1/strings/save/batch", json=body, headers=auth_header
+            )
+
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+            data = json.loads(response.data)
+            assert "non-empty JSON array" in data["message"]
+
+    def test_batch_save_unauthorized(self, client):
+        response = client.post(
+            "/api/v1/strings/save/batch", json=[{"string": "Test string"}]
+        )
+
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_batch_larger_than_the_save_limit(self, client, auth_header):
+        """Batches have their own per-item limit, so a full batch fits"""
+        batch = [{"string": f"bulk {i}"} for i in range(150)]
+
+        response = client.post(
+            "/api/v1/strings/save/batch", json=batch, headers=auth_header
+        )
+
+        assert response.status_code == HTTPStatus.CREATED
+        assert json.loads(response.data)["saved"] == 150
+        response = client.post(
+            "/api/v1/strings/save", json={"string": "one"}, headers=auth_header
+        )
+        assert response.status_code == HTTPStatus.CREATED
+
+    def test_batch_size_is_capped_by_the_rate_limit(self):
+        assert batch_size_limit("10000 per minute") == MAX_BATCH_STRINGS
+        assert batch_size_limit("500 per minute;2000 per hour") == 500
+
+    def test_rate_limit_counts_items(self, client, auth_header):
+        """The batch limit is charged per item"""
+        batch = [{"string": f"limited {i}"} for i in range(BATCH_MAX_STRINGS)]
+        with patch(
+            "src.api.v1.controllers.strings_controller.string_write_service"
+        ) as write_service:
+            write_service.save_many.side_effect = lambda values: list(
+                range(len(values))
+            )
+            for _ in range(10):
+                response = client.post(
+                    "/api/v1/strings/save/batch", json=batch, headers=auth_header
+                )
+                assert response.status_code == HTTPStatus.CREATED
+
+            response = client.post(
+                "/api/v1/strings/save/batch", json=batch[:1], headers=auth_header
+            )
+
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+
+
+class TestStringImport:
+    """Tests for the streaming NDJSON import endpoint"""
+
+    def test_import_saves_valid_lines(self, client, auth_header):
+        lines = [json.dumps({"string": f"imported {i}"}) for i in range(25)]
+        body = "\n".join(lines[:10] + [""] + lines[10:]) + "\n"
+
+        with patch(
+            "src.api.v1.controllers.strings_controller.string_import_service",
+            StringImportService(chunk_size=7),
+        ):
+            response = client.post(
+                "/api/v1/strings/import",
+                data=body,
+                headers=auth_header,
+                content_type="application/x-ndjson",
+            )
+
+        assert response.status_code == HTTPStatus.CREATED
+        data = json.loads(response.data)
+        assert data["status"] == "success"
+        assert data["lines"] == 26
+        assert data["saved"] == 25
+        assert data["failed"] == 0
+
+        with client.application.app_context():
+            assert String.query.filter_by(value="imported 24").first() is not None
+
+    def test_import_reports_line_errors(self, client, auth_header):
+        body = "\n".join(
+            [
+                json.dumps({"string": "import ok"}),
+                "not json",
+                json.dumps({"string": ""}),
+                json.dumps({"string": "x" * 40}),
+                json.dumps(["wrong", "shape"]),
+            ]
+        )
+
+        with patch(
+            "src.api.v1.controllers.strings_controller.string_import_service",
+            StringImportService(max_line_bytes=32, max_errors=2),
+        ):
+            response = client.post(
+                "/api/v1/strings/import",
+                data=body,
+                headers=auth_header,
+                content_type="application/x-ndjson",
+            )
+
+        assert response.status_code == HTTPStatus.CREATED
+        data = json.loads(response.data)
+        assert data["saved"] == 1
+        assert data["failed"] == 4
+        assert [error["line"] for error in data["errors"]] == [2, 3]
+        assert data["errors_truncated"] is True
+
+    def test_oversized_line_is_skipped_without_losing_the_next(self, app_with_db):
+        body = io.BytesIO(
+            b'{"string": "' + b"y" * 100 + b'"}\n{"string": "after long line"}\n'
+        )
+
+        with app_with_db.app_context():
+            progress = StringImportService(max_line_bytes=32).run(body)
+
+        assert progress.lines == 2
+        assert progress.saved == 1
+        assert "exceeds 32 bytes" in progress.errors[0].message
+
+    @pytest.mark.parametrize(
+        "body, status_code, status",
+        [
+            ("", HTTPStatus.OK, "success"),
+            ("\n\n", HTTPStatus.OK, "success"),
+            ("not json\n", HTTPStatus.BAD_REQUEST, "failed"),
+        ],
+    )
+    def test_import_without_saved_lines(
+        self, client, auth_header, body, status_code, status
+    ):
+        response = client.post(
+            "/api/v1/strings/import",
+            data=body,
+            headers=auth_header,
+            content_type="application/x-ndjson",
+        )
+
+        assert response.status_code == status_code
+        data = json.loads(response.data)
+        assert data["status"] == status
+        assert data["saved"] == 0
+
+    def test_import_requires_ndjson(self, client, auth_header):
+        response = client.post(
+            "/api/v1/strings/import",
+            json={"string": "Test string"},
+            headers=auth_header,
+        )
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        data = json.loads(response.data)
+        assert "application/x-ndjson" in data["message"]
+
+    def test_import_unauthorized(self, client):
+        response = client.post(
+            "/api/v1/strings/import",
+            data='{"string": "x"}\n',
+            content_type="application/x-ndjson",
+        )
+
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+class TestDeduplication:
+    """Tests for content hashing, deduplicated saves and existence lookups"""
+
+    def test_hash_is_computed_on_every_insert_path(self, app_with_db, session):
+        orm_row = String(value="hashed via orm")
+        session.add(orm_row)
+        session.commit()
+
+        bulk_ids = string_write_service.insert_many(["hashed bulk a", "hashed bulk b"])
+        session.commit()
+
+        assert orm_row.value_hash == content_hash("hashed via orm")
+        for string_id in bulk_ids:
+            row = String.query.get(string_id)
+            assert row.value_hash == content_hash(row.value)
+
+    def test_dedup_save_returns_existing_id(self, client, auth_header):
+        with patch(
+            "src.api.v1.controllers.strings_controller.string_write_service",
+            StringWriteService(deduplicate=True),
+        ):
+            first = client.post(
+                "/api/v1/strings/save",
+                json={"string": "only once"},
+                headers=auth_header,
+            )
+            second = client.post(
+                "/api/v1/strings/save",
+                json={"string": "only once"},
+                headers=auth_header,
+            )
+
+        assert first.status_code == HTTPStatus.CREATED
+        assert second.status_code == HTTPStatus.OK
+        data = json.loads(second.data)
+        assert data["message"] == "String already exists"
+        assert data["id"] == json.loads(first.data)["id"]
+
+        with client.application.app_context():
+            assert String.query.filter_by(value="only once").count() == 1
+
+    def test_dedup_insert_many_reuses_ids(self, app_with_db, session):
+        service = StringWriteService(deduplicate=True)
+        existing_id = service.insert_many(["dedup stored"])[0]
+        session.commit()
+
+        ids = service.insert_many(["dedup new", "dedup stored", "dedup new"])
+        session.commit()
+
+        assert ids[1] == existing_id
+        assert ids[0] == ids[2] != existing_id
+        assert String.query.filter_by(value="dedup new").count() == 1
+
+    def test_exists_lookup(self, client, session):
+        row = String(value="look me up")
+        session.add(row)
+        session.commit()
+
+        response = client.get(
+            "/api/v1/strings/exists", query_string={"value": "look me up"}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert json.loads(response.data) == {"exists": True, "id": row.id}
+
+        response = client.get(
+            "/api/v1/strings/exists", query_string={"value": "absent"}
+        )
+        assert json.loads(response.data) == {"exists": False, "id": None}
+
+    def test_exists_requires_value(self, client):
+        response = client.get("/api/v1/strings/exists")
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        data = json.loads(response.data)
+        assert "validation error for StringExistsQuerySchema" in data["message"]
+
+
+class TestStringListing:
+    """Tests for the keyset paginated listing endpoint"""
+
+    @pytest.fixture
+    def listed_strings(self, session):
+        session.query(String).delete()
+        session.commit()
+
+        values = [f"listed {i}" for i in range(7)]
+        session.add_all([String(value=value) for value in values])
+        session.commit()
+        return values
+
+    def walk(self, client, **params):
+        values, cursor = [], None
+        while True:
+            response = client.get(
+                "/api/v1/strings",
+                query_string={**params, **({"cursor": cursor} if cursor else {})},
+            )
+            assert response.status_code == HTTPStatus.OK
+            data = json.loads(response.data)
+            assert len(data["items"]) <= params["limit"]
+            values.extend(item["value"] for item in data["items"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                return values
+
+    def test_pages_cover_every_row_once(self, client, listed_strings):
+        assert self.walk(client, limit=3) == listed_strings
+        assert self.walk(client, limit=3, order="desc") == listed_strings[::-1]
+
+    def test_page_shape(self, client, listed_strings):
+        response = client.get("/api/v1/strings?limit=2")
+
+        data = json.loads(response.data)
+        assert data["per_page"] == 2
+        assert data["total"] is None
+        assert set(data["items"][0]) == {"id", "value", "created_at"}
+        assert data["next_cursor"]
+
+    def test_total_is_cached(self, client, session, listed_strings):
+        listing = StringListingService(row_count=CachedRowCount(ttl=60))
+
+        with patch(
+            "src.api.v1.controllers.strings_controller.string_listing_service",
+            listing,
+        ):
+            first = json.loads(client.get("/api/v1/strings?include_total=true").data)
+            session.add(String(value="not counted yet"))
+            session.commit()
+            second = json.loads(client.get("/api/v1/strings?include_total=true").data)
+
+            listing.row_count.invalidate()
+            third = json.loads(client.get("/api/v1/strings?include_total=true").data)
+
+        assert first["total"] == second["total"] == len(listed_strings)
+        assert third["total"] == len(listed_strings) + 1
+
+    def test_invalid_cursor(self, client, listed_strings):
+        cursors = [
+            "garbage!",
+            "e30",
+            encode_cursor({"id": 3, "order": "desc"}),
+            encode_cursor({"id": True, "order": "asc"}),
+            encode_cursor({"id": 2**63, "order": "asc"}),
+            encode_cursor({"id": -(2**63) - 1, "order": "asc"}),
+        ]
+
+        for cursor in cursors:
+            response = client.get("/api/v1/strings", query_string={"cursor": cursor})
+
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+            assert "Invalid cursor" in json.loads(response.data)["message"]
+
+    def test_limit_is_bounded(self, client):
+        response = client.get("/api/v1/strings?limit=101")
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+class TestStringExport:
+    """Tests for the streaming export endpoint"""
+
+    @pytest.fixture
+    def exported_strings(self, session):
+        session.query(String).delete()
+        session.commit()
+
+        values = [f"export {i}" for i in range(7)] + ['comma, "quote"\nnewline']
+        session.add_all([String(value=value) for value in values])
+        session.commit()
+        return values
+
+    def export(self, client, auth_header, **params):
+        with patch(
+            "src.api.v1.controllers.strings_controller.string_export_service",
+            StringExportService(chunk_size=3, fetch_size=2),
+        ):
+            return client.get(
+                "/api/v1/strings/export", query_string=params, headers=auth_header
+            )
+
+    def test_export_ndjson(self, client, auth_header, exported_strings):
+        response = self.export(client, auth_header)
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.mimetype == "application/x-ndjson"
+        rows = [json.loads(line) for line in response.data.decode().splitlines()]
+        assert [row["value"] for row in rows] == exported_strings
+        assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+        assert response.headers["X-Export-Upto-Id"] == str(rows[-1]["id"])
+
+    def test_export_csv(self, client, auth_header, exported_strings):
+        response = self.export(client, auth_header, format="csv")
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.mimetype == "text/csv"
+        rows = list(csv.reader(io.StringIO(response.data.decode())))
+        assert rows[0] == ["id", "value", "created_at"]
+        assert [row[1] for row in rows[1:]] == exported_strings
+
+    def test_export_since_id(self, client, auth_header, exported_strings):
+        first = self.export(client, auth_header)
+        upto_id = int(first.headers["X-Export-Upto-Id"])
+
+        with client.application.app_context():
+            db.session.add(String(value="saved after export"))
+            db.session.commit()
+
+        response = self.export(client, auth_header, since_id=upto_id)
+        rows = [json.loads(line) for line in response.data.decode().splitlines()]
+
+        assert [row["value"] for row in rows] == ["saved after export"]
+        assert int(response.headers["X-Export-Upto-Id"]) == rows[0]["id"]
+
+        response = self.export(client, auth_header, since_id=rows[0]["id"])
+        assert response.data == b""
+        assert response.headers["X-Export-Upto-Id"] == str(rows[0]["id"])
+
+    def test_export_rejects_unknown_format(self, client, auth_header):
+        response = self.export(client, auth_header, format="xml")
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_export_requires_auth(self, client):
+        response = client.get("/api/v1/strings/export")
+
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+class TestRetention:
+    """Tests for the batched retention purge"""
+
+    NOW = datetime(2026, 1, 31)
+
+    @pytest.fixture
+    def aged_strings(self, session):
+        session.query(String).delete()
+        session.commit()
+
+        # Interleave expired and fresh rows so batches skip over kept ids
+        for i in range(10):
+            age = timedelta(days=60 if i % 2 == 0 else 1)
+            session.add(String(value=f"aged {i}", created_at=self.NOW - age))
+        session.commit()
+
+    def test_purge_deletes_only_expired_rows(self, session, aged_strings):
+        service = StringRetentionService(max_age_days=30, batch_size=2, pause_ms=0)
+
+        assert service.count_expired(self.NOW) == 5
+        assert service.purge(self.NOW) == 5
+
+        values = [row.value for row in session.query(String).order_by(String.id)]
+        assert values == [f"aged {i}" for i in range(1, 10, 2)]
+
+    def test_purge_stops_after_max_batches(self, session, aged_strings):
+        service = StringRetentionService(max_age_days=30, batch_size=2, pause_ms=0)
+
+        assert service.purge(self.NOW, max_batches=1) == 2
+        assert service.count_expired(self.NOW) == 3
+
+    def test_purge_requires_positive_age(self, session):
+        with pytest.raises(ValueError):
+            StringRetentionService(max_age_days=0).purge()
+
+    def test_scheduler_runs_purge(self, app_with_db):
+        purged = threading.Event()
+
+        class FakeService:
+            def purge(self):
+                purged.set()
+                return 0
+
+        scheduler = RetentionScheduler(FakeService(), interval=0.01)
+        scheduler.start(app_with_db)
+        try:
+            assert purged.wait(5)
+        finally:
+            scheduler.stop(timeout=5)
+
+    def test_scheduler_runs_in_one_gunicorn_worker(self):
+        slots = [{"GUNICORN_WORKER_SLOT": str(slot)} for slot in range(4)]
+
+        assert [runs_scheduled_purge(environ) for environ in slots] == [
+            True,
+            False,
+            False,
+            False,
+        ]
+        assert runs_scheduled_purge({})
+
+
+class TestStringSearch:
+    """Tests for full-text search"""
+
+    @pytest.fixture
+    def searchable_strings(self, session):
+        session.query(String).delete()
+        session.commit()
+
+        values = [
+            "the quick brown fox",
+            "a quick brown dog",
+            "lazy dogs sleep all day",
+            "quick quick quick",
+            "nothing relevant here",
+        ]
+        session.add_all([String(value=value) for value in values])
+        session.commit()
+        return values
+
+    def test_search_ranks_matches(self, client, searchable_strings):
+        response = client.get("/api/v1/strings/search?q=quick brown")
+
+        assert response.status_code == HTTPStatus.OK
+        data = json.loads(response.data)
+        values = [item["value"] for item in data["items"]]
+        assert set(values) == {
+            "the quick brown fox",
+            "a quick brown dog",
+            "quick quick quick",
+        }
+        scores = [item["score"] for item in data["items"]]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_search_paginates(self, client, searchable_strings):
+        values, cursor = [], None
+        while True:
+            params = {"q": "quick", "limit": 1}
+            if cursor:
+                params["cursor"] = cursor
+            data = json.loads(
+                client.get("/api/v1/strings/search", query_string=params).data
+            )
+            values.extend(item["value"] for item in data["items"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert sorted(values) == sorted(
+            ["the quick brown fox", "a quick brown dog", "quick quick quick"]
+        )
+
+    def test_search_index_follows_writes(self, client, session, searchable_strings):
+        session.add(String(value="freshly saved zebra"))
+        session.query(String).filter_by(value="nothing relevant here").delete()
+        session.commit()
+
+        data = json.loads(client.get("/api/v1/strings/search?q=zebra relevant").data)
+
+        assert [item["value"] for item in data["items"]] == ["freshly saved zebra"]
+
+    def test_search_escapes_query_syntax(self, client, searchable_strings):
+        for q in ('"unbalanced', "fox AND NOT", "*", "NEAR(fox dog)"):
+            response = client.get("/api/v1/strings/search", query_string={"q": q})
+
+            assert response.status_code == HTTPStatus.OK
+
+    def test_invalid_cursor(self, client, searchable_strings):
+        cursors = [
+            "garbage!",
+            encode_cursor({"score": 1.5, "id": True}),
+            encode_cursor({"score": 1.5, "id": 2**63}),
+            encode_cursor({"score": False, "id": 3}),
+            encode_cursor({"score": "1.5", "id": 3}),
+        ]
+
+        for cursor in cursors:
+            response = client.get(
+                "/api/v1/strings/search", query_string={"q": "quick", "cursor": cursor}
+            )
+
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+            assert "Invalid cursor" in json.loads(response.data)["message"]
+
+    def test_like_fallback_on_other_databases(self, client, searchable_strings):
+        hits_query = StringSearchService._hits_query
+
+        with patch.object(
+            StringSearchService,
+            "_hits_query",
+            lambda self, dialect, q: hits_query(self, "postgresql", q),
+        ):
+            values, cursor = [], None
+            while True:
+                params = {"q": "quick brown", "limit": 1}
+                if cursor:
+                    params["cursor"] = cursor
+                response = client.get("/api/v1/strings/search", query_string=params)
+                assert response.status_code == HTTPStatus.OK
+                data = json.loads(response.data)
+                values.extend(item["value"] for item in data["items"])
+                cursor = data["next_cursor"]
+                if cursor is None:
+                    break
+
+        assert values[2] == "quick quick quick"
+        assert set(values[:2]) == {"the quick brown fox", "a quick brown dog"}
+
+    def test_search_requires_query(self, client):
+        response = client.get("/api/v1/strings/search")
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
 class TestRandomString:
     """Tests for the random string endpoint"""
 
@@ -332,6 +989,55 @@ class TestRandomString:
         assert "random_string" in data
         assert data["random_string"] in sample_strings
 
+    def test_get_random_strings_batch(self, client, session, sample_strings):
+        """Test retrieving several random strings in one request"""
+        session.query(String).delete()
+        session.add_all([String(value=value) for value in sample_strings])
+        session.commit()
+
+        response = client.get("/api/v1/strings/random?count=20")
+
+        assert response.status_code == HTTPStatus.OK
+        data = json.loads(response.data)
+        assert data["count"] == 20
+        assert len(data["random_strings"]) == 20
+        assert all(value in sample_strings for value in data["random_strings"])
+
+    def test_get_random_strings_without_replacement(
+        self, client, session, sample_strings
+    ):
+        """Test that replace=false returns distinct strings, capped by table size"""
+        session.query(String).delete()
+        session.add_all([String(value=value) for value in sample_strings])
+        session.commit()
+
+        response = client.get("/api/v1/strings/random?count=3&replace=false")
+        data = json.loads(response.data)
+        assert response.status_code == HTTPStatus.OK
+        assert len(set(data["random_strings"])) == 3
+
+        response = client.get("/api/v1/strings/random?count=50&replace=false")
+        data = json.loads(response.data)
+        assert response.status_code == HTTPStatus.OK
+        assert sorted(data["random_strings"]) == sorted(sample_strings)
+
+    def test_get_random_strings_count_out_of_bounds(self, client):
+        """Test that count is bounded"""
+        for count in ("0", "501", "many"):
+            response = client.get(f"/api/v1/strings/random?count={count}")
+
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+            data = json.loads(response.data)
+            assert "validation error for RandomStringQuerySchema" in data["message"]
+
+    def test_get_random_strings_empty_db(self, client, session):
+        session.query(String).delete()
+        session.commit()
+
+        response = client.get("/api/v1/strings/random?count=5")
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
     def test_rate_limiting(self, client, sample_strings):
         """Test that rate limiting is applied to the random endpoint"""
         responses = []
@@ -346,6 +1052,256 @@ class TestRandomString:
         ), "Rate limiting was not triggered"
 
 
+class TestRandomSelection:
+    """Tests for the id-range random selection engine"""
+
+    @pytest.fixture
+    def gapped_strings(self, session):
+        """Insert 60 rows and delete two thirds of them, leaving uneven gaps"""
+        session.query(String).delete()
+        session.commit()
+
+        rows = [String(value=f"gapped {i}") for i in range(60)]
+        session.add_all(rows)
+        session.commit()
+
+        for i, row in enumerate(rows):
+            if i % 3 != 0 or i in (30, 33):
+                session.delete(row)
+        session.commit()
+
+        return [row.value for row in session.query(String).order_by(String.id)]
+
+    def test_distribution_is_uniform_across_gaps(self, app_with_db, gapped_strings):
+        """Chi-square goodness of fit against a uniform distribution"""
+        service = RandomStringService(rng=random.Random(1234))
+        samples_per_row = 200
+        total = samples_per_row * len(gapped_strings)
+
+        counts = {value: 0 for value in gapped_strings}
+        for _ in range(total):
+            counts[service.pick_one().value] += 1
+
+        chi_square = sum(
+            (observed - samples_per_row) ** 2 / samples_per_row
+            for observed in counts.values()
+        )
+
+        # 18 rows -> 17 degrees of freedom, critical value at p=0.001 is 40.79
+        assert len(gapped_strings) == 18
+        assert chi_square < 40.79
+
+    def test_sparse_range_falls_back_to_hash_windows(self, app_with_db, gapped_strings):
+        """Selection still succeeds when every probe misses"""
+        service = RandomStringService(rng=random.Random(42), probe_size=1)
+
+        for _ in range(50):
+            assert service.pick_one().value in gapped_strings
+
+    def test_hash_windows_never_count_the_table(self, app_with_db, gapped_strings):
+        service = RandomStringService(rng=random.Random(5), sparse_ids=True)
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            for _ in range(5):
+                assert len(service.sample(10)) == 10
+                assert len(service.sample_unique(10)) == 10
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+
+        assert statements
+        assert not [s for s in statements if "count(" in s.lower()]
+
+    def test_rows_without_a_hash_are_still_drawn(self, app_with_db, gapped_strings):
+        """A table the hash backfill hasn't reached yet is not empty"""
+        db.session.query(String).update({String.value_hash: None})
+        db.session.commit()
+
+        for sparse_ids in (True, False):
+            service = RandomStringService(
+                rng=random.Random(9), probe_size=1, sparse_ids=sparse_ids
+            )
+            assert service.pick_one().value in gapped_strings
+            assert len(service.sample(5)) == 5
+            values = [row.value for row in service.sample_unique(5)]
+            assert len(set(values)) == 5
+            assert set(values) <= set(gapped_strings)
+
+    def test_sample_unique_returns_distinct_rows(self, app_with_db, gapped_strings):
+        service = RandomStringService(rng=random.Random(7))
+
+        for _ in range(20):
+            values = [row.value for row in service.sample_unique(10)]
+            assert len(values) == len(set(values)) == 10
+            assert set(values) <= set(gapped_strings)
+
+    def test_empty_table_returns_none(self, app_with_db, session):
+        session.query(String).delete()
+        session.commit()
+
+        assert RandomStringService().pick_one() is None
+
+
+class TestRandomStringPool:
+    """Tests for the per-worker prefetch pool"""
+
+    @pytest.fixture
+    def pool_strings(self, session):
+        session.query(String).delete()
+        session.commit()
+
+        values = [f"pooled {i}" for i in range(20)]
+        session.add_all([String(value=value) for value in values])
+        session.commit()
+        return values
+
+    def test_disabled_pool_reads_through(self, app_with_db, pool_strings):
+        pool = RandomStringPool(enabled=False)
+
+        assert pool.get() in pool_strings
+        assert len(pool._items) == 0
+
+    def test_refill_prefetches_a_full_batch(self, app_with_db, pool_strings):
+        pool = RandomStringPool(enabled=True, size=10, low_water=2)
+        pool.refill()
+
+        assert len(pool._items) == 10
+        assert all(value in pool_strings for value in pool._items)
+
+        served = pool.get()
+        assert served in pool_strings
+        assert len(pool._items) == 9
+
+    def test_low_water_triggers_background_refill(self, app_with_db, pool_strings):
+        pool = RandomStringPool(enabled=True, size=10, low_water=8)
+        pool.refill()
+
+        for _ in range(3):
+            pool.get()
+        pool.wait_for_refill(timeout=5)
+
+        assert len(pool._items) == 10
+
+    def test_stale_batch_is_evicted(self, app_with_db, session, pool_strings):
+        pool = RandomStringPool(enabled=True, size=10, low_water=2, max_staleness=1)
+        pool.refill()
+
+        session.query(String).delete()
+        session.add(String(value="fresh string"))
+        session.commit()
+
+        # Age the batch past max_staleness
+        pool._fetched_at -= 2
+
+        assert pool.get() == "fresh string"
+        pool.wait_for_refill(timeout=5)
+        assert set(pool._items) == {"fresh string"}
+
+    def test_empty_table_returns_none(self, app_with_db, session):
+        session.query(String).delete()
+        session.commit()
+
+        pool = RandomStringPool(enabled=True, size=10, low_water=2)
+        assert pool.get() is None
+        pool.wait_for_refill(timeout=5)
+        assert pool.get() is None
+
+
+class TestWriteCoalescer:
+    """Tests for group-committed string saves"""
+
+    @staticmethod
+    def save_concurrently(app, coalescer, values):
+        results = {}
+        start = threading.Barrier(len(values))
+
+        def worker(value):
+            with app.app_context():
+                start.wait()
+                try:
+                    results[value] = coalescer.save(value)
+                except Exception as e:
+                    results[value] = e
+
+        threads = [threading.Thread(target=worker, args=(v,)) for v in values]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+        return results
+
+    def test_concurrent_saves_share_a_commit(self, app_with_db):
+        class CountingWriter:
+            batches = []
+
+            def save_many(self, values):
+                self.batches.append(list(values))
+                return string_write_service.save_many(values)
+
+        writer = CountingWriter()
+        coalescer = WriteCoalescer(
+            enabled=True, max_wait_ms=200, max_batch=8, writer=writer
+        )
+        values = [f"coalesced {i}" for i in range(8)]
+
+        results = self.save_concurrently(app_with_db, coalescer, values)
+
+        assert len(writer.batches) < len(values)
+        assert sorted(sum(writer.batches, [])) == sorted(values)
+        assert len(set(results.values())) == len(values)
+        with app_with_db.app_context():
+            for value, string_id in results.items():
+                assert String.query.get(string_id).value == value
+
+    def test_max_batch_splits_batches(self, app_with_db):
+        coalescer = WriteCoalescer(enabled=True, max_wait_ms=50, max_batch=1)
+
+        with app_with_db.app_context():
+            first = coalescer.save("split one")
+            second = coalescer.save("split two")
+
+            assert second != first
+            assert String.query.get(second).value == "split two"
+
+    def test_failure_reaches_every_waiter(self, app_with_db):
+        class FailingWriter:
+            def save_many(self, values):
+                raise RuntimeError("disk full")
+
+        coalescer = WriteCoalescer(
+            enabled=True, max_wait_ms=200, max_batch=4, writer=FailingWriter()
+        )
+        values = [f"doomed {i}" for i in range(4)]
+
+        results = self.save_concurrently(app_with_db, coalescer, values)
+
+        assert len(results) == 4
+        for error in results.values():
+            assert isinstance(error, CoalescedWriteError)
+            assert "disk full" in str(error)
+
+    def test_save_endpoint_uses_coalescer(self, client, auth_header):
+        coalescer = WriteCoalescer(enabled=True, max_wait_ms=1, max_batch=4)
+
+        with patch(
+            "src.api.v1.controllers.strings_controller.save_coalescer", coalescer
+        ):
+            response = client.post(
+                "/api/v1/strings/save",
+                json={"string": "via coalescer"},
+                headers=auth_header,
+            )
+
+        assert response.status_code == HTTPStatus.CREATED
+        data = json.loads(response.data)
+        with client.application.app_context():
+            assert String.query.get(data["id"]).value == "via coalescer"
+
+
 class TestIntegration:
     """Integration tests that combine multiple operations"""
 
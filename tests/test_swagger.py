@@ -20,7 +20,13 @@ def test_swagger_content_validity(client):
     assert "schemas" in data["components"]
 
     # Check all endpoints are documented
+    assert "/strings" in data["paths"]
     assert "/strings/save" in data["paths"]
+    assert "/strings/save/batch" in data["paths"]
+    assert "/strings/import" in data["paths"]
+    assert "/strings/export" in data["paths"]
+    assert "/strings/exists" in data["paths"]
+    assert "/strings/search" in data["paths"]
     assert "/strings/random" in data["paths"]
     assert "/auth/login" in data["paths"]
     assert "/auth/register" in data["paths"]
@@ -41,7 +47,9 @@ def test_swagger_content_validity(client):
     required_schemas = [
         "StringCreate",
         "StringCreateResponse",
+        "StringBatchCreateResponse",
         "RandomStringResponse",
+        "RandomStringListResponse",
         "LoginRequest",
         "RegisterRequest",
         "TokenResponse",
@@ -0,0 +1,161 @@
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+
+import pytest
+
+from src.core.bloom_filter import BloomFilter
+from src.core.models.revoked_token import RevokedToken
+from src.core.models.user import User
+from src.core.services.jwt_service import JWTService
+from src.core.services.token_revocation_service import TokenRevocationService
+from src.factory import bcrypt
+
+
+def make_user(session, email):
+    password = bcrypt.generate_password_hash("password123").decode("utf-8")
+    user = User(email=email, password=password)
+    session.add(user)
+    session.commit()
+    data = {"user_id": str(user.id), "email": user.email}
+    return {
+        "access": JWTService.create_access_token(data),
+        "refresh": JWTService.create_refresh_token(data),
+    }
+
+
+@pytest.fixture
+def tokens(session):
+    return make_user(session, f"revoke-{uuid.uuid4().hex[:8]}@example.com")
+
+
+def save(client, access_token):
+    return client.post(
+        "/api/v1/strings/save",
+        json={"string": "revocation"},
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+
+
+def refresh(client, refresh_token):
+    return client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def future_exp():
+    return int((datetime.now(timezone.utc) + timedelta(hours=1)).timestamp())
+
+
+class TestBloomFilter:
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        members = [uuid.uuid4().hex for _ in range(1000)]
+        for member in members:
+            bloom.add(member)
+
+        assert all(member in bloom for member in members)
+        false_positives = sum(uuid.uuid4().hex in bloom for _ in range(10_000))
+        assert false_positives < 300
+
+
+class TestRevocationEndpoints:
+    def test_logout_revokes_access_and_refresh_tokens(self, client, tokens):
+        assert save(client, tokens["access"]).status_code == HTTPStatus.CREATED
+
+        response = client.post(
+            "/api/v1/auth/logout",
+            json={"refresh_token": tokens["refresh"]},
+            headers={"Authorization": f"Bearer {tokens['access']}"},
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        # The cached verified token must not bypass the revocation
+        rejected = save(client, tokens["access"])
+        assert rejected.status_code == HTTPStatus.UNAUTHORIZED
+        assert json.loads(rejected.data)["message"] == "Token has been revoked"
+        assert refresh(client, tokens["refresh"]).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+
+    def test_revoke_another_session(self, client, session, tokens):
+        other_device = JWTService.create_refresh_token(
+            JWTService.decode_token(tokens["access"])
+        )
+
+        response = client.post(
+            "/api/v1/auth/revoke",
+            json={"token": other_device},
+            headers={"Authorization": f"Bearer {tokens['access']}"},
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert refresh(client, other_device).status_code == HTTPStatus.UNAUTHORIZED
+        assert refresh(client, tokens["refresh"]).status_code == HTTPStatus.OK
+        assert save(client, tokens["access"]).status_code == HTTPStatus.CREATED
+
+    def test_cannot_revoke_another_users_token(self, client, session, tokens):
+        stranger = make_user(session, f"stranger-{uuid.uuid4().hex[:8]}@example.com")
+
+        response = client.post(
+            "/api/v1/auth/revoke",
+            json={"token": stranger["refresh"]},
+            headers={"Authorization": f"Bearer {tokens['access']}"},
+        )
+
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        assert refresh(client, stranger["refresh"]).status_code == HTTPStatus.OK
+
+
+class TestRevocationService:
+    def test_other_workers_see_revocations_after_refresh(self, app_with_db):
+        clock = FakeClock()
+        this_worker = TokenRevocationService(refresh_seconds=5)
+        other_worker = TokenRevocationService(refresh_seconds=5, clock=clock)
+        jti = uuid.uuid4().hex
+
+        with app_with_db.app_context():
+            assert not other_worker.is_revoked(jti)
+            this_worker.revoke(jti, future_exp())
+
+            assert this_worker.is_revoked(jti)
+            assert not other_worker.is_revoked(jti)
+            clock.now += 5
+            assert other_worker.is_revoked(jti)
+
+    def test_false_positives_are_checked_against_the_database(self, app_with_db):
+        service = TokenRevocationService()
+        jti = uuid.uuid4().hex
+
+        with app_with_db.app_context():
+            service.is_revoked("load the filter")
+            service._filter.add(jti)
+
+            assert not service.is_revoked(jti)
+
+    def test_expired_revocations_are_skipped_and_purged(self, app_with_db):
+        clock = FakeClock()
+        service = TokenRevocationService(
+            refresh_seconds=1, rebuild_seconds=60, clock=clock
+        )
+        expired = uuid.uuid4().hex
+        past = int((datetime.now(timezone.utc) - timedelta(hours=1)).timestamp())
+
+        with app_with_db.app_context():
+            service.revoke(expired, past)
+            service.is_revoked("load the filter")
+            assert expired not in service._filter
+
+            result = app_with_db.test_cli_runner().invoke(
+                args=["auth", "purge-revoked-tokens"]
+            )
+
+            assert result.exit_code == 0
+            assert RevokedToken.query.filter_by(jti=expired).first() is None
@@ -0,0 +1,43 @@
+import json
+from http import HTTPStatus
+
+from src.core.schemas.auth import TokenResponseSchema
+from src.utils import (
+    ERROR_BODIES,
+    create_error_response,
+    create_success_response,
+    encode_error,
+)
+
+
+def test_constant_error_bodies_match_encoded_ones():
+    for message, body in ERROR_BODIES.items():
+        assert body == encode_error(message)
+
+    response = create_error_response("Request must be JSON", HTTPStatus.BAD_REQUEST)
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.mimetype == "application/json"
+    assert json.loads(response.data) == {
+        "status": "failed",
+        "message": "Request must be JSON",
+        "error_code": None,
+    }
+
+
+def test_success_response_serializes_the_model():
+    model = TokenResponseSchema(message="Login successful", access_token="token")
+
+    response = create_success_response(model, HTTPStatus.CREATED)
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert json.loads(response.data) == model.model_dump()
+
+
+def test_health_endpoints_use_compact_json(client):
+    response = client.get("/health")
+
+    assert response.mimetype == "application/json"
+    assert response.data == b'{"status":"healthy"}'
+    assert json.loads(client.get("/health/detailed").data)["status"] == "healthy"
+    assert client.get("/ready").data == b'{"status":"ready"}'